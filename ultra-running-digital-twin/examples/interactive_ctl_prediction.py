@@ -15,6 +15,8 @@ sys.path.append('..')
 
 from src.digital_twin_v32_simulator import DigitalTwinV32, EnvironmentalConditions, NutritionStrategy
 from src.ctl_fitness_tracker import CTLFitnessTracker, interactive_ctl_input
+from src.scenario_sampler import ScenarioSampler
+from src.adaptive_monte_carlo import run_adaptive_monte_carlo
 
 
 def main():
@@ -173,6 +175,28 @@ def main():
               f"{seg['gradient_pct']:>7.1f}%  {seg['final_speed_kmh']:>7.2f} "
               f"{seg['cumulative_time_hours']:>7.2f}h")
 
+    # Finish-time range, stopped at a fixed latency budget
+    band_input = input("\nEstimate finish-time range with Monte Carlo (~2s)? (y/n): ").strip().lower()
+    if band_input == 'y':
+        sampler = ScenarioSampler.for_course(
+            simulator.course_profile,
+            weather_scenarios=[{'name': 'Selected', 'temp_c': temperature, 'precipitation': precipitation}],
+            fitness_range=(fitness_level, fitness_level),
+            pacing_strategies=[pacing_strategy]
+        )
+        adaptive = run_adaptive_monte_carlo(
+            elevation_profile=elevation_profile,
+            athlete_profile_path='../data/profiles/simbarashe_enhanced_profile_v3_3.json',
+            course_profile_path='../data/courses/chianti_74k_course_profile_v1_3_FINAL.json',
+            ci_targets={'median': 0.05, 'p10': 0.1, 'p90': 0.1},
+            time_budget_seconds=2.0,
+            sampler=sampler,
+            verbose=False
+        )
+        stats = adaptive['analysis']['time_statistics']
+        print(f"\n🎲 FINISH-TIME RANGE ({len(adaptive['results'])} simulations, {adaptive['stop_reason']}):")
+        print(f"   P10: {stats['p10']:.2f}h   Median: {stats['median']:.2f}h   P90: {stats['p90']:.2f}h")
+
     print("\n" + "="*80)
 
     # Option to save CTL record
@@ -10,6 +10,7 @@ import json
 sys.path.append('..')
 
 from src.monte_carlo_runner import run_monte_carlo_simulations, analyze_results
+from src.results_frame import with_finish_times
 
 
 def main():
@@ -78,7 +79,7 @@ def main():
     
     # Save results
     output_file = 'monte_carlo_results.csv'
-    results_df.to_csv(output_file, index=False)
+    with_finish_times(results_df).to_csv(output_file, index=False)
     print(f"\n💾 Results saved to: {output_file}")
     
     print("\n" + "="*80)
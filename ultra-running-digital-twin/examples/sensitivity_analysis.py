@@ -7,10 +7,13 @@ Test how different parameters affect race predictions.
 
 import sys
 import json
+import numpy as np
 import pandas as pd
 sys.path.append('..')
 
 from src.digital_twin_v32_simulator import DigitalTwinV32, EnvironmentalConditions, NutritionStrategy
+from src.sweep import sweep
+from src.global_sensitivity import global_sensitivity
 
 
 def main():
@@ -117,6 +120,36 @@ def main():
     print(f"   Worst: {worst_pacing['pacing']} ({worst_pacing['time_hours']:.2f}h)")
     print(f"   Difference: {(worst_pacing['time_hours'] - best_pacing['time_hours'])*60:.0f} minutes")
     
+    # Full grid: every fitness x temperature x pacing combination at once
+    grid = sweep(
+        elevation_profile,
+        athlete_profile_path='../data/profiles/simbarashe_enhanced_profile_v3_3.json',
+        course_profile_path='../data/courses/chianti_74k_course_profile_v1_3_FINAL.json',
+        axes={
+            'fitness': np.linspace(1.0, 1.25, 6),
+            'temperature': [8, 11, 14, 17, 20],
+            'pacing': strategies
+        },
+        seed=42
+    )
+    best = grid.argmin()
+    print(f"\n🧮 GRID SWEEP ({grid.values.size} combinations):")
+    print(f"   Fastest: fitness {best['fitness']:.2f}, {best['temperature']}°C, {best['pacing']} "
+          f"({grid.values.min():.2f}h)")
+
+    # Global sensitivity: all inputs varied together, interactions included
+    sobol = global_sensitivity(
+        elevation_profile,
+        athlete_profile_path='../data/profiles/simbarashe_enhanced_profile_v3_3.json',
+        course_profile_path='../data/courses/chianti_74k_course_profile_v1_3_FINAL.json',
+        seed=42
+    )
+    print(f"\n🌐 SOBOL INDICES ({sobol['evaluations']} simulations):")
+    for output, indices in sobol['indices'].items():
+        print(f"   {output}:")
+        for name, row in indices.sort_values('ST', ascending=False).head(4).iterrows():
+            print(f"      {name:38s} first-order {row['S1']:.2f}, total {row['ST']:.2f}")
+
     print("\n" + "="*80)
 
 
@@ -9,15 +9,79 @@ from .digital_twin_v32_simulator import (
     DigitalTwinV32,
     TerrainSegment,
     EnvironmentalConditions,
-    NutritionStrategy
+    NutritionStrategy,
+    AthleteParameters,
+    RaceDraws,
+    ScenarioBatch,
+    SegmentView
 )
 
+from .profile_registry import ProfileRegistry
+
+from .course_plan import (
+    CoursePlan,
+    compile_course_plan
+)
+
+from .scenario_sampler import ScenarioSampler
+
+from .streaming_stats import MonteCarloAggregator
+
+from .checkpoint import MonteCarloCheckpoint
+
+from .results_frame import (
+    compact_results,
+    with_finish_times,
+    to_arrow,
+    write_parquet
+)
+
+from .results_store import ResultStore
+
 from .monte_carlo_runner import (
     run_monte_carlo_simulations,
+    run_monte_carlo_streaming,
+    run_monte_carlo_to_store,
     create_default_weather_scenarios,
     analyze_results
 )
 
+from .adaptive_monte_carlo import run_adaptive_monte_carlo
+
+from .pacing_comparison import compare_pacing_strategies
+
+from .pacing_optimizer import optimize_pacing
+
+from .replay import RunReplayer
+
+from .importance_sampling import (
+    run_importance_sampling,
+    weighted_tail_estimates
+)
+
+from .variance_reduction import (
+    compare_sampling_schemes,
+    variance_reduction_factors
+)
+
+from .sweep import SweepResult, sweep
+
+from .global_sensitivity import global_sensitivity
+
+from .calibration import calibrate, calibration_targets
+
+from .goal_solver import solve_required_fitness
+
+from .field_simulator import FieldSimulator
+
+from .race_calendar import CalendarRace, run_race_calendar
+
+from .elasticities import (
+    ElasticityAggregator,
+    finite_difference_elasticities,
+    run_elasticity_analysis
+)
+
 __version__ = "3.3.0"
 __author__ = "Simbarashe"
 __all__ = [
@@ -25,7 +89,44 @@ __all__ = [
     "TerrainSegment",
     "EnvironmentalConditions",
     "NutritionStrategy",
+    "AthleteParameters",
+    "RaceDraws",
+    "ScenarioBatch",
+    "SegmentView",
+    "ScenarioSampler",
+    "ProfileRegistry",
+    "CoursePlan",
+    "compile_course_plan",
     "run_monte_carlo_simulations",
+    "run_monte_carlo_streaming",
+    "run_monte_carlo_to_store",
+    "ResultStore",
+    "MonteCarloAggregator",
+    "MonteCarloCheckpoint",
+    "compact_results",
+    "with_finish_times",
+    "to_arrow",
+    "write_parquet",
     "create_default_weather_scenarios",
     "analyze_results",
+    "run_adaptive_monte_carlo",
+    "compare_pacing_strategies",
+    "optimize_pacing",
+    "RunReplayer",
+    "run_importance_sampling",
+    "weighted_tail_estimates",
+    "compare_sampling_schemes",
+    "variance_reduction_factors",
+    "sweep",
+    "SweepResult",
+    "global_sensitivity",
+    "calibrate",
+    "calibration_targets",
+    "solve_required_fitness",
+    "FieldSimulator",
+    "run_race_calendar",
+    "CalendarRace",
+    "ElasticityAggregator",
+    "finite_difference_elasticities",
+    "run_elasticity_analysis",
 ]
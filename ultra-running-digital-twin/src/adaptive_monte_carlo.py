@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Convergence-driven Monte Carlo
+
+Runs simulations in batches until the confidence intervals of the chosen
+statistics are narrower than their targets, or a simulation/wall-clock
+budget runs out.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from .monte_carlo_runner import (
+    DEFAULT_CHUNK_SIZE, chunk_tasks, map_chunks, run_attrs, simulate_chunk, analyze_results
+)
+from .profile_registry import load_simulator
+from .scenario_sampler import ScenarioSampler
+
+# Finish-time quantile statistics that can be targeted
+QUANTILE_STATISTICS = {'p10': 0.10, 'p25': 0.25, 'median': 0.50, 'p75': 0.75, 'p90': 0.90}
+
+# Default CI width targets: hours for time statistics, probability for success_rate
+DEFAULT_CI_TARGETS = {'median': 0.05, 'p10': 0.1, 'p90': 0.1}
+
+
+def quantile_confidence_interval(
+    sorted_values: np.ndarray,
+    q: float,
+    confidence: float = 0.95
+) -> Tuple[float, float]:
+    """
+    Distribution-free CI for a quantile from binomial order statistics.
+
+    Args:
+        sorted_values: Sample sorted in ascending order
+        q: Quantile (0-1)
+        confidence: Confidence level
+
+    Returns:
+        (lower, upper) bounds
+    """
+    n = len(sorted_values)
+    z = norm.ppf(0.5 + confidence / 2)
+    half_width = z * np.sqrt(n * q * (1 - q))
+    # 1-based ranks floor(nq - h) and ceil(nq + h), as 0-based indices
+    lower = int(min(n - 1, max(0, np.floor(n * q - half_width) - 1)))
+    upper = int(min(n - 1, max(0, np.ceil(n * q + half_width) - 1)))
+    return float(sorted_values[lower]), float(sorted_values[upper])
+
+
+def proportion_confidence_interval(successes: int, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a proportion"""
+    z = norm.ppf(0.5 + confidence / 2)
+    p = successes / n
+    denominator = 1 + z ** 2 / n
+    centre = (p + z ** 2 / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return centre - half_width, centre + half_width
+
+
+def confidence_interval_widths(
+    times: np.ndarray,
+    statistics: List[str],
+    target_min_hours: float = None,
+    target_max_hours: float = None,
+    confidence: float = 0.95
+) -> Dict[str, float]:
+    """CI width of each requested statistic for a sample of finish times"""
+    sorted_times = np.sort(times)
+    widths = {}
+    for statistic in statistics:
+        if statistic in QUANTILE_STATISTICS:
+            lower, upper = quantile_confidence_interval(sorted_times, QUANTILE_STATISTICS[statistic], confidence)
+        elif statistic == 'mean':
+            half_width = norm.ppf(0.5 + confidence / 2) * times.std(ddof=1) / np.sqrt(len(times))
+            lower, upper = -half_width, half_width
+        elif statistic == 'success_rate':
+            if not (target_min_hours and target_max_hours):
+                raise ValueError("success_rate target needs target_min_hours and target_max_hours")
+            successes = int(((times >= target_min_hours) & (times <= target_max_hours)).sum())
+            lower, upper = proportion_confidence_interval(successes, len(times), confidence)
+        else:
+            raise ValueError(f"Unknown statistic: {statistic}")
+        widths[statistic] = upper - lower
+    return widths
+
+
+def run_adaptive_monte_carlo(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    ci_targets: Optional[Dict[str, float]] = None,
+    target_min_hours: float = None,
+    target_max_hours: float = None,
+    confidence: float = 0.95,
+    batch_size: int = 1000,
+    min_simulations: int = 500,
+    max_simulations: int = 200000,
+    time_budget_seconds: Optional[float] = None,
+    fitness_range: tuple = (0.95, 1.15),
+    temperature_scenarios: List[Dict] = None,
+    verbose: bool = True,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sampler: Optional[ScenarioSampler] = None,
+    sampling_scheme: str = 'mc'
+) -> Dict:
+    """
+    Run Monte Carlo batches until the target CI widths are met.
+
+    Batches are made of whole seeded chunks, so with a fixed seed the
+    simulations are the same as the first N rows of run_monte_carlo_simulations
+    (the point at which a wall-clock budget stops is of course not fixed).
+
+    Args:
+        elevation_profile: Course elevation data
+        athlete_profile_path: Path to athlete profile JSON
+        course_profile_path: Path to course profile JSON
+        ci_targets: Maximum CI width per statistic: 'median', 'p10', 'p25',
+            'p75', 'p90', 'mean' (hours) and 'success_rate' (probability)
+        target_min_hours: Target window for success_rate and analyze_results
+        target_max_hours: Target window for success_rate and analyze_results
+        confidence: Confidence level of the intervals
+        batch_size: Simulations per batch (rounded to whole chunks)
+        min_simulations: Simulations before convergence is checked
+        max_simulations: Simulation budget (the last chunk is cut short to
+            stay within it)
+        time_budget_seconds: Wall-clock budget, checked after every chunk
+            (optional)
+        fitness_range: (min, max) fitness levels to test
+        temperature_scenarios: Custom temperature scenarios (optional)
+        verbose: Print progress updates
+        n_workers: Worker processes to spread chunks over
+        seed: Seed for reproducible results
+        chunk_size: Simulations per seeded chunk
+        sampler: Custom ScenarioSampler
+        sampling_scheme: Uniform design for the default sampler
+
+    Returns:
+        Dictionary with 'results' (DataFrame), 'analysis' (analyze_results),
+        'converged', 'stop_reason' and 'trace' (CI widths after each batch)
+    """
+    start = time.perf_counter()
+    ci_targets = ci_targets if ci_targets is not None else dict(DEFAULT_CI_TARGETS)
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    root_seed = np.random.SeedSequence(seed)
+    if sampler is None:
+        sampler = ScenarioSampler.for_course(
+            simulator.course_profile,
+            weather_scenarios=temperature_scenarios,
+            fitness_range=fitness_range,
+            scheme=sampling_scheme
+        )
+
+    chunks_per_batch = max(1, batch_size // chunk_size)
+    results = []
+    times = np.empty(max_simulations)  # Finish times of the first `count` runs
+    count = 0
+    trace = []
+    next_chunk = 0
+    stop_reason = 'max_simulations'
+    converged = False
+
+    while count < max_simulations:
+        # The last batch is cut to the remaining budget (a short final chunk)
+        tasks = chunk_tasks(
+            elevation_profile, min(chunks_per_batch * chunk_size, max_simulations - count), chunk_size,
+            root_seed, sampler, first_chunk=next_chunk
+        )
+        over_budget = False
+        for chunk_df in map_chunks(simulator, simulate_chunk, tasks, n_workers):
+            results.append(chunk_df)
+            times[count:count + len(chunk_df)] = chunk_df['Time (hours)'].to_numpy()
+            count += len(chunk_df)
+            next_chunk += 1
+            if time_budget_seconds is not None and time.perf_counter() - start >= time_budget_seconds:
+                over_budget = True
+                break
+
+        widths = confidence_interval_widths(
+            times[:count], list(ci_targets), target_min_hours, target_max_hours, confidence
+        )
+        elapsed = time.perf_counter() - start
+        trace.append({'simulations': count, 'elapsed_seconds': elapsed, 'ci_widths': widths})
+        if verbose:
+            status = ', '.join(f"{name} ±{width / 2:.3f}" for name, width in widths.items())
+            print(f"   {count:>7} simulations: {status}")
+
+        if count >= min_simulations and all(widths[name] <= ci_targets[name] for name in ci_targets):
+            converged = True
+            stop_reason = 'converged'
+            break
+        if over_budget:
+            stop_reason = 'time_budget'
+            break
+
+    results_df = pd.concat(results, ignore_index=True)
+    results_df.attrs.update(run_attrs(root_seed, chunk_size, sampler, len(results_df)))
+    return {
+        'results': results_df,
+        'analysis': analyze_results(results_df, target_min_hours, target_max_hours),
+        'converged': converged,
+        'stop_reason': stop_reason,
+        'trace': trace
+    }
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Inverse calibration of course parameters against validation targets
+
+Course profiles were tuned by hand until they reproduced known finish
+times. calibrate() fits the technicality multipliers, fatigue model and
+field effects (DigitalTwinV32.COURSE_PARAMETERS) to the targets in the
+profiles:
+
+- course validation_targets.athlete_specific_targets ('fitness_1.15':
+  '04:23'): median finish time at that fitness
+- athlete race_overrides[race_id].expected_finish_time_band_hhmm
+  ('p50': '10:40'): finish-time quantiles over the scenario distribution
+
+Every evaluation runs one fixed scenario set and race draws (common random
+numbers) through a single simulate_batch call with the trial parameters,
+and scipy's least_squares minimises the target misses plus a small penalty
+for moving parameters away from their current values (the targets alone
+rarely pin down every parameter). The result can be written out as a new
+course profile version.
+"""
+
+import copy
+import dataclasses
+import json
+import os
+import re
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import least_squares
+
+from .course_plan import clock_hours
+from .digital_twin_v32_simulator import DigitalTwinV32
+from .profile_registry import load_simulator
+from .scenario_sampler import ScenarioSampler
+
+# Size of one typical adjustment per parameter (the unit of the penalty)
+CALIBRATION_SCALES = {
+    'fatigue_inflection_km': 5.0,
+    'fatigue_per_km_base': 0.0005,
+    'fatigue_slope_multiplier': 0.05,
+    'field_loss_multiplier_runnable_trail': 0.02,
+    'field_loss_multiplier_short_climbs': 0.02,
+    'dry_multiplier': 0.02,
+    'light_rain_multiplier': 0.02,
+    'wet_multiplier': 0.02,
+}
+
+# Range each parameter may be fitted within
+CALIBRATION_BOUNDS = {
+    'fatigue_inflection_km': (5.0, 200.0),
+    'fatigue_per_km_base': (0.99, 1.0),
+    'fatigue_slope_multiplier': (0.5, 1.5),
+    'field_loss_multiplier_runnable_trail': (0.8, 1.2),
+    'field_loss_multiplier_short_climbs': (0.8, 1.2),
+    'dry_multiplier': (0.7, 1.1),
+    'light_rain_multiplier': (0.7, 1.1),
+    'wet_multiplier': (0.7, 1.1),
+}
+
+
+def calibration_targets(simulator: DigitalTwinV32) -> List[Dict]:
+    """
+    Finish-time targets for a simulator's athlete and course.
+
+    Returns:
+        One dict per target with 'name', 'hours', 'quantile' and 'fitness'
+        (None for quantiles of the scenario distribution)
+    """
+    targets = []
+    validation = simulator.course_profile.get('validation_targets', {})
+    for key, clock in validation.get('athlete_specific_targets', {}).items():
+        match = re.fullmatch(r'fitness_(\d+(?:\.\d+)?)', key)
+        if match:
+            targets.append({'name': key, 'hours': clock_hours(clock), 'quantile': 0.5, 'fitness': float(match.group(1))})
+
+    race_id = simulator.course_profile.get('course_metadata', {}).get('race_id')
+    override = simulator.athlete_profile.get('race_overrides', {}).get(race_id, {})
+    for key, clock in override.get('expected_finish_time_band_hhmm', {}).items():
+        match = re.match(r'p(\d+)', key)
+        if match:
+            targets.append({'name': key, 'hours': clock_hours(clock), 'quantile': int(match.group(1)) / 100, 'fitness': None})
+    return targets
+
+
+def calibrate(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    parameters: Optional[Sequence[str]] = None,
+    targets: Optional[List[Dict]] = None,
+    num_scenarios: int = 1000,
+    tolerance_minutes: float = 5.0,
+    prior_weight: float = 0.2,
+    max_evaluations: int = 400,
+    fitness_range: tuple = (0.95, 1.15),
+    temperature_scenarios: List[Dict] = None,
+    sampler: Optional[ScenarioSampler] = None,
+    seed: Optional[int] = 0,
+    output_path: Optional[str] = None,
+    write: bool = True,
+    verbose: bool = True
+) -> Dict:
+    """
+    Fit course parameters to finish-time targets and write a new profile version.
+
+    Args:
+        elevation_profile: Course elevation data
+        athlete_profile_path: Path to athlete profile JSON
+        course_profile_path: Path to course profile JSON
+        parameters: COURSE_PARAMETERS to fit (every one the course defines
+            when omitted)
+        targets: Finish-time targets (calibration_targets() when omitted)
+        num_scenarios: Scenarios in the common evaluation set
+        tolerance_minutes: Target miss that weighs as much as one
+            CALIBRATION_SCALES step away from the current value
+            (at prior_weight 1)
+        prior_weight: Weight of the penalty on parameter changes
+        max_evaluations: Objective evaluations allowed to the optimiser
+        fitness_range: (min, max) fitness levels of the scenario set
+        temperature_scenarios: Custom temperature scenarios (optional)
+        sampler: Custom ScenarioSampler for the scenario set
+        seed: Seed of the scenario set
+        output_path: Where to write the calibrated profile (next to the
+            original, named after the race id and new version, by default)
+        write: Write the calibrated profile
+        verbose: Print progress updates
+
+    Returns:
+        Dictionary with 'parameters' (fitted values), 'initial', 'targets'
+        (DataFrame of target, initial and fitted finish times), 'profile'
+        (the calibrated course profile), 'output_path' (None when not
+        written), and 'success', 'message' and 'evaluations'
+    """
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    initial = simulator.course_parameter_values()
+    parameters = list(parameters) if parameters is not None else [p for p in CALIBRATION_SCALES if p in initial]
+    unknown = [p for p in parameters if p not in CALIBRATION_SCALES]
+    if unknown:
+        raise ValueError(f"Unknown calibration parameters: {', '.join(unknown)}")
+    targets = targets if targets is not None else calibration_targets(simulator)
+    if not targets:
+        raise ValueError("No calibration targets found in the athlete or course profile")
+
+    plan = simulator.compile_plan(elevation_profile)
+    if sampler is None:
+        sampler = ScenarioSampler.for_course(
+            simulator.course_profile, weather_scenarios=temperature_scenarios, fitness_range=fitness_range
+        )
+    rng = np.random.default_rng(seed)
+    scenarios = sampler.sample(num_scenarios, rng)
+    draws = sampler.sample_race_draws(num_scenarios, plan.n_segments, rng)
+
+    # One block of rows per distinct target fitness (None keeps the sampled fitness)
+    fitness_groups = list(dict.fromkeys(target['fitness'] for target in targets))
+    batch = [
+        scenarios if fitness is None else dataclasses.replace(scenarios, fitness_level=np.full(num_scenarios, fitness))
+        for fitness in fitness_groups
+    ]
+    batch = dataclasses.replace(
+        scenarios, **{field.name: np.concatenate([getattr(b, field.name) for b in batch])
+                      for field in dataclasses.fields(scenarios)}
+    )
+    batch_draws = draws[np.tile(np.arange(num_scenarios), len(fitness_groups))]
+
+    scales = np.array([CALIBRATION_SCALES[p] for p in parameters])
+    start = np.array([initial[p] for p in parameters])
+    lower = (np.array([CALIBRATION_BOUNDS[p][0] for p in parameters]) - start) / scales
+    upper = (np.array([CALIBRATION_BOUNDS[p][1] for p in parameters]) - start) / scales
+    evaluations = 0
+
+    def finish_times(values: np.ndarray) -> np.ndarray:
+        nonlocal evaluations
+        evaluations += 1
+        summary = simulator.simulate_batch(
+            elevation_profile, batch, batch.pacing_strategy, draws=batch_draws, plan=plan,
+            course_parameters=dict(zip(parameters, values))
+        )['summary']
+        times = summary['total_time_hours'].reshape(len(fitness_groups), num_scenarios)
+        return np.array([
+            np.quantile(times[fitness_groups.index(target['fitness'])], target['quantile']) for target in targets
+        ])
+
+    target_hours = np.array([target['hours'] for target in targets])
+
+    def residuals(z: np.ndarray) -> np.ndarray:
+        misses = (finish_times(start + z * scales) - target_hours) * 60 / tolerance_minutes
+        return np.concatenate([misses, np.sqrt(prior_weight) * z])
+
+    if verbose:
+        print(f"Calibrating {len(parameters)} parameters against {len(targets)} targets...")
+
+    initial_hours = finish_times(start)
+    solution = least_squares(
+        residuals, np.zeros(len(parameters)), bounds=(np.minimum(lower, 0), np.maximum(upper, 0)),
+        diff_step=0.05, max_nfev=max_evaluations
+    )
+    fitted = dict(zip(parameters, np.round(start + solution.x * scales, 6).tolist()))
+    fitted_hours = finish_times(np.array(list(fitted.values())))
+
+    table = pd.DataFrame({
+        'Target': [target['name'] for target in targets],
+        'Fitness': [target['fitness'] for target in targets],
+        'Quantile': [target['quantile'] for target in targets],
+        'Target (hours)': target_hours,
+        'Initial (hours)': initial_hours,
+        'Fitted (hours)': fitted_hours,
+    })
+    table['Miss (min)'] = (table['Fitted (hours)'] - table['Target (hours)']) * 60
+
+    profile = calibrated_profile(simulator.course_profile, fitted, table)
+    if write:
+        output_path = output_path or _versioned_path(course_profile_path, profile)
+        if os.path.exists(output_path):
+            raise ValueError(f"{output_path} already exists; pass another output_path")
+        with open(output_path, 'w') as f:
+            json.dump(profile, f, indent=2)
+    else:
+        output_path = None
+
+    if verbose:
+        worst = table['Miss (min)'].abs().max()
+        print(f"✓ {evaluations} evaluations, largest target miss {worst:.1f} min")
+        if output_path:
+            print(f"   Wrote {output_path}")
+
+    return {
+        'parameters': fitted,
+        'initial': {p: initial[p] for p in parameters},
+        'targets': table,
+        'profile': profile,
+        'output_path': output_path,
+        'success': bool(solution.success),
+        'message': str(solution.message),
+        'evaluations': evaluations,
+    }
+
+
+def calibrated_profile(course_profile: Dict, fitted: Dict[str, float], targets: pd.DataFrame) -> Dict:
+    """Copy of a course profile with fitted parameters, a bumped version and calibration notes"""
+    profile = copy.deepcopy(course_profile)
+    sections = {
+        'fatigue_model': profile['simulation_defaults']['fatigue_model'],
+        'field_effects': profile['simulation_defaults']['field_effects'],
+        'technicality': profile['terrain_profile']['technicality'],
+    }
+    changes = {}
+    for name, value in fitted.items():
+        section = sections[DigitalTwinV32.COURSE_PARAMETERS[name]]
+        changes[name] = {'from': section.get(name), 'to': value}
+        section[name] = value
+
+    metadata = profile.setdefault('course_metadata', {})
+    version = str(metadata.get('version', '1.0'))
+    parts = version.split('.')
+    metadata['version'] = '.'.join(parts[:-1] + [str(int(parts[-1]) + 1)]) if parts[-1].isdigit() else version + '.1'
+    profile.setdefault('calibration_notes', {})[f"version_{metadata['version'].replace('.', '_')}_calibration"] = {
+        'date': date.today().isoformat(),
+        'method': 'calibrate(): least squares over common-random-number batch simulations',
+        'parameters': changes,
+        'targets': targets.to_dict(orient='records'),
+    }
+    return profile
+
+
+def _versioned_path(course_profile_path: str, profile: Dict) -> str:
+    metadata = profile['course_metadata']
+    race_id = metadata.get('race_id') or os.path.splitext(os.path.basename(course_profile_path))[0]
+    name = f"{race_id}_course_profile_v{metadata['version'].replace('.', '_')}_CALIBRATED.json"
+    return os.path.join(os.path.dirname(course_profile_path), name)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Checkpoint/resume for long Monte Carlo jobs
+
+A checkpoint directory holds a manifest (seed entropy, chunk size, number
+of simulations and content hashes of the profiles and sampler), the pickled
+sampler, and one .npz shard per completed chunk. Chunks are seeded
+independently, so a resumed job only runs the missing chunks and returns
+exactly what an uninterrupted run would.
+
+    checkpoint_dir/
+        manifest.json
+        sampler.pkl
+        chunk_000000.npz
+        chunk_000001.npz
+        ...
+        aggregate.pkl      (streaming runs: merged aggregate so far)
+"""
+
+import io
+import json
+import os
+import pickle
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .course_plan import content_hash
+
+MANIFEST_FILE = 'manifest.json'
+SAMPLER_FILE = 'sampler.pkl'
+AGGREGATE_FILE = 'aggregate.pkl'
+
+
+class MonteCarloCheckpoint:
+    """
+    Chunk shards and run metadata for one Monte Carlo job.
+
+    Use MonteCarloCheckpoint.open() to create a checkpoint or to reattach to
+    an existing one; opening with settings that differ from the stored
+    manifest raises ValueError rather than mixing incompatible chunks.
+    """
+
+    def __init__(self, directory: str, manifest: Dict):
+        self.directory = directory
+        self.manifest = manifest
+
+    @classmethod
+    def open(
+        cls,
+        directory: str,
+        root_seed: np.random.SeedSequence,
+        settings: Dict[str, Any],
+        sampler=None,
+        seed_given: bool = True
+    ) -> 'MonteCarloCheckpoint':
+        """
+        Create or resume a checkpoint.
+
+        Args:
+            directory: Checkpoint directory (created if missing)
+            root_seed: Root seed of the run
+            settings: JSON-serialisable run settings that must match on resume
+                (runner, num_simulations, chunk_size, profile hashes, ...)
+            sampler: ScenarioSampler of the run, stored and hashed
+            seed_given: False when root_seed was drawn fresh, in which case
+                the stored seed is adopted on resume
+
+        Returns:
+            MonteCarloCheckpoint whose root_seed is the one to run with
+        """
+        os.makedirs(directory, exist_ok=True)
+        manifest = {
+            'seed_entropy': root_seed.entropy,
+            'spawn_key': list(root_seed.spawn_key),
+            'sampler_hash': content_hash(vars(sampler)) if sampler is not None else None,
+            'settings': settings,
+        }
+        manifest = json.loads(json.dumps(manifest))  # Tuples become lists, as when read back
+        path = os.path.join(directory, MANIFEST_FILE)
+
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                stored = json.load(f)
+            if not seed_given:
+                manifest['seed_entropy'] = stored['seed_entropy']
+                manifest['spawn_key'] = stored['spawn_key']
+            mismatched = [key for key in manifest if manifest[key] != stored.get(key)]
+            if mismatched:
+                raise ValueError(
+                    f"Checkpoint in {directory} was written with different {', '.join(mismatched)}"
+                )
+            return cls(directory, stored)
+
+        _atomic_write(path, json.dumps(manifest, indent=2).encode('utf-8'))
+        if sampler is not None:
+            _atomic_write(os.path.join(directory, SAMPLER_FILE), pickle.dumps(sampler))
+        return cls(directory, manifest)
+
+    @property
+    def root_seed(self) -> np.random.SeedSequence:
+        return np.random.SeedSequence(
+            self.manifest['seed_entropy'], spawn_key=tuple(self.manifest['spawn_key'])
+        )
+
+    def sampler(self):
+        """The ScenarioSampler the job was started with"""
+        with open(os.path.join(self.directory, SAMPLER_FILE), 'rb') as f:
+            return pickle.load(f)
+
+    def _chunk_path(self, chunk: int) -> str:
+        return os.path.join(self.directory, f'chunk_{chunk:06d}.npz')
+
+    def completed_chunks(self) -> List[int]:
+        """Indices of the chunks with a saved shard"""
+        return sorted(
+            int(name[len('chunk_'):-len('.npz')])
+            for name in os.listdir(self.directory)
+            if name.startswith('chunk_') and name.endswith('.npz')
+        )
+
+    def save_chunk(self, chunk: int, chunk_df: pd.DataFrame):
+        """Write one chunk of results as an .npz shard"""
+        arrays = {'columns': np.array(chunk_df.columns, dtype=str)}
+        for i, name in enumerate(chunk_df.columns):
+            column = chunk_df[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                arrays[f'c{i}'] = column.cat.codes.to_numpy()
+                arrays[f'c{i}_categories'] = np.array(column.cat.categories, dtype=str)
+            else:
+                values = column.to_numpy()
+                arrays[f'c{i}'] = values.astype(str) if values.dtype == object else values
+        _atomic_write(self._chunk_path(chunk), _npz_bytes(arrays))
+
+    def load_chunk(self, chunk: int) -> pd.DataFrame:
+        """Read one chunk of results"""
+        with np.load(self._chunk_path(chunk), allow_pickle=False) as shard:
+            columns = {}
+            for i, name in enumerate(shard['columns'].tolist()):
+                if f'c{i}_categories' in shard.files:
+                    columns[name] = pd.Categorical.from_codes(shard[f'c{i}'], shard[f'c{i}_categories'].tolist())
+                else:
+                    columns[name] = shard[f'c{i}']
+            return pd.DataFrame(columns)
+
+    def save_aggregate(self, aggregate, next_chunk: int):
+        """Store a streaming run's merged aggregate and the next chunk to run"""
+        _atomic_write(
+            os.path.join(self.directory, AGGREGATE_FILE),
+            pickle.dumps({'next_chunk': next_chunk, 'aggregate': aggregate})
+        )
+
+    def load_aggregate(self) -> Tuple[Optional[Any], int]:
+        """(aggregate, next_chunk) of a streaming run, or (None, 0) when fresh"""
+        path = os.path.join(self.directory, AGGREGATE_FILE)
+        if not os.path.exists(path):
+            return None, 0
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        return state['aggregate'], state['next_chunk']
+
+
+def _npz_bytes(arrays: Dict[str, np.ndarray]) -> bytes:
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write via a temporary file so an interrupted job never leaves a partial file"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
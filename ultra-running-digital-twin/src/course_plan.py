@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Compiled course plans
+
+Everything simulate_race needs that depends only on the athlete, the course
+profile and the elevation profile is computed once per segment and cached,
+so the per-scenario loop only applies the scenario-dependent factors
+(pacing, temperature, nutrition, heart rate and respiratory impact).
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy.special import ndtri
+
+# Number of compiled plans kept in memory
+PLAN_CACHE_SIZE = 64
+
+PHASES = ('early', 'mid', 'late')
+
+_PLAN_CACHE: "OrderedDict[str, CoursePlan]" = OrderedDict()
+
+# Stop model for courses without an aid_station_model (6-10 stops of about 2 min)
+DEFAULT_AID_STATION_MODEL = {
+    'expected_stops_count': [6, 10],
+    'median_stop_seconds': 120,
+    'p90_stop_seconds': 160,
+    'stop_time_multiplier': 1.0,
+}
+
+
+@dataclass
+class CoursePlan:
+    """Per-segment course and athlete quantities for one elevation profile"""
+    key: str
+    total_distance_km: float
+    distance_km: np.ndarray  # Distance at the end of each segment
+    prev_distance_km: np.ndarray  # Distance at the start of each segment
+    segment_km: np.ndarray
+    elevation_m: np.ndarray
+    gradient_pct: np.ndarray
+    phase: List[str]  # 'early', 'mid' or 'late'
+    phase_index: np.ndarray  # Index into PHASES
+    base_speed_kmh: np.ndarray  # From get_base_speed, before pacing
+    field_loss: np.ndarray  # From calculate_field_loss
+    fatigue: np.ndarray  # From calculate_fatigue_impact at segment start
+    hr_gradient_addition: np.ndarray  # Gradient term of estimate_heart_rate
+    checkpoint_names: List[str]  # Aid stations after the start, always ending with the finish
+    checkpoint_km: np.ndarray
+    checkpoint_segment: np.ndarray  # Index of the segment that reaches each checkpoint
+    checkpoint_cutoff_hours: np.ndarray  # Elapsed-time cutoff (inf when there is none)
+    key_segment_names: List[str]
+    key_segment_start: np.ndarray  # Segment reaching each key segment's start (-1 at the race start)
+    key_segment_end: np.ndarray  # Segment reaching each key segment's end
+    timing_segments: np.ndarray  # Segments whose elapsed time is recorded (checkpoints and key segment ends)
+    checkpoint_slot: np.ndarray  # Index into timing_segments of each checkpoint
+    key_segment_start_slot: np.ndarray  # Index into timing_segments of each key segment start (0 at the race start)
+    key_segment_end_slot: np.ndarray  # Index into timing_segments of each key segment end
+    aid_stops_range: Tuple[int, int]  # (min, max) number of stops
+    aid_stop_median_seconds: float  # Median stop length before multipliers
+    aid_stop_sigma: float  # Log-scale spread of the stop length
+    aid_stop_multiplier: float  # stop_time_multiplier, with crew stops weighted in
+
+    @property
+    def n_segments(self) -> int:
+        return len(self.distance_km)
+
+    @property
+    def n_checkpoints(self) -> int:
+        return len(self.checkpoint_names)
+
+    def aid_station_hours(self, count_uniform, stop_uniform):
+        """
+        Total aid station time from uniform draws.
+
+        The number of stops is uniform over aid_stops_range and the average
+        stop is lognormal, so a slow runner is slow at every stop.
+        """
+        low, high = self.aid_stops_range
+        count = np.minimum(low + np.floor(np.multiply(count_uniform, high - low + 1)), high)
+        stop_seconds = self.aid_stop_median_seconds * np.exp(self.aid_stop_sigma * ndtri(stop_uniform))
+        return count * stop_seconds * self.aid_stop_multiplier / 3600
+
+
+def content_hash(*parts) -> str:
+    """Stable hash of JSON-serialisable inputs"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def compile_course_plan(simulator, elevation_profile: List[Dict]) -> CoursePlan:
+    """
+    Build (or fetch from the LRU cache) the course plan for a simulator.
+
+    Args:
+        simulator: DigitalTwinV32 instance providing athlete and course profiles
+        elevation_profile: Course elevation data
+
+    Returns:
+        CoursePlan keyed by a content hash of athlete, course and elevation
+    """
+    key = content_hash(simulator.profile_key, elevation_profile)
+    plan = _PLAN_CACHE.get(key)
+    if plan is not None:
+        _PLAN_CACHE.move_to_end(key)
+        return plan
+
+    plan = _build_plan(simulator, elevation_profile, key)
+    _PLAN_CACHE[key] = plan
+    if len(_PLAN_CACHE) > PLAN_CACHE_SIZE:
+        _PLAN_CACHE.popitem(last=False)
+    return plan
+
+
+def clear_plan_cache():
+    """Drop all cached course plans"""
+    _PLAN_CACHE.clear()
+
+
+def _build_plan(simulator, elevation_profile: List[Dict], key: str) -> CoursePlan:
+    """Evaluate the course-only model terms segment by segment"""
+    distance = np.array([p['distance_km'] for p in elevation_profile], dtype=float)
+    elevation = np.array([p['elevation_m'] for p in elevation_profile], dtype=float)
+    gradient = np.array([p['gradient_pct'] for p in elevation_profile], dtype=float)
+    total_distance = elevation_profile[-1]['distance_km']
+
+    phases = []
+    hr_addition = []
+    for point in elevation_profile[1:]:
+        progress = point['distance_km'] / total_distance
+        if progress < 0.33:
+            phases.append('early')
+        elif progress < 0.66:
+            phases.append('mid')
+        else:
+            phases.append('late')
+
+        gradient_pct = point['gradient_pct']
+        if gradient_pct > 5:
+            hr_addition.append((gradient_pct - 5) * 2)
+        elif gradient_pct < -5:
+            hr_addition.append(abs(gradient_pct + 5) * 1)
+        else:
+            hr_addition.append(0)
+
+    checkpoints = _checkpoints(simulator.course_profile, distance[1:], total_distance)
+    key_segments = _key_segments(simulator.course_profile, distance[1:])
+
+    return CoursePlan(
+        key=key,
+        total_distance_km=total_distance,
+        distance_km=distance[1:],
+        prev_distance_km=distance[:-1],
+        segment_km=distance[1:] - distance[:-1],
+        elevation_m=elevation[1:],
+        gradient_pct=gradient[1:],
+        phase=phases,
+        phase_index=np.array([PHASES.index(p) for p in phases], dtype=int),
+        base_speed_kmh=np.array([simulator.get_base_speed(g) for g in gradient[1:].tolist()]),
+        field_loss=np.array([
+            simulator.calculate_field_loss(d, g) for d, g in zip(distance[1:].tolist(), gradient[1:].tolist())
+        ]),
+        fatigue=np.array([simulator.calculate_fatigue_impact(d) for d in distance[:-1].tolist()]),
+        hr_gradient_addition=np.array(hr_addition, dtype=float),
+        **checkpoints,
+        **key_segments,
+        **_timing_slots(checkpoints['checkpoint_segment'], key_segments),
+        **_aid_station_model(simulator.course_profile)
+    )
+
+
+def clock_hours(clock: str) -> float:
+    """'HH:MM' as hours after midnight"""
+    hours, minutes = clock.split(':')
+    return int(hours) + int(minutes) / 60
+
+
+def _checkpoints(course_profile: Dict, distance_km: np.ndarray, total_distance: float) -> Dict:
+    """
+    Checkpoints with elapsed-time cutoffs from the course profile.
+
+    Aid station cumulative_cutoff_time values are clock times; they are
+    measured from the start station's cutoff_time (falling back to
+    course_metadata.start_time), wrapping past midnight. The finish cutoff
+    falls back to course_metadata.cutoff_hours. Checkpoints beyond the end
+    of the elevation profile map to its last segment.
+    """
+    metadata = course_profile.get('course_metadata', {})
+    stations = course_profile.get('aid_stations', [])
+    start = next((s for s in stations if s.get('type') == 'start'), None)
+    reference = (start or {}).get('cumulative_cutoff_time', metadata.get('start_time'))
+
+    names, km, cutoffs = [], [], []
+    for station in stations:
+        if station.get('type') == 'start':
+            continue
+        cutoff = float('inf')
+        clock = station.get('cumulative_cutoff_time')
+        if clock is not None and reference is not None:
+            cutoff = (clock_hours(clock) - clock_hours(reference)) % 24 or 24.0
+        names.append(station['name'])
+        km.append(float(station['distance_km']))
+        cutoffs.append(cutoff)
+
+    if not stations or stations[-1].get('type') != 'finish':
+        names.append('Finish')
+        km.append(float(total_distance))
+        cutoffs.append(float('inf'))
+    if np.isinf(cutoffs[-1]) and 'cutoff_hours' in metadata:
+        cutoffs[-1] = float(metadata['cutoff_hours'])
+
+    km = np.array(km)
+    return {
+        'checkpoint_names': names,
+        'checkpoint_km': km,
+        'checkpoint_segment': _segment_reaching(distance_km, km),
+        'checkpoint_cutoff_hours': np.array(cutoffs),
+    }
+
+
+def _key_segments(course_profile: Dict, distance_km: np.ndarray) -> Dict:
+    """Key segment boundaries from the course profile's key_segments"""
+    segments = course_profile.get('key_segments', [])
+    start_km = np.array([float(s['start_km']) for s in segments])
+    end_km = np.array([float(s['end_km']) for s in segments])
+    start = _segment_reaching(distance_km, start_km)
+    return {
+        'key_segment_names': [s['name'] for s in segments],
+        'key_segment_start': np.where(start_km <= 0, -1, start),
+        'key_segment_end': _segment_reaching(distance_km, end_km),
+    }
+
+
+def _timing_slots(checkpoint_segment: np.ndarray, key_segments: Dict) -> Dict:
+    """Segments whose elapsed time is recorded, and where each checkpoint and key segment reads it"""
+    start, end = key_segments['key_segment_start'], key_segments['key_segment_end']
+    timing = np.unique(np.concatenate([checkpoint_segment, start[start >= 0], end]).astype(int))
+    return {
+        'timing_segments': timing,
+        'checkpoint_slot': np.searchsorted(timing, checkpoint_segment),
+        'key_segment_start_slot': np.searchsorted(timing, np.maximum(start, 0)),
+        'key_segment_end_slot': np.searchsorted(timing, end),
+    }
+
+
+def _segment_reaching(distance_km: np.ndarray, km: np.ndarray) -> np.ndarray:
+    """Index of the first segment ending at or beyond each distance (clipped to the last)"""
+    segment = np.searchsorted(distance_km, np.asarray(km, dtype=float) - 1e-9, side='left')
+    return np.minimum(segment, len(distance_km) - 1).astype(int)
+
+
+def _aid_station_model(course_profile: Dict) -> Dict:
+    """
+    Stop count and stop length parameters from aid_station_model.
+
+    The lognormal spread comes from the median and p90 stop lengths. Crew
+    stops (crew type or crew access) take crew_stop_multiplier times longer,
+    weighted by their share of the intermediate aid stations.
+    """
+    model = course_profile.get('aid_station_model', DEFAULT_AID_STATION_MODEL)
+    low, high = (int(n) for n in model['expected_stops_count'])
+    median = float(model['median_stop_seconds'])
+    p90 = float(model.get('p90_stop_seconds', median))
+    if low > high or median <= 0 or p90 < median:
+        raise ValueError(f"Invalid aid_station_model: {model}")
+
+    stations = [s for s in course_profile.get('aid_stations', []) if s.get('type') not in ('start', 'finish')]
+    crew = [s for s in stations if s.get('type') == 'crew' or s.get('features', {}).get('crew_access')]
+    crew_share = len(crew) / len(stations) if stations else 0.0
+    crew_multiplier = 1 + crew_share * (float(model.get('crew_stop_multiplier', 1.0)) - 1)
+    return {
+        'aid_stops_range': (low, high),
+        'aid_stop_median_seconds': median,
+        'aid_stop_sigma': float(np.log(p90 / median) / ndtri(0.9)),
+        'aid_stop_multiplier': float(model.get('stop_time_multiplier', 1.0)) * crew_multiplier,
+    }
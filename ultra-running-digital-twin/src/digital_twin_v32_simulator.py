@@ -8,8 +8,11 @@ import json
 import numpy as np
 import pandas as pd
 import random
-from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional
+from collections.abc import Sequence as SequenceABC
+from dataclasses import dataclass, fields
+from typing import List, Dict, Tuple, Optional, Sequence, Union
+
+from .course_plan import PHASES, CoursePlan, compile_course_plan, content_hash
 
 @dataclass
 class TerrainSegment:
@@ -34,22 +37,275 @@ class NutritionStrategy:
     fluid_ml_per_hour: float = 500.0
     electrolytes_mg_per_hour: float = 500.0
 
+@dataclass
+class RaceDraws:
+    """
+    Random draws consumed by race simulations, one row per scenario.
+
+    Passing the same draws to simulate_race and simulate_batch makes the
+    two engines produce identical results for a fixed seed. Aid station
+    draws are uniforms; the course's aid station model turns them into
+    stop counts and lengths (CoursePlan.aid_station_hours).
+    """
+    incident_uniform: np.ndarray  # (n_scenarios, n_segments) respiratory incident draws
+    aid_count_uniform: np.ndarray  # (n_scenarios,) number of aid station stops
+    aid_stop_uniform: np.ndarray  # (n_scenarios,) average stop length
+
+    @classmethod
+    def sample(cls, rng: np.random.Generator, n_scenarios: int, n_segments: int) -> 'RaceDraws':
+        """Draw everything a batch of simulations needs from one generator"""
+        return cls(
+            incident_uniform=rng.random((n_scenarios, n_segments)),
+            aid_count_uniform=rng.random(n_scenarios),
+            aid_stop_uniform=rng.random(n_scenarios)
+        )
+
+    def __len__(self) -> int:
+        return len(self.aid_count_uniform)
+
+    def __getitem__(self, index) -> 'RaceDraws':
+        """Select scenario rows; an integer index keeps a single-row batch"""
+        rows = np.atleast_1d(np.arange(len(self))[index])
+        return RaceDraws(
+            incident_uniform=self.incident_uniform[rows],
+            aid_count_uniform=self.aid_count_uniform[rows],
+            aid_stop_uniform=self.aid_stop_uniform[rows]
+        )
+
+@dataclass
+class ScenarioBatch:
+    """
+    Struct-of-arrays scenario set, one entry per scenario.
+    
+    EnvironmentalConditions/NutritionStrategy views are only built on
+    demand through scenario() or to_scenarios().
+    """
+    temperature_c: np.ndarray
+    altitude_m: np.ndarray
+    humidity_pct: np.ndarray
+    wind_speed_kmh: np.ndarray
+    precipitation: np.ndarray
+    calories_per_hour: np.ndarray
+    fluid_ml_per_hour: np.ndarray
+    electrolytes_mg_per_hour: np.ndarray
+    fitness_level: np.ndarray
+    pollen_level: np.ndarray
+    pacing_strategy: np.ndarray
+    weather_scenario: np.ndarray
+
+    @classmethod
+    def from_scenarios(cls, scenarios: List[Dict], pacing_strategy: str = 'even') -> 'ScenarioBatch':
+        """Stack scenario dicts in the simulate_race format"""
+        return cls(
+            temperature_c=np.array([s['environment'].temperature_celsius for s in scenarios], dtype=float),
+            altitude_m=np.array([s['environment'].altitude_m for s in scenarios], dtype=float),
+            humidity_pct=np.array([s['environment'].humidity_pct for s in scenarios], dtype=float),
+            wind_speed_kmh=np.array([s['environment'].wind_speed_kmh for s in scenarios], dtype=float),
+            precipitation=np.array([s['environment'].precipitation for s in scenarios]),
+            calories_per_hour=np.array([s['nutrition'].calories_per_hour for s in scenarios], dtype=float),
+            fluid_ml_per_hour=np.array([s['nutrition'].fluid_ml_per_hour for s in scenarios], dtype=float),
+            electrolytes_mg_per_hour=np.array([s['nutrition'].electrolytes_mg_per_hour for s in scenarios], dtype=float),
+            fitness_level=np.array([s['fitness_level'] for s in scenarios], dtype=float),
+            pollen_level=np.array([s.get('pollen_level', 'low') for s in scenarios]),
+            pacing_strategy=np.full(len(scenarios), pacing_strategy),
+            weather_scenario=np.array([s.get('weather_scenario', '') for s in scenarios])
+        )
+
+    def __len__(self) -> int:
+        return len(self.fitness_level)
+
+    def __getitem__(self, index) -> 'ScenarioBatch':
+        """Select scenario rows; an integer index keeps a single-row batch"""
+        rows = np.atleast_1d(np.arange(len(self))[index])
+        return ScenarioBatch(**{name: values[rows] for name, values in vars(self).items()})
+
+    def scenario(self, index: int) -> Dict:
+        """Build the simulate_race scenario dict for one entry"""
+        return {
+            'environment': EnvironmentalConditions(
+                temperature_celsius=float(self.temperature_c[index]),
+                altitude_m=float(self.altitude_m[index]),
+                humidity_pct=float(self.humidity_pct[index]),
+                wind_speed_kmh=float(self.wind_speed_kmh[index]),
+                precipitation=str(self.precipitation[index])
+            ),
+            'nutrition': NutritionStrategy(
+                calories_per_hour=float(self.calories_per_hour[index]),
+                fluid_ml_per_hour=float(self.fluid_ml_per_hour[index]),
+                electrolytes_mg_per_hour=float(self.electrolytes_mg_per_hour[index])
+            ),
+            'fitness_level': float(self.fitness_level[index]),
+            'pollen_level': str(self.pollen_level[index]),
+            'weather_scenario': str(self.weather_scenario[index])
+        }
+
+    def to_scenarios(self) -> List[Dict]:
+        """Build simulate_race scenario dicts for every entry"""
+        return [self.scenario(i) for i in range(len(self))]
+
+@dataclass
+class AthleteParameters:
+    """
+    Athlete-specific model inputs, one row per simulated run.
+    
+    simulate_batch reads these instead of the simulator's own athlete
+    profile when several athletes share one batch (see FieldSimulator).
+    DigitalTwinV32.athlete_parameters builds the single-athlete version
+    with scalar fields and per-segment base speeds.
+    """
+    base_speed_kmh: np.ndarray  # (n_runs, n_segments) get_base_speed per segment
+    baseline_impact: np.ndarray  # Respiratory baseline_impact at optimal conditions
+    vulnerable_start_km: np.ndarray  # Early race respiratory vulnerable zone
+    vulnerable_end_km: np.ndarray
+    extreme_danger_c: np.ndarray  # Respiratory temperature thresholds
+    high_risk_c: np.ndarray
+    moderate_risk_c: np.ndarray
+    average_ultra_hr: np.ndarray  # Heart rate parameters (DigitalTwinV32.heart_rate)
+    threshold_hr: np.ndarray
+    max_hr: np.ndarray
+    
+    @classmethod
+    def stack(cls, parameters: Sequence['AthleteParameters'], repeats: int) -> 'AthleteParameters':
+        """Each athlete's parameters repeated for `repeats` runs, athlete by athlete"""
+        return cls(**{
+            field.name: np.repeat(
+                np.stack([np.asarray(getattr(p, field.name), dtype=float) for p in parameters]), repeats, axis=0
+            )
+            for field in fields(cls)
+        })
+    
+    def __len__(self) -> int:
+        return len(self.baseline_impact)
+    
+    def __getitem__(self, index) -> 'AthleteParameters':
+        """Select run rows"""
+        rows = np.atleast_1d(np.arange(len(self))[index])
+        return AthleteParameters(**{name: values[rows] for name, values in vars(self).items()})
+
+# Per-segment output columns, in the order of the segment dicts
+SEGMENT_COLUMNS = (
+    'distance_km', 'elevation_m', 'gradient_pct', 'temperature_c', 'base_speed_kmh',
+    'adjusted_speed_kmh', 'respiratory_multiplier', 'final_speed_kmh', 'hr_estimate',
+    'segment_time_hours', 'cumulative_time_hours', 'is_hiking', 'phase'
+)
+
+# Result detail levels: full segment dicts, summary only, or per-segment arrays
+DETAIL_MODES = ('segments', 'summary', 'columnar')
+
+class SegmentView(SequenceABC):
+    """
+    Read-only list-of-dicts view over columnar segment output.
+    
+    The segment dicts are only built on first access.
+    """
+    
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+        self._records = None
+    
+    @classmethod
+    def from_batch(cls, columns: Dict[str, np.ndarray], index: int) -> 'SegmentView':
+        """View one scenario of a columnar simulate_batch result"""
+        return cls({name: values[index] for name, values in columns.items()})
+    
+    def _materialise(self) -> List[Dict]:
+        if self._records is None:
+            names = list(self.columns)
+            values = [np.asarray(self.columns[name]).tolist() for name in names]
+            self._records = [dict(zip(names, row)) for row in zip(*values)]
+        return self._records
+    
+    def __getitem__(self, index):
+        return self._materialise()[index]
+    
+    def __len__(self) -> int:
+        return len(self.columns['distance_km'])
+    
+    def to_list(self) -> List[Dict]:
+        """Materialise the segments as a plain list of dicts"""
+        return list(self._materialise())
+
 class DigitalTwinV32:
     """
     Enhanced Digital Twin v3.2 with course profile integration
     """
     
+    # Pacing multipliers by race phase
+    PACING_MULTIPLIERS = {
+        'conservative': {'early': 0.92, 'mid': 0.98, 'late': 1.05},
+        'moderate': {'early': 0.95, 'mid': 1.00, 'late': 1.03},
+        'aggressive': {'early': 1.03, 'mid': 0.98, 'late': 0.95},
+        'even': {'early': 1.00, 'mid': 1.00, 'late': 1.00},
+        'negative_split': {'early': 0.90, 'mid': 0.95, 'late': 1.08},
+        'race_mode': {'early': 1.05, 'mid': 1.05, 'late': 1.05},
+    }
+    
+    # Multiplicative speed factors, in the order simulate_race applies them
+    SPEED_FACTORS = (
+        'pacing', 'fitness', 'technical', 'field_loss', 'temperature',
+        'altitude', 'fatigue', 'nutrition', 'respiratory'
+    )
+    
+    # Course profile parameters simulate_batch can override per scenario,
+    # with the profile section each one is read from
+    COURSE_PARAMETERS = {
+        'fatigue_inflection_km': 'fatigue_model',
+        'fatigue_per_km_base': 'fatigue_model',
+        'fatigue_slope_multiplier': 'fatigue_model',
+        'field_loss_multiplier_runnable_trail': 'field_effects',
+        'field_loss_multiplier_short_climbs': 'field_effects',
+        'dry_multiplier': 'technicality',
+        'light_rain_multiplier': 'technicality',
+        'wet_multiplier': 'technicality',
+    }
+    
+    # Course profile keys read in place of a missing COURSE_PARAMETERS entry
+    # (the Arc profile grades wet conditions as rain/storm)
+    COURSE_PARAMETER_ALIASES = {
+        'wet_multiplier': 'rain_multiplier',
+    }
+    
+    # Heart rate parameters used when physiological_profile.heart_rate
+    # does not define them
+    DEFAULT_HEART_RATE = {
+        'average_ultra_hr': 122,
+        'threshold_hr': 150,
+        'max_hr': 163,
+    }
+    
     def __init__(self, athlete_profile_path: str, course_profile_path: str):
         """Load athlete and course profiles"""
         with open(athlete_profile_path, 'r') as f:
-            self.athlete_profile = json.load(f)
+            athlete_profile = json.load(f)
         
         with open(course_profile_path, 'r') as f:
-            self.course_profile = json.load(f)
+            course_profile = json.load(f)
+        
+        self._load_profiles(athlete_profile, course_profile)
+    
+    @classmethod
+    def from_profiles(cls, athlete_profile: Dict, course_profile: Dict) -> 'DigitalTwinV32':
+        """
+        Build a simulator from already parsed profiles.
+        
+        The profile dicts are shared, not copied, so one parsed athlete
+        profile can back simulators for several courses.
+        """
+        simulator = cls.__new__(cls)
+        simulator._load_profiles(athlete_profile, course_profile)
+        return simulator
+    
+    def _load_profiles(self, athlete_profile: Dict, course_profile: Dict):
+        self.athlete_profile = athlete_profile
+        self.course_profile = course_profile
         
         # Extract key parameters
         self.speed_by_gradient = self.athlete_profile['performance_by_gradient']
         self.respiratory_profile = self.athlete_profile['respiratory_profile']
+        heart_rate = self.athlete_profile.get('physiological_profile', {}).get('heart_rate', {})
+        self.heart_rate = {
+            name: heart_rate.get(name, default) for name, default in self.DEFAULT_HEART_RATE.items()
+        }
         
         # Course-specific parameters
         self.terrain = self.course_profile['terrain_profile']
@@ -59,6 +315,56 @@ class DigitalTwinV32:
         
         # Initialize state
         self.fitness_level = 1.0
+        self._profile_key = None
+    
+    @property
+    def profile_key(self) -> str:
+        """
+        Content hash of the profile sections the model reads.
+        
+        Profiles are treated as read-only once the simulator is built.
+        """
+        if self._profile_key is None:
+            self._profile_key = content_hash(
+                self.speed_by_gradient, self.respiratory_profile, self.heart_rate, self.course_profile
+            )
+        return self._profile_key
+    
+    def course_parameter_values(self) -> Dict[str, float]:
+        """
+        Current values of the COURSE_PARAMETERS the course profile defines
+        (directly or through COURSE_PARAMETER_ALIASES)
+        """
+        sections = {
+            'fatigue_model': self.fatigue_model,
+            'field_effects': self.field_effects,
+            'technicality': self.terrain['technicality'],
+        }
+        values = {}
+        for name, section in self.COURSE_PARAMETERS.items():
+            key = name if name in sections[section] else self.COURSE_PARAMETER_ALIASES.get(name)
+            if key in sections[section]:
+                values[name] = float(sections[section][key])
+        return values
+    
+    def compile_plan(self, elevation_profile: List[Dict]) -> CoursePlan:
+        """Get the cached course plan for an elevation profile"""
+        return compile_course_plan(self, elevation_profile)
+    
+    def athlete_parameters(self, plan: CoursePlan) -> AthleteParameters:
+        """This simulator's athlete inputs to simulate_batch, for the course plan"""
+        vulnerable_zone = self.respiratory_profile['vulnerable_zones']['early_race_km']
+        temp_thresholds = self.respiratory_profile['temperature_thresholds']
+        return AthleteParameters(
+            base_speed_kmh=plan.base_speed_kmh,
+            baseline_impact=self.respiratory_profile['baseline_impact']['optimal_conditions'],
+            vulnerable_start_km=vulnerable_zone['start_km'],
+            vulnerable_end_km=vulnerable_zone['end_km'],
+            extreme_danger_c=temp_thresholds['extreme_danger_c'],
+            high_risk_c=temp_thresholds['high_risk_c'],
+            moderate_risk_c=temp_thresholds['moderate_risk_c'],
+            **self.heart_rate
+        )
         
     def get_base_speed(self, gradient_pct: float) -> float:
         """Get baseline speed for a given gradient"""
@@ -84,7 +390,7 @@ class DigitalTwinV32:
         elif precipitation == 'light_rain':
             return multipliers['light_rain_multiplier']
         else:  # wet
-            return multipliers['wet_multiplier']
+            return multipliers.get('wet_multiplier', multipliers.get('rain_multiplier'))
     
     def calculate_temperature_impact(self, temperature: float) -> float:
         """Calculate performance impact from temperature"""
@@ -138,16 +444,17 @@ class DigitalTwinV32:
         """
         Calculate field loss multiplier for Chianti's runnable profile
         Accounts for athlete's strength on runnable terrain with short climbs
+        (no effect on courses whose field_effects leave these out)
         """
         base_multiplier = 1.0
         
         # Runnable trail advantage
         if abs(gradient_pct) < 10:  # Runnable sections
-            base_multiplier *= self.field_effects['field_loss_multiplier_runnable_trail']
+            base_multiplier *= self.field_effects.get('field_loss_multiplier_runnable_trail', 1.0)
         
         # Short climb advantage (6-16% grades typical)
         if 6 <= gradient_pct <= 16:
-            base_multiplier *= self.field_effects['field_loss_multiplier_short_climbs']
+            base_multiplier *= self.field_effects.get('field_loss_multiplier_short_climbs', 1.0)
         
         return base_multiplier
     
@@ -169,10 +476,14 @@ class DigitalTwinV32:
         hr_estimated: int,
         temperature: float,
         time_in_zone3_minutes: float,
-        fitness_level: float
+        fitness_level: float,
+        incident_draw: Optional[float] = None
     ) -> Tuple[float, bool]:
         """
         Calculate respiratory impact with Arc 2025 validation
+        
+        incident_draw replaces the random.random() call in the high-risk
+        temperature band so results can be reproduced from RaceDraws.
         """
         impact = self.respiratory_profile['baseline_impact']['optimal_conditions']
         is_incident = False
@@ -192,8 +503,9 @@ class DigitalTwinV32:
                     is_incident = True
         
         # High HR penalty
-        if hr_estimated > 150:
-            hr_penalty = 1 - ((hr_estimated - 150) * 0.0008)
+        threshold_hr = self.heart_rate['threshold_hr']
+        if hr_estimated > threshold_hr:
+            hr_penalty = 1 - ((hr_estimated - threshold_hr) * 0.0008)
             impact *= max(0.88, hr_penalty)
         
         # Temperature impact
@@ -206,7 +518,9 @@ class DigitalTwinV32:
             impact *= temp_penalty
             if 10 <= distance_km <= 25:
                 incident_prob = 0.7 if fitness_level < 1.15 else 0.3
-                is_incident = random.random() < incident_prob
+                if incident_draw is None:
+                    incident_draw = random.random()
+                is_incident = incident_draw < incident_prob
         elif temperature <= temp_thresholds['moderate_risk_c']:
             temp_penalty = 0.98 ** (10 - temperature)
             impact *= temp_penalty
@@ -235,7 +549,7 @@ class DigitalTwinV32:
         fitness_level: float = 1.0
     ) -> int:
         """Estimate HR based on gradient, speed, and fatigue"""
-        base_hr = 122
+        base_hr = self.heart_rate['average_ultra_hr']
         
         # Fitness HR reduction
         fitness_hr_reduction = (fitness_level - 1.0) * 8
@@ -256,61 +570,91 @@ class DigitalTwinV32:
         fatigue_hr = fatigue * 10
         
         estimated_hr = int(base_hr + hr_addition + speed_factor + fatigue_hr)
-        return min(163, max(85, estimated_hr))
+        return min(self.heart_rate['max_hr'], max(85, estimated_hr))
     
     def simulate_race(
         self,
         elevation_profile: List[Dict],
         scenario: Dict,
         pacing_strategy: str = 'even',
-        start_time_hour: int = 6
+        start_time_hour: int = 6,
+        draws: Optional[RaceDraws] = None,
+        plan: Optional[CoursePlan] = None,
+        detail: str = 'segments',
+        cutoffs: bool = False,
+        time_cap_hours: Optional[float] = None
     ) -> Dict:
         """
         Simulate complete race with course profile integration
+        
+        draws: optional single-row RaceDraws used instead of the global
+        random module (see simulate_batch)
+        plan: precompiled CoursePlan for elevation_profile (looked up in
+        the plan cache when omitted)
+        detail: 'segments' returns the full result with a list of segment
+        dicts, 'summary' returns only the summary, and 'columnar' returns
+        per-segment arrays under 'columns' with 'segments' as a lazy view
+        cutoffs: stop the run at the first checkpoint reached after its
+        cutoff and record a DNF there
+        time_cap_hours: stop the run once elapsed time passes this cap and
+        record a DNF at the next checkpoint
+        
+        Elapsed time is moving time plus the aid station time pro rata to
+        distance. The summary's 'checkpoint_hours' and 'key_segment_hours'
+        give it at each plan checkpoint and over each course key segment
+        (NaN where the run did not get that far). With a stop rule the summary also has
+        'finished', 'dnf_checkpoint' (checkpoint name, None for finishers)
+        and 'dnf_distance_km', and its totals cover the distance covered.
         """
+        if detail not in DETAIL_MODES:
+            raise ValueError(f"Unknown detail level: {detail}")
+        keep_segments = detail != 'summary'
+        
         # Set up
         env = scenario['environment']
         nutrition = scenario['nutrition']
         fitness = scenario['fitness_level']
         
-        # Pacing multipliers
-        pacing_multipliers = {
-            'conservative': {'early': 0.92, 'mid': 0.98, 'late': 1.05},
-            'moderate': {'early': 0.95, 'mid': 1.00, 'late': 1.03},
-            'aggressive': {'early': 1.03, 'mid': 0.98, 'late': 0.95},
-            'even': {'early': 1.00, 'mid': 1.00, 'late': 1.00},
-            'negative_split': {'early': 0.90, 'mid': 0.95, 'late': 1.08},
-            'race_mode': {'early': 1.05, 'mid': 1.05, 'late': 1.05},
-        }
+        pacing = self.PACING_MULTIPLIERS.get(pacing_strategy, self.PACING_MULTIPLIERS['even'])
         
-        pacing = pacing_multipliers.get(pacing_strategy, pacing_multipliers['even'])
+        # Course-only terms, compiled once per (athlete, course, elevation profile)
+        if plan is None:
+            plan = self.compile_plan(elevation_profile)
         
         # Initialize tracking
-        results = []
+        rows = []
         cumulative_time_hours = 0.0
+        hiking_time = 0.0
         time_in_zone3_minutes = 0.0
         respiratory_incidents = []
-        total_distance = elevation_profile[-1]['distance_km']
+        total_distance = plan.total_distance_km
         aid_station_time_hours = 0.0
         
-        # Technical multiplier (from course profile)
+        # Scenario-level multipliers
         tech_multiplier = self.calculate_technical_impact(env.precipitation)
+        altitude_multiplier = self.calculate_altitude_impact(env.altitude_m, 0.0)
+        
+        # Aid station time, spread over the course pro rata to distance
+        aid_total_hours = self._aid_station_hours(plan, draws)
+        timing_slot = {int(k): j for j, k in enumerate(plan.timing_segments)}
+        timing_hours = np.full(len(timing_slot), np.nan)
+        
+        # Stop rules
+        stop_rules = cutoffs or time_cap_hours is not None
+        dnf_checkpoint = None
+        if stop_rules:
+            stop_limit, _ = self._stop_limits(plan, cutoffs, time_cap_hours)
+            time_cap = np.inf if time_cap_hours is None else time_cap_hours
+            next_checkpoint = 0
         
         # Simulate segment-by-segment
-        for i in range(1, len(elevation_profile)):
-            segment = elevation_profile[i]
-            prev_segment = elevation_profile[i-1]
-            distance_segment_km = segment['distance_km'] - prev_segment['distance_km']
-            
-            # Determine race phase
-            progress = segment['distance_km'] / total_distance
-            if progress < 0.33:
-                phase = 'early'
-            elif progress < 0.66:
-                phase = 'mid'
-            else:
-                phase = 'late'
-            
+        segments = zip(
+            plan.distance_km.tolist(), plan.segment_km.tolist(), plan.elevation_m.tolist(),
+            plan.gradient_pct.tolist(), plan.phase, plan.base_speed_kmh.tolist(),
+            plan.field_loss.tolist(), plan.fatigue.tolist()
+        )
+        for i, (distance_km, distance_segment_km, elevation_m, gradient_pct,
+                phase, base_speed, field_loss, fatigue) in enumerate(segments, start=1):
             # Time-based temperature
             elapsed_hours = cumulative_time_hours
             current_hour = start_time_hour + int(elapsed_hours)
@@ -326,8 +670,7 @@ class DigitalTwinV32:
             
             current_temp = env.temperature_celsius + temp_adjustment
             
-            # Get base speed and apply pacing
-            base_speed = self.get_base_speed(segment['gradient_pct'])
+            # Apply pacing to the base speed
             base_speed *= pacing[phase]
             
             # Calculate adjusted speed
@@ -340,50 +683,50 @@ class DigitalTwinV32:
             adjusted_speed *= tech_multiplier
             
             # Apply field loss (runnable trail advantage)
-            adjusted_speed *= self.calculate_field_loss(segment['distance_km'], segment['gradient_pct'])
+            adjusted_speed *= field_loss
             
             # Apply environmental factors
             adjusted_speed *= self.calculate_temperature_impact(current_temp)
-            adjusted_speed *= self.calculate_altitude_impact(env.altitude_m, segment['distance_km'])
+            adjusted_speed *= altitude_multiplier
             
             # Apply course-specific fatigue model
-            adjusted_speed *= self.calculate_fatigue_impact(prev_segment['distance_km'])
+            adjusted_speed *= fatigue
             
             # Apply nutrition
             adjusted_speed *= self.calculate_nutrition_impact(cumulative_time_hours, nutrition.calories_per_hour)
             
             # Estimate heart rate
-            fatigue_factor = 1 - self.calculate_fatigue_impact(prev_segment['distance_km'])
             hr_estimate = self.estimate_heart_rate(
-                segment['gradient_pct'],
+                gradient_pct,
                 adjusted_speed,
-                fatigue_factor,
+                1 - fatigue,
                 fitness
             )
             
             # Track Zone 3+ time
-            if hr_estimate > 150:
+            if hr_estimate > self.heart_rate['threshold_hr']:
                 estimated_segment_time_minutes = (distance_segment_km / adjusted_speed) * 60
                 time_in_zone3_minutes += estimated_segment_time_minutes
             
             # Calculate respiratory impact
             respiratory_multiplier, is_incident = self.calculate_respiratory_impact(
-                distance_km=segment['distance_km'],
-                gradient_pct=segment['gradient_pct'],
+                distance_km=distance_km,
+                gradient_pct=gradient_pct,
                 hr_estimated=hr_estimate,
                 temperature=current_temp,
                 time_in_zone3_minutes=time_in_zone3_minutes,
-                fitness_level=fitness
+                fitness_level=fitness,
+                incident_draw=None if draws is None else draws.incident_uniform[0, i - 1]
             )
             
             # Track incidents
             if is_incident:
                 respiratory_incidents.append({
-                    'distance_km': segment['distance_km'],
+                    'distance_km': distance_km,
                     'impact': respiratory_multiplier,
                     'hr_estimate': hr_estimate,
                     'temperature': current_temp,
-                    'gradient': segment['gradient_pct']
+                    'gradient': gradient_pct
                 })
             
             # Apply respiratory impact
@@ -395,54 +738,605 @@ class DigitalTwinV32:
             
             # Hiking determination
             is_hiking = final_speed < 4.5
+            if is_hiking:
+                hiking_time += segment_time_hours
             
-            results.append({
-                'distance_km': segment['distance_km'],
-                'elevation_m': segment['elevation_m'],
-                'gradient_pct': segment['gradient_pct'],
-                'temperature_c': current_temp,
-                'base_speed_kmh': base_speed,
-                'adjusted_speed_kmh': adjusted_speed,
-                'respiratory_multiplier': respiratory_multiplier,
-                'final_speed_kmh': final_speed,
-                'hr_estimate': hr_estimate,
-                'segment_time_hours': segment_time_hours,
-                'cumulative_time_hours': cumulative_time_hours,
-                'is_hiking': is_hiking,
-                'phase': phase
-            })
-        
-        # Add aid station time (6-10 stops, median 120s)
-        num_aid_stations = random.randint(6, 10)
-        avg_stop_seconds = random.gauss(120, 30)  # Mean 120s, std 30s
-        aid_station_time_hours = (num_aid_stations * avg_stop_seconds) / 3600
+            if keep_segments:
+                rows.append((
+                    distance_km, elevation_m, gradient_pct, current_temp, base_speed,
+                    adjusted_speed, respiratory_multiplier, final_speed, hr_estimate,
+                    segment_time_hours, cumulative_time_hours, is_hiking, phase
+                ))
+            
+            # Elapsed time at checkpoints and key segment boundaries
+            elapsed_hours = cumulative_time_hours + aid_total_hours * (distance_km / total_distance)
+            if i - 1 in timing_slot:
+                timing_hours[timing_slot[i - 1]] = elapsed_hours
+            
+            # Cutoffs and time cap
+            if stop_rules:
+                while next_checkpoint < plan.n_checkpoints and plan.checkpoint_segment[next_checkpoint] == i - 1:
+                    if elapsed_hours > stop_limit[next_checkpoint]:
+                        dnf_checkpoint = next_checkpoint
+                        break
+                    next_checkpoint += 1
+                if dnf_checkpoint is None and elapsed_hours > time_cap:
+                    dnf_checkpoint = min(next_checkpoint, plan.n_checkpoints - 1)
+                if dnf_checkpoint is not None:
+                    break
+        
+        # Add aid station time
+        if dnf_checkpoint is None:
+            aid_station_time_hours = aid_total_hours
+        else:
+            aid_station_time_hours = aid_total_hours * (distance_km / total_distance)
         
         # Calculate summary
+        distance_covered = total_distance if dnf_checkpoint is None else distance_km
         total_time_hours = cumulative_time_hours + aid_station_time_hours
-        avg_speed = total_distance / total_time_hours
-        hiking_time = sum(r['segment_time_hours'] for r in results if r['is_hiking'])
+        avg_speed = distance_covered / total_time_hours
         
-        return {
-            'segments': results,
+        summary = {
+            'total_distance_km': distance_covered,
+            'total_time_hours': total_time_hours,
+            'moving_time_hours': cumulative_time_hours,
+            'aid_station_time_hours': aid_station_time_hours,
+            'total_time_formatted': self.format_time(total_time_hours),
+            'average_speed_kmh': avg_speed,
+            'hiking_percentage': (hiking_time / cumulative_time_hours) * 100,
+            'respiratory_incidents': len(respiratory_incidents),
+            'worst_respiratory_impact': min([r['impact'] for r in respiratory_incidents]) if respiratory_incidents else 1.0,
+            'pacing_strategy': pacing_strategy,
+            'fitness_level': fitness,
+            'technical_multiplier': tech_multiplier
+        }
+        summary.update({name: values.tolist() for name, values in self._timing_summary(plan, timing_hours).items()})
+        if stop_rules:
+            summary['finished'] = dnf_checkpoint is None
+            summary['dnf_checkpoint'] = None if dnf_checkpoint is None else plan.checkpoint_names[dnf_checkpoint]
+            summary['dnf_distance_km'] = None if dnf_checkpoint is None else distance_km
+        if detail == 'summary':
+            return {'summary': summary}
+        
+        if detail == 'columnar':
+            columns = {name: np.array(values) for name, values in zip(SEGMENT_COLUMNS, zip(*rows))}
+            segments = SegmentView(columns)
+        else:
+            segments = [dict(zip(SEGMENT_COLUMNS, row)) for row in rows]
+        
+        result = {
+            'segments': segments,
+            'summary': summary,
+            'respiratory_incidents': respiratory_incidents,
+            'conditions': scenario
+        }
+        if detail == 'columnar':
+            result['columns'] = columns
+        return result
+    
+    def simulate_batch(
+        self,
+        elevation_profile: List[Dict],
+        scenarios: Union[List[Dict], ScenarioBatch],
+        pacing: Union[str, Sequence[str], np.ndarray] = 'even',
+        start_time_hour: Union[int, Sequence[int]] = 6,
+        draws: Optional[RaceDraws] = None,
+        rng: Optional[np.random.Generator] = None,
+        plan: Optional[CoursePlan] = None,
+        detail: str = 'summary',
+        cutoffs: bool = False,
+        time_cap_hours: Optional[float] = None,
+        course_parameters: Optional[Dict[str, Union[float, Sequence[float]]]] = None,
+        elasticities: bool = False,
+        factor_scales: Optional[Dict[str, float]] = None,
+        athletes: Optional[AthleteParameters] = None
+    ) -> Dict:
+        """
+        Simulate many scenarios in one vectorized pass over the course.
+        
+        Applies exactly the same factors as simulate_race, but loops over
+        segments once and carries NumPy arrays across the scenario axis.
+        
+        Args:
+            elevation_profile: Course elevation data
+            scenarios: ScenarioBatch, or scenario dicts in the simulate_race format
+            pacing: One pacing strategy for all scenarios, one per scenario,
+                or a float array of effort multipliers per segment, shape
+                (n_segments,) or (n_scenarios, n_segments), used in place of
+                the strategy tables ('custom' in the summary)
+            start_time_hour: Race start hour, for all scenarios or one per scenario
+            draws: Random draws to use (sampled from rng when omitted)
+            rng: NumPy generator used when draws is omitted
+            plan: Precompiled CoursePlan for elevation_profile
+            detail: 'summary', or 'columnar' to also return per-segment
+                arrays of shape (n_scenarios, n_segments) under 'columns'
+                and the respiratory incident mask under 'incidents'
+            cutoffs: Stop runs at the first checkpoint reached after its cutoff
+            time_cap_hours: Stop runs once elapsed time passes this cap
+            course_parameters: Overrides of COURSE_PARAMETERS (fatigue model,
+                field effects and technicality multipliers), for all
+                scenarios or one value per scenario
+            elasticities: Also return per-segment d(finish time)/d(log factor)
+                of every SPEED_FACTORS factor under 'elasticities', and the
+                log factor values under 'log_factors', both of shape
+                (n_scenarios, len(SPEED_FACTORS), n_segments). These are the
+                direct effects only: a factor scales speed on one segment,
+                so its elasticity there is minus the segment time (zero for
+                nutrition in the first 2 hours, where it does not apply).
+            factor_scales: Multiply SPEED_FACTORS factors by these values on
+                every segment (the finite-difference fallback for effects
+                through heart rate, zone 3 time and respiratory thresholds)
+            athletes: Athlete inputs per scenario, used instead of this
+                simulator's athlete profile (the course still comes from
+                this simulator); see FieldSimulator
+            
+        Returns:
+            Dictionary with a 'summary' of per-scenario arrays using the
+            simulate_race summary keys (without the formatted time string).
+            Stopped runs leave the arrays being simulated, so the remaining
+            segments are only computed for runs still going; their columnar
+            values after the stop are NaN (0/False for integer and boolean
+            columns).
+        """
+        if detail not in ('summary', 'columnar'):
+            raise ValueError(f"Unknown detail level for batch simulation: {detail}")
+        if plan is None:
+            plan = self.compile_plan(elevation_profile)
+        n = len(scenarios)
+        if draws is None:
+            rng = rng if rng is not None else np.random.default_rng()
+            draws = RaceDraws.sample(rng, n, plan.n_segments)
+        
+        # Scenario arrays
+        if not isinstance(scenarios, ScenarioBatch):
+            scenarios = ScenarioBatch.from_scenarios(scenarios)
+        if athletes is not None and len(athletes) != n:
+            raise ValueError(f"Need athlete parameters for {n} scenarios, got {len(athletes)}")
+        athlete = athletes if athletes is not None else self.athlete_parameters(plan)
+        fitness = scenarios.fitness_level.astype(float)
+        start_hour = np.broadcast_to(np.asarray(start_time_hour, dtype=float), (n,))
+        base_temperature = scenarios.temperature_c.astype(float)
+        calories = scenarios.calories_per_hour.astype(float)
+        tech_multiplier = self._technical_impact_batch(scenarios.precipitation)
+        field_loss, fatigue_factor = plan.field_loss, plan.fatigue
+        if course_parameters:
+            tech_multiplier, field_loss, fatigue_factor = self._course_parameters_batch(
+                plan, scenarios.precipitation, course_parameters
+            )
+        altitude_multiplier = self._altitude_impact_batch(scenarios.altitude_m.astype(float))
+        
+        # Pacing multipliers per scenario, by phase (column plan.phase_index)
+        # or, for custom pacing, by segment
+        if isinstance(pacing, np.ndarray) and pacing.dtype.kind == 'f':
+            strategies = np.full(n, 'custom', dtype=object)
+            pacing_multipliers = np.broadcast_to(pacing, (n, plan.n_segments))
+            pacing_column = np.arange(plan.n_segments)
+        else:
+            strategies = np.full(n, pacing, dtype=object) if isinstance(pacing, str) else np.array(pacing, dtype=object)
+            pacing_tables = [self.PACING_MULTIPLIERS.get(p, self.PACING_MULTIPLIERS['even']) for p in strategies]
+            pacing_multipliers = np.array([[table[phase] for phase in PHASES] for table in pacing_tables]).reshape(n, 3)
+            pacing_column = plan.phase_index
+        
+        # Nutrition ratio is independent of elapsed time once past 2 hours
+        nutrition_multiplier = 0.85 + (0.15 * np.minimum(1.0, calories / 250))
+        
+        # Finite-difference perturbations: factors applied before the heart
+        # rate estimate scale the adjusted speed, the others their own terms
+        speed_scale = nutrition_scale = respiratory_scale = 1.0
+        if factor_scales:
+            unknown = sorted(set(factor_scales) - set(self.SPEED_FACTORS))
+            if unknown:
+                raise ValueError(f"Unknown speed factors: {', '.join(unknown)}")
+            speed_scale = float(np.prod([
+                scale for name, scale in factor_scales.items() if name not in ('nutrition', 'respiratory')
+            ]))
+            nutrition_scale = factor_scales.get('nutrition', 1.0)
+            respiratory_scale = factor_scales.get('respiratory', 1.0)
+        
+        # Initialize tracking
+        cumulative_time_hours = np.zeros(n)
+        time_in_zone3_minutes = np.zeros(n)
+        hiking_time = np.zeros(n)
+        incident_count = np.zeros(n, dtype=int)
+        worst_respiratory = np.ones(n)
+        total_distance = plan.total_distance_km
+        aid_total_hours = plan.aid_station_hours(draws.aid_count_uniform, draws.aid_stop_uniform)
+        timing_slot = {int(k): j for j, k in enumerate(plan.timing_segments)}
+        timing_hours = np.full((n, len(timing_slot)), np.nan)
+        
+        if detail == 'columnar':
+            shape = (n, plan.n_segments)
+            incidents = np.zeros(shape, dtype=bool)
+            columns = {
+                'distance_km': np.broadcast_to(plan.distance_km, shape),
+                'elevation_m': np.broadcast_to(plan.elevation_m, shape),
+                'gradient_pct': np.broadcast_to(plan.gradient_pct, shape),
+                'temperature_c': np.full(shape, np.nan),
+                'base_speed_kmh': np.full(shape, np.nan),
+                'adjusted_speed_kmh': np.full(shape, np.nan),
+                'respiratory_multiplier': np.full(shape, np.nan),
+                'final_speed_kmh': np.full(shape, np.nan),
+                'hr_estimate': np.zeros(shape, dtype=int),
+                'segment_time_hours': np.full(shape, np.nan),
+                'cumulative_time_hours': np.full(shape, np.nan),
+                'is_hiking': np.zeros(shape, dtype=bool),
+                'phase': np.broadcast_to(np.array(plan.phase), shape)
+            }
+        if elasticities:
+            factor_shape = (n, len(self.SPEED_FACTORS), plan.n_segments)
+            elasticity = np.full(factor_shape, np.nan)
+            log_factors = np.full(factor_shape, np.nan)
+        
+        # Stop rules: per-run results are written out as runs stop, and the
+        # arrays below only hold the runs still going (original rows in 'rows')
+        stop_rules = cutoffs or time_cap_hours is not None
+        summary_fitness, summary_tech = fitness, tech_multiplier
+        incident_uniform = draws.incident_uniform
+        rows = np.arange(n)
+        active = slice(None)
+        if stop_rules:
+            stop_limit, next_checkpoint = self._stop_limits(plan, cutoffs, time_cap_hours)
+            time_cap = np.inf if time_cap_hours is None else time_cap_hours
+            moving_time = np.empty(n)
+            hiking_total = np.empty(n)
+            incidents_total = np.empty(n, dtype=int)
+            worst_total = np.empty(n)
+            distance_covered = np.full(n, total_distance)
+            dnf_checkpoint = np.full(n, -1)
+            
+            def retire(mask, checkpoint, distance):
+                out = rows[mask]
+                moving_time[out] = cumulative_time_hours[mask]
+                hiking_total[out] = hiking_time[mask]
+                incidents_total[out] = incident_count[mask]
+                worst_total[out] = worst_respiratory[mask]
+                dnf_checkpoint[out] = checkpoint
+                distance_covered[out] = distance
+        
+        # Simulate segment-by-segment, all scenarios at once
+        for i in range(1, plan.n_segments + 1):
+            k = i - 1
+            distance_km = plan.distance_km[k]
+            distance_segment_km = plan.segment_km[k]
+            gradient = plan.gradient_pct[k]
+            
+            # Time-based temperature
+            current_hour = start_hour + np.floor(cumulative_time_hours)
+            temp_adjustment = np.select(
+                [current_hour < 9, current_hour < 12, current_hour < 15], [-4, -1, 0], default=-2
+            )
+            current_temp = base_temperature + temp_adjustment
+            
+            # Base speed with pacing, then the same multiplier chain as simulate_race
+            pacing_multiplier = pacing_multipliers[:, pacing_column[k]]
+            base_speed = athlete.base_speed_kmh[..., k] * pacing_multiplier
+            adjusted_speed = base_speed * fitness
+            adjusted_speed *= tech_multiplier
+            adjusted_speed *= field_loss[..., k]
+            temperature_multiplier = self._temperature_impact_batch(current_temp)
+            adjusted_speed *= temperature_multiplier
+            adjusted_speed *= altitude_multiplier
+            fatigue = fatigue_factor[..., k]
+            adjusted_speed *= fatigue
+            nutrition_applies = cumulative_time_hours >= 2
+            nutrition = np.where(nutrition_applies, nutrition_multiplier * nutrition_scale, 1.0)
+            adjusted_speed *= nutrition
+            if speed_scale != 1.0:
+                adjusted_speed *= speed_scale
+            
+            # Estimate heart rate
+            hr_estimate = self._heart_rate_batch(
+                plan.hr_gradient_addition[k], adjusted_speed, 1 - fatigue, fitness, athlete
+            )
+            
+            # Track Zone 3+ time
+            zone3 = hr_estimate > athlete.threshold_hr
+            time_in_zone3_minutes += np.where(zone3, (distance_segment_km / adjusted_speed) * 60, 0.0)
+            
+            # Respiratory impact
+            respiratory_multiplier, is_incident = self._respiratory_impact_batch(
+                distance_km=distance_km,
+                gradient_pct=gradient,
+                hr_estimated=hr_estimate,
+                temperature=current_temp,
+                time_in_zone3_minutes=time_in_zone3_minutes,
+                fitness_level=fitness,
+                incident_draw=incident_uniform[:, i - 1],
+                athlete=athlete
+            )
+            incident_count += is_incident
+            worst_respiratory = np.where(
+                is_incident, np.minimum(worst_respiratory, respiratory_multiplier), worst_respiratory
+            )
+            
+            # Calculate time
+            if respiratory_scale != 1.0:
+                respiratory_multiplier = respiratory_multiplier * respiratory_scale
+            final_speed = adjusted_speed * respiratory_multiplier
+            segment_time_hours = distance_segment_km / final_speed
+            cumulative_time_hours += segment_time_hours
+            is_hiking = final_speed < 4.5
+            hiking_time += np.where(is_hiking, segment_time_hours, 0.0)
+            
+            if detail == 'columnar':
+                columns['temperature_c'][active, k] = current_temp
+                columns['base_speed_kmh'][active, k] = base_speed
+                columns['adjusted_speed_kmh'][active, k] = adjusted_speed
+                columns['respiratory_multiplier'][active, k] = respiratory_multiplier
+                columns['final_speed_kmh'][active, k] = final_speed
+                columns['hr_estimate'][active, k] = hr_estimate
+                columns['segment_time_hours'][active, k] = segment_time_hours
+                columns['cumulative_time_hours'][active, k] = cumulative_time_hours
+                columns['is_hiking'][active, k] = is_hiking
+                incidents[active, k] = is_incident
+            if elasticities:
+                factors = (
+                    pacing_multiplier, fitness, tech_multiplier, field_loss[..., k],
+                    temperature_multiplier, altitude_multiplier, fatigue, nutrition, respiratory_multiplier
+                )
+                log_factors[active, :, k] = np.log(np.column_stack(np.broadcast_arrays(*factors)))
+                elasticity[active, :, k] = -segment_time_hours[:, None]
+                elasticity[active, self.SPEED_FACTORS.index('nutrition'), k] *= nutrition_applies
+            
+            # Elapsed time at checkpoints and key segment boundaries
+            elapsed_hours = cumulative_time_hours + aid_total_hours * (distance_km / total_distance)
+            if k in timing_slot:
+                timing_hours[active, timing_slot[k]] = elapsed_hours
+            
+            # Cutoffs and time cap (the earliest checkpoint missed on this segment wins)
+            if stop_rules:
+                stop = np.full(len(rows), -1)
+                for j in np.flatnonzero(plan.checkpoint_segment == k)[::-1]:
+                    stop = np.where(elapsed_hours > stop_limit[j], j, stop)
+                stop = np.where((stop < 0) & (elapsed_hours > time_cap), next_checkpoint[k], stop)
+                stopped = stop >= 0
+                if stopped.any():
+                    retire(stopped, stop[stopped], distance_km)
+                    keep = ~stopped
+                    rows = rows[keep]
+                    active = rows
+                    fitness = fitness[keep]
+                    start_hour = start_hour[keep]
+                    base_temperature = base_temperature[keep]
+                    tech_multiplier = tech_multiplier[keep]
+                    if field_loss.ndim > 1:
+                        field_loss, fatigue_factor = field_loss[keep], fatigue_factor[keep]
+                    altitude_multiplier = altitude_multiplier[keep]
+                    if athletes is not None:
+                        athlete = athlete[keep]
+                    pacing_multipliers = pacing_multipliers[keep]
+                    nutrition_multiplier = nutrition_multiplier[keep]
+                    cumulative_time_hours = cumulative_time_hours[keep]
+                    time_in_zone3_minutes = time_in_zone3_minutes[keep]
+                    hiking_time = hiking_time[keep]
+                    incident_count = incident_count[keep]
+                    worst_respiratory = worst_respiratory[keep]
+                    incident_uniform = incident_uniform[keep]
+                    aid_total_hours = aid_total_hours[keep]
+                    if not len(rows):
+                        break
+        
+        if stop_rules:
+            retire(np.ones(len(rows), dtype=bool), -1, total_distance)
+            aid_total_hours = plan.aid_station_hours(draws.aid_count_uniform, draws.aid_stop_uniform)
+            finished = dnf_checkpoint < 0
+            aid_station_time_hours = np.where(
+                finished, aid_total_hours, aid_total_hours * (distance_covered / total_distance)
+            )
+            cumulative_time_hours, hiking_time = moving_time, hiking_total
+            incident_count, worst_respiratory = incidents_total, worst_total
+        else:
+            aid_station_time_hours = aid_total_hours
+            distance_covered = np.full(n, total_distance)
+        total_time_hours = cumulative_time_hours + aid_station_time_hours
+        
+        result = {
             'summary': {
-                'total_distance_km': total_distance,
+                'total_distance_km': distance_covered,
                 'total_time_hours': total_time_hours,
                 'moving_time_hours': cumulative_time_hours,
                 'aid_station_time_hours': aid_station_time_hours,
-                'total_time_formatted': self._format_time(total_time_hours),
-                'average_speed_kmh': avg_speed,
+                'average_speed_kmh': distance_covered / total_time_hours,
                 'hiking_percentage': (hiking_time / cumulative_time_hours) * 100,
-                'respiratory_incidents': len(respiratory_incidents),
-                'worst_respiratory_impact': min([r['impact'] for r in respiratory_incidents]) if respiratory_incidents else 1.0,
-                'pacing_strategy': pacing_strategy,
-                'fitness_level': fitness,
-                'technical_multiplier': tech_multiplier
-            },
-            'respiratory_incidents': respiratory_incidents,
-            'conditions': scenario
+                'respiratory_incidents': incident_count,
+                'worst_respiratory_impact': worst_respiratory,
+                'pacing_strategy': strategies,
+                'fitness_level': summary_fitness,
+                'technical_multiplier': summary_tech,
+                **self._timing_summary(plan, timing_hours)
+            }
         }
+        if stop_rules:
+            names = np.array(plan.checkpoint_names + [None], dtype=object)
+            result['summary']['finished'] = finished
+            result['summary']['dnf_checkpoint'] = names[dnf_checkpoint]
+            result['summary']['dnf_distance_km'] = np.where(finished, np.nan, distance_covered)
+        if detail == 'columnar':
+            result['columns'] = columns
+            result['incidents'] = incidents
+        if elasticities:
+            result['elasticities'] = elasticity
+            result['log_factors'] = log_factors
+        return result
+    
+    def _aid_station_hours(self, plan: CoursePlan, draws: Optional[RaceDraws]) -> float:
+        """Total aid station time of one run from the course's aid station model"""
+        if draws is None:
+            count_uniform, stop_uniform = random.random(), random.random()
+        else:
+            count_uniform, stop_uniform = draws.aid_count_uniform[0], draws.aid_stop_uniform[0]
+        return float(plan.aid_station_hours(count_uniform, stop_uniform))
     
-    def _format_time(self, hours: float) -> str:
+    def _timing_summary(self, plan: CoursePlan, timing_hours: np.ndarray) -> Dict:
+        """
+        Checkpoint arrival and key segment split times from the elapsed
+        times at plan.timing_segments (last axis; NaN where not reached)
+        """
+        end = timing_hours[..., plan.key_segment_end_slot]
+        start = np.where(plan.key_segment_start < 0, 0.0, timing_hours[..., plan.key_segment_start_slot])
+        return {'checkpoint_hours': timing_hours[..., plan.checkpoint_slot], 'key_segment_hours': end - start}
+    
+    def _stop_limits(
+        self,
+        plan: CoursePlan,
+        cutoffs: bool,
+        time_cap_hours: Optional[float]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Elapsed-time limit per checkpoint, and per segment the first
+        checkpoint at or after it (where a run over the time cap is stopped)
+        """
+        limit = plan.checkpoint_cutoff_hours if cutoffs else np.full(plan.n_checkpoints, np.inf)
+        if time_cap_hours is not None:
+            limit = np.minimum(limit, time_cap_hours)
+        next_checkpoint = np.searchsorted(plan.checkpoint_segment, np.arange(plan.n_segments), side='left')
+        return limit, np.minimum(next_checkpoint, plan.n_checkpoints - 1)
+    
+    def _technical_impact_batch(self, precipitation: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_technical_impact"""
+        conditions, inverse = np.unique(precipitation, return_inverse=True)
+        multipliers = np.array([self.calculate_technical_impact(str(c)) for c in conditions])
+        return multipliers[inverse.reshape(-1)]
+    
+    def _course_parameters_batch(
+        self,
+        plan: CoursePlan,
+        precipitation: np.ndarray,
+        course_parameters: Dict
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Technicality multiplier per scenario, and field loss and fatigue per
+        scenario and segment, with COURSE_PARAMETERS overridden
+        """
+        unknown = sorted(set(course_parameters) - set(self.COURSE_PARAMETERS))
+        if unknown:
+            raise ValueError(f"Unknown course parameters: {', '.join(unknown)}")
+        n = len(precipitation)
+        values = {
+            'field_loss_multiplier_runnable_trail': 1.0,
+            'field_loss_multiplier_short_climbs': 1.0,
+            **self.course_parameter_values()
+        }
+        values.update(course_parameters)
+        missing = sorted(set(self.COURSE_PARAMETERS) - set(values))
+        if missing:
+            raise ValueError(f"Course profile does not define: {', '.join(missing)}")
+        values = {name: np.broadcast_to(np.asarray(v, dtype=float), (n,)) for name, v in values.items()}
+        
+        tech_multiplier = np.select(
+            [precipitation == 'dry', precipitation == 'light_rain'],
+            [values['dry_multiplier'], values['light_rain_multiplier']],
+            default=values['wet_multiplier']
+        )
+        
+        # calculate_field_loss
+        gradient = plan.gradient_pct
+        field_loss = (
+            np.where(np.abs(gradient) < 10, values['field_loss_multiplier_runnable_trail'][:, None], 1.0)
+            * np.where((6 <= gradient) & (gradient <= 16), values['field_loss_multiplier_short_climbs'][:, None], 1.0)
+        )
+        
+        # calculate_fatigue_impact at segment start
+        distance = plan.prev_distance_km
+        inflection = values['fatigue_inflection_km'][:, None]
+        base_rate = values['fatigue_per_km_base'][:, None]
+        slope_mult = values['fatigue_slope_multiplier'][:, None]
+        fatigue = np.where(
+            distance < inflection,
+            base_rate ** distance,
+            base_rate ** inflection * (base_rate * slope_mult) ** (distance - inflection)
+        )
+        return tech_multiplier, field_loss, np.maximum(0.7, fatigue)
+    
+    def _altitude_impact_batch(self, altitude_m: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_altitude_impact"""
+        if not self.altitude_penalty['apply']:
+            return np.ones(len(altitude_m))
+        excess_altitude = altitude_m - self.altitude_penalty['starts_m']
+        multiplier = self.altitude_penalty['multiplier_per_1000m']
+        return np.where(excess_altitude < 0, 1.0, multiplier ** (excess_altitude / 1000))
+    
+    def _temperature_impact_batch(self, temperature: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_temperature_impact"""
+        return np.where(
+            temperature > 15,
+            0.98 ** (temperature - 15),
+            np.where(temperature < 10, 0.99 ** (10 - temperature), 1.0)
+        )
+    
+    def _heart_rate_batch(
+        self,
+        hr_addition: float,
+        speed_kmh: np.ndarray,
+        fatigue: float,
+        fitness_level: np.ndarray,
+        athlete: AthleteParameters
+    ) -> np.ndarray:
+        """Vectorized estimate_heart_rate (gradient term taken from the CoursePlan)"""
+        base_hr = athlete.average_ultra_hr - (fitness_level - 1.0) * 8
+        
+        speed_factor = (speed_kmh / 5.32) * 10
+        fatigue_hr = fatigue * 10
+        
+        estimated_hr = np.trunc(base_hr + hr_addition + speed_factor + fatigue_hr)
+        return np.clip(estimated_hr, 85, athlete.max_hr).astype(int)
+    
+    def _respiratory_impact_batch(
+        self,
+        distance_km: float,
+        gradient_pct: float,
+        hr_estimated: np.ndarray,
+        temperature: np.ndarray,
+        time_in_zone3_minutes: np.ndarray,
+        fitness_level: np.ndarray,
+        incident_draw: np.ndarray,
+        athlete: AthleteParameters
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized calculate_respiratory_impact"""
+        impact = athlete.baseline_impact + np.minimum(0.05, (fitness_level - 1.0) * 0.05)
+        is_incident = np.zeros(len(impact), dtype=bool)
+        high_fitness = fitness_level >= 1.15
+        
+        # Early race vulnerability
+        vulnerable = (athlete.vulnerable_start_km <= distance_km) & (distance_km <= athlete.vulnerable_end_km)
+        impact = np.where(vulnerable, impact * np.where(high_fitness, 0.97, 0.94), impact)
+        if distance_km >= 10:
+            is_incident = vulnerable & ~high_fitness & (temperature < 10)
+        
+        # High HR penalty
+        threshold_hr = athlete.threshold_hr
+        impact = np.where(
+            hr_estimated > threshold_hr,
+            impact * np.maximum(0.88, 1 - ((hr_estimated - threshold_hr) * 0.0008)),
+            impact
+        )
+        
+        # Temperature impact
+        extreme = temperature <= athlete.extreme_danger_c
+        high_risk = ~extreme & (temperature <= athlete.high_risk_c)
+        moderate_risk = ~extreme & ~high_risk & (temperature <= athlete.moderate_risk_c)
+        
+        impact = np.where(extreme, impact * 0.85, impact)
+        if 5 <= distance_km <= 25:
+            is_incident = is_incident | extreme
+        impact = np.where(high_risk, impact * 0.98 ** (8 - temperature), impact)
+        if 10 <= distance_km <= 25:
+            incident_prob = np.where(high_fitness, 0.3, 0.7)
+            is_incident = np.where(high_risk, incident_draw < incident_prob, is_incident)
+        impact = np.where(moderate_risk, impact * 0.98 ** (10 - temperature), impact)
+        
+        # Sustained hard effort
+        effort_minutes = time_in_zone3_minutes - 45
+        sustained_penalty = np.where(fitness_level >= 1.2, 0.998 ** effort_minutes, 0.995 ** effort_minutes)
+        impact = np.where(time_in_zone3_minutes > 45, impact * np.maximum(0.88, sustained_penalty), impact)
+        
+        # Recovery on descents
+        if gradient_pct < -5:
+            impact = np.where(hr_estimated < 130, np.minimum(1.0, impact + 0.05), impact)
+        
+        return np.clip(impact, 0.85, 1.0), is_incident
+    
+    def format_time(self, hours: float) -> str:
         """Format hours as HH:MM:SS"""
         total_seconds = int(hours * 3600)
         hours_int = total_seconds // 3600
@@ -456,77 +1350,31 @@ def run_monte_carlo_v32(
     athlete_profile_path: str,
     course_profile_path: str,
     weather_scenarios: List[Dict],
-    num_simulations: int = 200
+    num_simulations: int = 200,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Run Monte Carlo simulations with v3.2 enhancements
-    """
-    simulator = DigitalTwinV32(athlete_profile_path, course_profile_path)
     
-    results = []
+    Thin wrapper around monte_carlo_runner.run_monte_carlo_simulations with
+    the v3.2 fitness range (0.95-1.15); altitude is drawn from the course
+    profile's altitude band.
+    """
+    from .monte_carlo_runner import run_monte_carlo_simulations
     
     print(f"Running {num_simulations} simulations with Digital Twin v3.2...")
-    print("="*80)
-    
-    # Pacing strategies
-    pacing_strategies = [
-        'conservative', 'moderate', 'aggressive', 'even', 'negative_split', 'race_mode'
-    ]
-    
-    for sim in range(num_simulations):
-        # Select scenario
-        weather_scenario = random.choice(weather_scenarios)
-        
-        # Randomize parameters
-        scenario = {
-            'environment': EnvironmentalConditions(
-                temperature_celsius=weather_scenario['temp_c'],
-                altitude_m=random.uniform(150, 700),  # Chianti range from course profile
-                humidity_pct=random.uniform(50, 80),
-                wind_speed_kmh=random.uniform(0, 20),
-                precipitation=weather_scenario.get('precipitation', 'dry')
-            ),
-            'nutrition': NutritionStrategy(
-                calories_per_hour=random.uniform(250, 290),
-                fluid_ml_per_hour=random.uniform(500, 650),
-                electrolytes_mg_per_hour=random.uniform(450, 600)
-            ),
-            'fitness_level': random.uniform(0.95, 1.15),  # Realistic range
-            'pollen_level': random.choice(['low', 'low', 'low', 'medium'])
-        }
-        
-        pacing = random.choice(pacing_strategies)
-        
-        # Run simulation
-        result = simulator.simulate_race(elevation_profile, scenario, pacing)
-        
-        time_hours = result['summary']['total_time_hours']
-        
-        results.append({
-            'Simulation': sim + 1,
-            'Pacing Strategy': pacing,
-            'Finish Time': result['summary']['total_time_formatted'],
-            'Time (hours)': time_hours,
-            'Moving Time (hours)': result['summary']['moving_time_hours'],
-            'Aid Station Time (min)': result['summary']['aid_station_time_hours'] * 60,
-            'Avg Speed (km/h)': result['summary']['average_speed_kmh'],
-            'Temperature (°C)': scenario['environment'].temperature_celsius,
-            'Precipitation': scenario['environment'].precipitation,
-            'Fitness Level': scenario['fitness_level'],
-            'Calories/hr': scenario['nutrition'].calories_per_hour,
-            'Fluids (ml/hr)': scenario['nutrition'].fluid_ml_per_hour,
-            'Pollen Level': scenario['pollen_level'],
-            'Respiratory Incidents': result['summary']['respiratory_incidents'],
-            'Worst Respiratory': result['summary']['worst_respiratory_impact'],
-            'Hiking %': result['summary']['hiking_percentage'],
-            'Technical Multiplier': result['summary']['technical_multiplier'],
-            'Weather Scenario': weather_scenario['name']
-        })
-        
-        if (sim + 1) % 50 == 0:
-            print(f"Completed {sim + 1}/{num_simulations} simulations...")
-    
-    return pd.DataFrame(results)
+    return run_monte_carlo_simulations(
+        elevation_profile=elevation_profile,
+        athlete_profile_path=athlete_profile_path,
+        course_profile_path=course_profile_path,
+        num_simulations=num_simulations,
+        fitness_range=(0.95, 1.15),
+        temperature_scenarios=weather_scenarios,
+        verbose=True,
+        n_workers=n_workers,
+        seed=seed
+    )
 
 
 if __name__ == "__main__":
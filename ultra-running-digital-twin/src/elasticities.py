@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Finish-time elasticities of the speed factors
+
+simulate_race multiplies a base speed by a chain of factors (pacing,
+fitness, technicality, field loss, temperature, altitude, fatigue,
+nutrition, respiratory), so the derivative of finish time with respect to
+the log of a factor on one segment is minus that segment's time. These
+direct elasticities come out of a single simulate_batch pass
+(elasticities=True), per factor and per segment.
+
+Heart rate, zone 3 time and the respiratory rules react to speed through
+thresholds (whole bpm, HR > 150, zone 3 > 45 min, temperature hour bands)
+that the direct terms leave out. The finite-difference fallback scales one
+factor on every segment by exp(+/-step) under the same race draws and takes
+the central difference of the finish time; its gap to the summed direct
+terms is the indirect effect. Threshold jumps make single-run differences
+noisy, so read them as Monte Carlo averages.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .course_plan import CoursePlan
+from .digital_twin_v32_simulator import DigitalTwinV32, RaceDraws, ScenarioBatch
+from .monte_carlo_runner import DEFAULT_CHUNK_SIZE, chunk_tasks, map_chunks, sample_chunk
+from .profile_registry import load_simulator
+from .scenario_sampler import ScenarioSampler
+
+# Log step of the finite-difference fallback
+DEFAULT_FD_STEP = 0.02
+
+
+class ElasticityAggregator:
+    """
+    Mergeable sums of per-run elasticities.
+
+    Feed it simulate_batch(..., elasticities=True) results with update(),
+    combine partial aggregates with merge() and read means with result().
+    """
+
+    def __init__(self, n_segments: int, factors: Sequence[str] = DigitalTwinV32.SPEED_FACTORS):
+        self.factors = tuple(factors)
+        self.count = 0
+        self.time_sum = 0.0
+        self.segment_sum = np.zeros((len(self.factors), n_segments))
+        self.segment_count = np.zeros(n_segments, dtype=np.int64)
+        self.direct_sum = np.zeros(len(self.factors))
+        self.contribution_sum = np.zeros(len(self.factors))
+        self.fd_sum = np.zeros(len(self.factors))
+        self.fd_count = 0
+
+    def update(self, batch: Dict, fd_elasticities: Optional[np.ndarray] = None):
+        """
+        Add a batch of runs.
+
+        Args:
+            batch: simulate_batch result with 'elasticities' and 'log_factors'
+            fd_elasticities: finite_difference_elasticities of the same runs
+        """
+        elasticity = batch['elasticities']
+        self.count += len(elasticity)
+        self.time_sum += float(batch['summary']['total_time_hours'].sum())
+        self.segment_sum += np.nansum(elasticity, axis=0)
+        self.segment_count += np.count_nonzero(~np.isnan(elasticity[:, 0]), axis=0)
+        self.direct_sum += np.nansum(elasticity, axis=(0, 2))
+        self.contribution_sum += np.nansum(elasticity * batch['log_factors'], axis=(0, 2))
+        if fd_elasticities is not None:
+            self.fd_sum += fd_elasticities.sum(axis=0)
+            self.fd_count += len(fd_elasticities)
+
+    def merge(self, other: 'ElasticityAggregator') -> 'ElasticityAggregator':
+        """Fold another partial aggregate into this one"""
+        if other.factors != self.factors or other.segment_sum.shape != self.segment_sum.shape:
+            raise ValueError("Cannot merge elasticities of different factors or courses")
+        self.count += other.count
+        self.time_sum += other.time_sum
+        self.segment_sum += other.segment_sum
+        self.segment_count += other.segment_count
+        self.direct_sum += other.direct_sum
+        self.contribution_sum += other.contribution_sum
+        self.fd_sum += other.fd_sum
+        self.fd_count += other.fd_count
+        return self
+
+    def result(self, distance_km: Optional[np.ndarray] = None) -> Dict:
+        """
+        Mean elasticities over every run added.
+
+        Args:
+            distance_km: Segment end distances to index the segment table by
+
+        Returns:
+            Dictionary with 'num_simulations', 'mean_time_hours', 'factors'
+            (per factor: direct_hours, the summed per-segment dT/dlog factor;
+            contribution_hours, the first-order hours the factor's departure
+            from 1 adds to the finish; with the fallback also total_hours,
+            the finite-difference dT/dlog factor, and indirect_hours) and
+            'segments' (mean direct dT/dlog factor per segment and factor)
+        """
+        if self.count == 0:
+            raise ValueError("No runs added")
+        factors = pd.DataFrame({
+            'direct_hours': self.direct_sum / self.count,
+            'contribution_hours': self.contribution_sum / self.count,
+        }, index=pd.Index(self.factors, name='Factor'))
+        if self.fd_count:
+            factors['total_hours'] = self.fd_sum / self.fd_count
+            factors['indirect_hours'] = factors['total_hours'] - factors['direct_hours']
+
+        with np.errstate(invalid='ignore'):
+            segment_mean = self.segment_sum / self.segment_count
+        index = distance_km if distance_km is not None else np.arange(segment_mean.shape[1])
+        segments = pd.DataFrame(segment_mean.T, columns=list(self.factors), index=pd.Index(index, name='Distance (km)'))
+        return {
+            'num_simulations': self.count,
+            'mean_time_hours': self.time_sum / self.count,
+            'factors': factors,
+            'segments': segments,
+        }
+
+
+def finite_difference_elasticities(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    scenarios: ScenarioBatch,
+    draws: RaceDraws,
+    step: float = DEFAULT_FD_STEP,
+    factors: Sequence[str] = DigitalTwinV32.SPEED_FACTORS,
+    plan: Optional[CoursePlan] = None,
+    start_time_hour: int = 6
+) -> np.ndarray:
+    """
+    Whole-race d(finish time)/d(log factor) by central differences.
+
+    Each factor is scaled by exp(+/-step) on every segment under the same
+    draws, so the result includes the heart rate, zone 3 and respiratory
+    threshold effects that simulate_batch's direct elasticities leave out.
+
+    Returns:
+        Array (n_scenarios, len(factors)) in hours per unit log factor
+    """
+    plan = plan if plan is not None else simulator.compile_plan(elevation_profile)
+    elasticities = np.empty((len(scenarios), len(factors)))
+    for j, factor in enumerate(factors):
+        up, down = (
+            simulator.simulate_batch(
+                elevation_profile, scenarios, scenarios.pacing_strategy, start_time_hour=start_time_hour,
+                draws=draws, plan=plan, factor_scales={factor: np.exp(sign * step)}
+            )['summary']['total_time_hours']
+            for sign in (1, -1)
+        )
+        elasticities[:, j] = (up - down) / (2 * step)
+    return elasticities
+
+
+def run_elasticity_analysis(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    num_simulations: int = 1000,
+    finite_difference: bool = True,
+    step: float = DEFAULT_FD_STEP,
+    fitness_range: tuple = (0.95, 1.15),
+    temperature_scenarios: List[Dict] = None,
+    verbose: bool = True,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sampler: Optional[ScenarioSampler] = None,
+    sampling_scheme: str = 'mc'
+) -> Dict:
+    """
+    Monte Carlo average of the finish-time elasticities.
+
+    Chunks are seeded as in run_monte_carlo_simulations, so the runs are
+    the same as a Monte Carlo job with the same seed and chunk size.
+
+    Args:
+        elevation_profile: Course elevation data
+        athlete_profile_path: Path to athlete profile JSON
+        course_profile_path: Path to course profile JSON
+        num_simulations: Number of scenarios to simulate
+        finite_difference: Also run the finite-difference fallback
+            (2 extra batch passes per factor)
+        step: Log step of the finite differences
+        fitness_range: (min, max) fitness levels to test
+        temperature_scenarios: Custom temperature scenarios (optional)
+        verbose: Print progress updates
+        n_workers: Worker processes to spread chunks over
+        seed: Seed for reproducible results
+        chunk_size: Simulations per seeded chunk
+        sampler: Custom ScenarioSampler
+        sampling_scheme: Uniform design for the default sampler
+
+    Returns:
+        ElasticityAggregator.result() over all runs
+    """
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    root_seed = np.random.SeedSequence(seed)
+    if sampler is None:
+        sampler = ScenarioSampler.for_course(
+            simulator.course_profile,
+            weather_scenarios=temperature_scenarios,
+            fitness_range=fitness_range,
+            scheme=sampling_scheme
+        )
+    if verbose:
+        print(f"Computing finish-time elasticities over {num_simulations} simulations...")
+
+    tasks = [
+        task + (finite_difference, step)
+        for task in chunk_tasks(elevation_profile, num_simulations, chunk_size, root_seed, sampler)
+    ]
+    aggregator = None
+    for partial in map_chunks(simulator, _elasticity_chunk, tasks, n_workers):
+        aggregator = partial if aggregator is None else aggregator.merge(partial)
+    return aggregator.result(simulator.compile_plan(elevation_profile).distance_km)
+
+
+def _elasticity_chunk(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    first_simulation: int,
+    num_simulations: int,
+    seed_sequence: np.random.SeedSequence,
+    sampler: ScenarioSampler,
+    finite_difference: bool,
+    step: float
+) -> ElasticityAggregator:
+    """Elasticities of one seeded chunk as a partial aggregate"""
+    plan, scenarios, draws, _ = sample_chunk(simulator, elevation_profile, num_simulations, seed_sequence, sampler)
+    batch = simulator.simulate_batch(
+        elevation_profile, scenarios, scenarios.pacing_strategy, draws=draws, plan=plan, elasticities=True
+    )
+    fd_elasticities = None
+    if finite_difference:
+        fd_elasticities = finite_difference_elasticities(
+            simulator, elevation_profile, scenarios, draws, step, plan=plan
+        )
+    aggregator = ElasticityAggregator(plan.n_segments)
+    aggregator.update(batch, fd_elasticities)
+    return aggregator
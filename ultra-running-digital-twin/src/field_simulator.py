@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Field simulation: several athletes in the same race
+
+DigitalTwinV32 is bound to one athlete profile. FieldSimulator loads a
+squad of athlete profiles for one course and stacks their gradient speeds,
+respiratory profiles and heart rate parameters (AthleteParameters) so that
+every athlete runs every scenario in a single simulate_batch pass.
+
+Race-day conditions (temperature, precipitation, altitude, humidity, wind,
+pollen) are drawn once per scenario and shared by the whole field; each
+athlete gets their own fitness, nutrition and pacing draws and their own
+race draws (respiratory incidents, aid station stops). Finishing order and
+head-to-head probabilities are read off the same scenarios, so they reflect
+the athletes' differences rather than different weather.
+"""
+
+import os
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .digital_twin_v32_simulator import AthleteParameters, ScenarioBatch
+from .profile_registry import load_simulator
+from .scenario_sampler import ScenarioSampler
+
+# ScenarioBatch fields drawn once per scenario and shared by the field
+SHARED_CONDITIONS = (
+    'temperature_c', 'altitude_m', 'humidity_pct', 'wind_speed_kmh',
+    'precipitation', 'pollen_level', 'weather_scenario'
+)
+
+
+class FieldSimulator:
+    """
+    Simulates a squad of athletes on one course under shared conditions.
+    """
+
+    def __init__(
+        self,
+        athlete_profile_paths: Sequence[str],
+        course_profile_path: str,
+        names: Optional[Sequence[str]] = None
+    ):
+        """
+        Args:
+            athlete_profile_paths: Paths to the athlete profile JSONs
+            course_profile_path: Path to the course profile JSON
+            names: Athlete labels (athlete_info.name, or the file name, by default)
+        """
+        if not athlete_profile_paths:
+            raise ValueError("Need at least one athlete profile")
+        self.simulators = [load_simulator(path, course_profile_path) for path in athlete_profile_paths]
+        if names is None:
+            names = [
+                simulator.athlete_profile.get('athlete_info', {}).get('name')
+                or os.path.splitext(os.path.basename(path))[0]
+                for simulator, path in zip(self.simulators, athlete_profile_paths)
+            ]
+        self.names = list(names)
+        if len(self.names) != len(self.simulators):
+            raise ValueError(f"Need {len(self.simulators)} athlete names, got {len(self.names)}")
+        if len(set(self.names)) != len(self.names):
+            raise ValueError(f"Athlete names must be unique, got {self.names}; pass names")
+        self.course_profile = self.simulators[0].course_profile
+
+    def __len__(self) -> int:
+        return len(self.simulators)
+
+    def athlete_parameters(self, elevation_profile: List[Dict], repeats: int = 1) -> AthleteParameters:
+        """Stacked athlete inputs, `repeats` rows per athlete (athlete-major)"""
+        return AthleteParameters.stack(
+            [simulator.athlete_parameters(simulator.compile_plan(elevation_profile)) for simulator in self.simulators],
+            repeats
+        )
+
+    def simulate(
+        self,
+        elevation_profile: List[Dict],
+        num_scenarios: int = 1000,
+        fitness_levels: Optional[Sequence[float]] = None,
+        pacing: Optional[Union[str, Sequence[str]]] = None,
+        start_time_hour: int = 6,
+        fitness_range: tuple = (0.95, 1.15),
+        temperature_scenarios: List[Dict] = None,
+        sampler: Optional[ScenarioSampler] = None,
+        cutoffs: bool = False,
+        time_cap_hours: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Race the whole field over num_scenarios shared race days.
+
+        Args:
+            elevation_profile: Course elevation data
+            num_scenarios: Race days simulated
+            fitness_levels: Fitness per athlete (drawn from fitness_range
+                per athlete and scenario when omitted)
+            pacing: Pacing strategy for everyone or one per athlete (drawn
+                per athlete and scenario when omitted)
+            start_time_hour: Race start hour
+            fitness_range: (min, max) fitness levels for the default sampler
+            temperature_scenarios: Custom temperature scenarios (optional)
+            sampler: Custom ScenarioSampler
+            cutoffs: Stop runs at the first checkpoint reached after its cutoff
+            time_cap_hours: Stop runs once elapsed time passes this cap
+            seed: Seed for reproducible results
+
+        Returns:
+            Dictionary with:
+                'athletes': athlete names
+                'finish_hours': (n_athletes, num_scenarios) finish times,
+                    inf for runs stopped by a cutoff or the time cap
+                'summary': per-athlete DataFrame of the finish time
+                    distribution, finish rate, incidents, win probability
+                    and expected position (DNFs share last place)
+                'predicted_order': names by expected finishing position
+                'positions': P(athlete finishes in each position), rows
+                    summing to the finish rate
+                'no_winner_rate': share of scenarios nobody finishes
+                'head_to_head': P(row athlete finishes ahead of column
+                    athlete), ties counted as half
+                'batch': the simulate_batch summary, rows athlete by athlete
+        """
+        n_athletes = len(self)
+        lead = self.simulators[0]
+        plan = lead.compile_plan(elevation_profile)
+        if sampler is None:
+            sampler = ScenarioSampler.for_course(
+                self.course_profile, weather_scenarios=temperature_scenarios, fitness_range=fitness_range
+            )
+        rng = np.random.default_rng(seed)
+
+        # Shared race days, personal draws per athlete and scenario
+        conditions = sampler.sample(num_scenarios, rng)
+        personal = sampler.sample(n_athletes * num_scenarios, rng)
+        day = np.tile(np.arange(num_scenarios), n_athletes)
+        batch = ScenarioBatch(**{
+            name: (values[day] if name in SHARED_CONDITIONS else getattr(personal, name))
+            for name, values in vars(conditions).items()
+        })
+        if fitness_levels is not None:
+            batch.fitness_level = np.repeat(self._per_athlete(fitness_levels, 'fitness_levels', float), num_scenarios)
+        if pacing is not None:
+            batch.pacing_strategy = np.repeat(self._per_athlete(pacing, 'pacing', object), num_scenarios)
+        draws = sampler.sample_race_draws(n_athletes * num_scenarios, plan.n_segments, rng)
+
+        result = lead.simulate_batch(
+            elevation_profile, batch, batch.pacing_strategy, start_time_hour=start_time_hour, draws=draws,
+            plan=plan, cutoffs=cutoffs, time_cap_hours=time_cap_hours,
+            athletes=self.athlete_parameters(elevation_profile, num_scenarios)
+        )
+        summary = result['summary']
+        finish_hours = summary['total_time_hours'].reshape(n_athletes, num_scenarios)
+        if 'finished' in summary:
+            finish_hours = np.where(summary['finished'].reshape(n_athletes, num_scenarios), finish_hours, np.inf)
+        return {
+            'athletes': list(self.names),
+            'finish_hours': finish_hours,
+            'batch': summary,
+            **field_standings(finish_hours, self.names, summary['respiratory_incidents'].reshape(n_athletes, -1))
+        }
+
+    def _per_athlete(self, values, name: str, dtype) -> np.ndarray:
+        """One value per athlete from a scalar or a sequence"""
+        values = np.array([values] * len(self) if np.isscalar(values) else values, dtype=dtype)
+        if len(values) != len(self):
+            raise ValueError(f"Need one {name} value per athlete ({len(self)}), got {len(values)}")
+        return values
+
+
+def field_standings(
+    finish_hours: np.ndarray,
+    names: Sequence[str],
+    incidents: Optional[np.ndarray] = None
+) -> Dict:
+    """
+    Finishing order and head-to-head probabilities from per-scenario finish times.
+
+    Args:
+        finish_hours: (n_athletes, n_scenarios) finish times (inf for DNFs)
+        names: Athlete names
+        incidents: (n_athletes, n_scenarios) respiratory incidents
+
+    Returns:
+        Dictionary with 'summary', 'predicted_order', 'positions',
+        'no_winner_rate' and 'head_to_head' (see FieldSimulator.simulate)
+    """
+    n_athletes, n_scenarios = finish_hours.shape
+    index = pd.Index(list(names), name='Athlete')
+    finished = np.isfinite(finish_hours)
+
+    # Finishing position per scenario among the finishers (ties in athlete
+    # order); DNFs share last place, so a scenario without finishers has no winner
+    order = np.argsort(finish_hours, axis=0, kind='stable')
+    position = np.empty_like(order)
+    position[order, np.arange(n_scenarios)] = np.arange(n_athletes)[:, None]
+    position[~finished] = n_athletes - 1
+    positions = pd.DataFrame(
+        np.stack([((position == k) & finished).mean(axis=1) for k in range(n_athletes)], axis=1),
+        index=index, columns=pd.RangeIndex(1, n_athletes + 1, name='Position')
+    )
+
+    ahead = finish_hours[:, None, :] < finish_hours[None, :, :]
+    tied = finish_hours[:, None, :] == finish_hours[None, :, :]
+    head_to_head = ahead.mean(axis=2) + 0.5 * tied.mean(axis=2)
+    np.fill_diagonal(head_to_head, np.nan)
+
+    # Finish-time statistics over finishers (NaN for athletes without any)
+    any_finish = finished.any(axis=1)
+    times = np.where(finished, finish_hours, np.nan)[any_finish]
+
+    def over_finishers(statistic, *args) -> np.ndarray:
+        values = np.full(n_athletes, np.nan)
+        values[any_finish] = statistic(times, *args, axis=1)
+        return values
+
+    summary = pd.DataFrame({
+        'Mean (hours)': over_finishers(np.nanmean),
+        'P10 (hours)': over_finishers(np.nanpercentile, 10),
+        'P50 (hours)': over_finishers(np.nanpercentile, 50),
+        'P90 (hours)': over_finishers(np.nanpercentile, 90),
+        'Std (hours)': over_finishers(np.nanstd),
+        'Finish Rate': finished.mean(axis=1),
+        'P(Win)': ((position == 0) & finished).mean(axis=1),
+        'Expected Position': position.mean(axis=1) + 1,
+    }, index=index)
+    if incidents is not None:
+        summary.insert(6, 'Mean Incidents', incidents.mean(axis=1))
+
+    return {
+        'summary': summary,
+        'predicted_order': summary.sort_values(['Expected Position', 'P50 (hours)']).index.tolist(),
+        'positions': positions,
+        'no_winner_rate': float(1 - finished.any(axis=0).mean()),
+        'head_to_head': pd.DataFrame(head_to_head, index=index, columns=list(names)),
+    }
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Global sensitivity analysis (Sobol indices and Morris screening)
+
+One-at-a-time tests cannot see interactions such as cold temperature and
+low fitness together driving respiratory incidents. global_sensitivity()
+varies every input at once over its range:
+
+- 'sobol': Saltelli design with first-order (S1) and total (ST) indices.
+  ST - S1 is the share of output variance an input explains only through
+  interactions. Costs N * (d + 2) simulations for d inputs.
+- 'morris': elementary effects along r random trajectories, a cheap
+  screening (r * (d + 1) simulations) ranking inputs by mu_star.
+
+Every input is mapped from [0, 1]: (low, high) ranges uniformly, value
+lists by equal slices. Evaluations built from the same base sample share
+their race draws (common random numbers), so the indices describe the
+listed inputs rather than incident and aid station noise.
+"""
+
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from .digital_twin_v32_simulator import DigitalTwinV32, RaceDraws
+from .monte_carlo_runner import map_chunks
+from .profile_registry import load_simulator
+from .sweep import DEFAULT_SWEEP_BASE, DEFAULT_SWEEP_CHUNK_SIZE, SWEEP_AXES, SWEEP_METRICS, simulate_values
+
+SENSITIVITY_METHODS = ('sobol', 'morris')
+
+# Scenario inputs varied by default; the simulation_defaults course
+# parameters are added around the course profile's own values
+DEFAULT_SENSITIVITY_INPUTS = {
+    'fitness': (0.95, 1.25),
+    'temperature': (2.0, 24.0),
+    'precipitation': ['dry', 'light_rain', 'wet'],
+    'calories': (150.0, 300.0),
+    'pacing': list(DigitalTwinV32.PACING_MULTIPLIERS),
+    'start_hour': [5, 6, 7, 8],
+}
+
+# Course parameters varied by default: the fatigue inflection by +/-20%,
+# the multipliers by +/-50% of their distance from 1
+DEFAULT_COURSE_INPUTS = (
+    'fatigue_inflection_km', 'fatigue_per_km_base', 'fatigue_slope_multiplier',
+    'field_loss_multiplier_runnable_trail', 'field_loss_multiplier_short_climbs'
+)
+
+# Grid levels of the Morris design
+MORRIS_LEVELS = 4
+
+
+def global_sensitivity(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    inputs: Optional[Dict[str, Union[tuple, list]]] = None,
+    outputs: Sequence[str] = ('total_time_hours', 'respiratory_incidents'),
+    method: str = 'sobol',
+    budget: int = 20000,
+    base: Optional[Dict] = None,
+    num_bootstrap: int = 100,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_SWEEP_CHUNK_SIZE,
+    n_workers: Optional[int] = None
+) -> Dict:
+    """
+    Sobol indices or Morris elementary effects of the simulator inputs.
+
+    Args:
+        elevation_profile: Course elevation data
+        athlete_profile_path: Path to athlete profile JSON
+        course_profile_path: Path to course profile JSON
+        inputs: Range per input, (low, high) or a list of values. Keys are
+            SWEEP_AXES names or DigitalTwinV32.COURSE_PARAMETERS. Defaults
+            to DEFAULT_SENSITIVITY_INPUTS plus DEFAULT_COURSE_INPUTS.
+        outputs: simulate_batch summary values to analyse (SWEEP_METRICS)
+        method: 'sobol' or 'morris'
+        budget: Maximum number of simulations. Sobol uses the largest
+            power-of-two base sample that fits.
+        base: Values of the scenario inputs that are not varied
+            (DEFAULT_SWEEP_BASE otherwise)
+        num_bootstrap: Bootstrap resamples for the Sobol confidence intervals
+        seed: Seed for the design and the race draws
+        chunk_size: Simulations per simulate_batch call
+        n_workers: Worker processes to spread chunks over
+
+    Returns:
+        Dictionary with 'method', 'evaluations', 'inputs' and 'indices': a
+        DataFrame per output indexed by input, with S1, S1 conf, ST and ST
+        conf (95% bootstrap half-widths) for Sobol, or mu, mu_star and sigma
+        (per full input range) for Morris
+    """
+    if method not in SENSITIVITY_METHODS:
+        raise ValueError(f"Unknown sensitivity method: {method}")
+    unknown = [name for name in outputs if name not in SWEEP_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown sensitivity outputs: {', '.join(unknown)}")
+
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    if inputs is None:
+        inputs = dict(DEFAULT_SENSITIVITY_INPUTS)
+        inputs.update(course_parameter_ranges(simulator, DEFAULT_COURSE_INPUTS))
+    _validate_inputs(inputs, simulator)
+    names = list(inputs)
+    d = len(names)
+
+    rng = np.random.default_rng(seed)
+    if method == 'sobol':
+        base_samples = 2 ** int(np.floor(np.log2(max(budget // (d + 2), 1))))
+        if base_samples < 8:
+            raise ValueError(f"A Sobol analysis of {d} inputs needs a budget of at least {8 * (d + 2)}")
+        design = qmc.Sobol(2 * d, scramble=True, seed=rng).random(base_samples)
+        a, b = design[:, :d], design[:, d:]
+        ab = np.repeat(a[None], d, axis=0)
+        ab[np.arange(d), :, np.arange(d)] = b.T
+        unit = np.concatenate([a, b, ab.reshape(-1, d)])
+        draw_index = np.tile(np.arange(base_samples), d + 2)
+    else:
+        trajectories = budget // (d + 1)
+        if trajectories < 2:
+            raise ValueError(f"A Morris screening of {d} inputs needs a budget of at least {2 * (d + 1)}")
+        unit, steps = _morris_design(trajectories, d, rng)
+        draw_index = np.repeat(np.arange(trajectories), d + 1)
+
+    plan = simulator.compile_plan(elevation_profile)
+    draws = RaceDraws.sample(rng, draw_index.max() + 1, plan.n_segments)
+    fixed = dict(DEFAULT_SWEEP_BASE)
+    fixed.update(base or {})
+    tasks = [
+        (elevation_profile, inputs, fixed, unit[first:first + chunk_size],
+         draws[draw_index[first:first + chunk_size]], list(outputs))
+        for first in range(0, len(unit), chunk_size)
+    ]
+    chunks = list(map_chunks(simulator, _sensitivity_chunk, tasks, n_workers))
+    values = {name: np.concatenate([chunk[name] for chunk in chunks]).astype(float) for name in outputs}
+
+    if method == 'sobol':
+        indices = {
+            name: _sobol_indices(values[name].reshape(d + 2, base_samples), names, num_bootstrap, rng)
+            for name in outputs
+        }
+    else:
+        indices = {name: _morris_indices(values[name], steps, names) for name in outputs}
+    return {'method': method, 'evaluations': len(unit), 'inputs': inputs, 'indices': indices}
+
+
+def course_parameter_ranges(simulator: DigitalTwinV32, names: Sequence[str]) -> Dict[str, tuple]:
+    """
+    Default ranges of course parameters around the profile values: the
+    fatigue inflection +/-20%, multipliers +/-50% of their distance from 1
+    """
+    values = simulator.course_parameter_values()
+    ranges = {}
+    for name in names:
+        if name not in values:
+            continue
+        value = values[name]
+        if name == 'fatigue_inflection_km':
+            ranges[name] = (0.8 * value, 1.2 * value)
+        else:
+            ranges[name] = tuple(sorted((1 + 0.5 * (value - 1), 1 + 1.5 * (value - 1))))
+    return ranges
+
+
+def _validate_inputs(inputs: Dict, simulator: DigitalTwinV32):
+    if not inputs:
+        raise ValueError("global_sensitivity needs at least one input")
+    for name, spec in inputs.items():
+        if name not in SWEEP_AXES and name not in simulator.COURSE_PARAMETERS:
+            raise ValueError(f"Unknown sensitivity input: {name}")
+        if isinstance(spec, tuple):
+            if len(spec) != 2 or not spec[0] < spec[1]:
+                raise ValueError(f"Range of {name} must be (low, high) with low < high, got {spec}")
+        elif not len(spec):
+            raise ValueError(f"Input {name} needs at least one value")
+    if 'pacing' in inputs and isinstance(inputs['pacing'], list):
+        unknown = sorted(set(inputs['pacing']) - set(simulator.PACING_MULTIPLIERS))
+        if unknown:
+            raise ValueError(f"Unknown pacing strategies: {', '.join(unknown)}")
+
+
+def _from_unit(spec: Union[tuple, list], u: np.ndarray) -> np.ndarray:
+    """Map [0, 1] to a (low, high) range or onto equal slices of a value list"""
+    if isinstance(spec, tuple):
+        low, high = spec
+        return low + u * (high - low)
+    values = np.asarray(spec)
+    return values[np.minimum((u * len(values)).astype(int), len(values) - 1)]
+
+
+def _sensitivity_chunk(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    inputs: Dict,
+    fixed: Dict,
+    unit: np.ndarray,
+    draws: RaceDraws,
+    outputs: List[str]
+) -> Dict[str, np.ndarray]:
+    """Simulate the design rows of one chunk"""
+    num_rows = len(unit)
+    values = {name: np.full(num_rows, fixed[name]) for name in SWEEP_AXES}
+    course_parameters = {}
+    for column, (name, spec) in enumerate(inputs.items()):
+        mapped = _from_unit(spec, unit[:, column])
+        if name in SWEEP_AXES:
+            values[name] = mapped
+        else:
+            course_parameters[name] = mapped
+    return simulate_values(simulator, elevation_profile, values, draws, outputs, course_parameters)
+
+
+def _sobol_indices(f: np.ndarray, names: List[str], num_bootstrap: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Saltelli (2010) first-order and Jansen total indices from the f(A),
+    f(B), f(AB_i) rows, with bootstrap confidence half-widths
+    """
+    def estimate(rows):
+        f_a, f_b, f_ab = f[0, rows], f[1, rows], f[2:, rows]
+        variance = np.var(np.concatenate([f_a, f_b]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            first = np.mean(f_b * (f_ab - f_a), axis=1) / variance
+            total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / variance
+        return first, total
+
+    # Centering leaves the estimators unbiased and cuts their variance
+    f = f - f[:2].mean()
+    n = f.shape[1]
+    first, total = estimate(np.arange(n))
+    resampled = [estimate(rng.integers(0, n, n)) for _ in range(num_bootstrap)]
+    first_conf = 1.96 * np.std([r[0] for r in resampled], axis=0)
+    total_conf = 1.96 * np.std([r[1] for r in resampled], axis=0)
+    return pd.DataFrame(
+        {'S1': first, 'S1 conf': first_conf, 'ST': total, 'ST conf': total_conf},
+        index=pd.Index(names, name='Input')
+    )
+
+
+def _morris_design(trajectories: int, d: int, rng: np.random.Generator) -> tuple:
+    """
+    Morris (1991) trajectories on a MORRIS_LEVELS grid.
+
+    Returns:
+        Design points (trajectories * (d + 1), d) and, per trajectory step,
+        the input moved and its signed step size (trajectories, d, 2)
+    """
+    delta = MORRIS_LEVELS / (2 * (MORRIS_LEVELS - 1))
+    lower = rng.integers(0, MORRIS_LEVELS // 2, (trajectories, d)) / (MORRIS_LEVELS - 1)
+    upward = rng.random((trajectories, d)) < 0.5
+    order = np.argsort(rng.random((trajectories, d)), axis=1)
+
+    points = np.empty((trajectories, d + 1, d))
+    points[:, 0] = np.where(upward, lower, lower + delta)
+    rows = np.arange(trajectories)
+    for step in range(d):
+        points[:, step + 1] = points[:, step]
+        moved = order[:, step]
+        points[rows, step + 1, moved] += np.where(upward[rows, moved], delta, -delta)
+    signed_step = np.where(np.take_along_axis(upward, order, axis=1), delta, -delta)
+    return points.reshape(-1, d), np.stack([order, signed_step], axis=-1)
+
+
+def _morris_indices(f: np.ndarray, steps: np.ndarray, names: List[str]) -> pd.DataFrame:
+    """mu, mu_star and sigma of the elementary effects per input"""
+    trajectories, d = steps.shape[:2]
+    f = f.reshape(trajectories, d + 1)
+    effects = np.empty((trajectories, d))
+    order = steps[..., 0].astype(int)
+    np.put_along_axis(effects, order, np.diff(f, axis=1) / steps[..., 1], axis=1)
+    return pd.DataFrame(
+        {
+            'mu': effects.mean(axis=0),
+            'mu_star': np.abs(effects).mean(axis=0),
+            'sigma': effects.std(axis=0, ddof=1),
+        },
+        index=pd.Index(names, name='Input')
+    )
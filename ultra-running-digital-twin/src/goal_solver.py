@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Goal solver: required fitness for a target time at a given confidence
+
+solve_required_fitness() answers "what fitness (and CTL) do I need for
+P(finish <= target) >= probability?". The scenario set and race draws are
+sampled once; every trial fitness runs them all in one simulate_batch call
+with the fitness replaced, so P(success | fitness) is a deterministic curve
+that rises with fitness and can be bisected. (A faster run can reach the
+respiratory danger zone in a colder hour, so the curve is monotone in
+practice rather than by construction.)
+"""
+
+import dataclasses
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .ctl_fitness_tracker import CTLFitnessTracker
+from .digital_twin_v32_simulator import DigitalTwinV32, RaceDraws, ScenarioBatch
+from .profile_registry import load_simulator
+from .scenario_sampler import ScenarioSampler
+
+
+def solve_required_fitness(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    target_hours: float,
+    probability: float = 0.8,
+    num_scenarios: int = 2000,
+    fitness_bracket: tuple = (0.9, 1.3),
+    fitness_limits: tuple = (0.5, 2.0),
+    tolerance: float = 0.001,
+    max_evaluations: int = 60,
+    temperature_scenarios: List[Dict] = None,
+    sampler: Optional[ScenarioSampler] = None,
+    cutoffs: bool = False,
+    seed: Optional[int] = 0,
+    verbose: bool = True
+) -> Dict:
+    """
+    Smallest fitness with P(finish time <= target_hours) >= probability.
+
+    Args:
+        elevation_profile: Course elevation data
+        athlete_profile_path: Path to athlete profile JSON
+        course_profile_path: Path to course profile JSON
+        target_hours: Target finish time in hours
+        probability: Required probability of finishing within the target
+        num_scenarios: Scenarios in the common evaluation set
+        fitness_bracket: Initial (low, high) fitness bracket; widened
+            towards fitness_limits until it holds the answer
+        fitness_limits: Widest fitness range searched
+        tolerance: Bracket width (fitness) at which the search stops
+        max_evaluations: Batch evaluations allowed
+        temperature_scenarios: Custom temperature scenarios (optional)
+        sampler: Custom ScenarioSampler (its fitness draw is replaced)
+        cutoffs: Count runs stopped by a checkpoint cutoff as failures
+        seed: Seed of the scenario set
+        verbose: Print progress updates
+
+    Returns:
+        Dictionary with 'fitness' (None when even fitness_limits[1] falls
+        short), 'ctl' (CTLFitnessTracker.fitness_to_ctl), 'probability'
+        achieved at that fitness, 'converged', 'limit_binding' (True when
+        even fitness_limits[0] meets the target, which is then returned)
+        and 'bracket_history' (one row per evaluation with the bracket
+        after it)
+    """
+    if not 0 < probability < 1:
+        raise ValueError(f"probability must be between 0 and 1, got {probability}")
+    low, high = fitness_bracket
+    if not fitness_limits[0] <= low < high <= fitness_limits[1]:
+        raise ValueError(f"fitness_bracket {fitness_bracket} must be increasing and within {fitness_limits}")
+
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    plan = simulator.compile_plan(elevation_profile)
+    if sampler is None:
+        sampler = ScenarioSampler.for_course(simulator.course_profile, weather_scenarios=temperature_scenarios)
+    rng = np.random.default_rng(seed)
+    scenarios = sampler.sample(num_scenarios, rng)
+    draws = sampler.sample_race_draws(num_scenarios, plan.n_segments, rng)
+
+    history = []
+
+    def success_probability(fitness: float) -> float:
+        p = _success_probability(
+            simulator, elevation_profile, scenarios, draws, fitness, target_hours, cutoffs
+        )
+        history.append({'fitness': fitness, 'probability': p})
+        return p
+
+    # Widen the bracket until P(low) < probability <= P(high)
+    p_low, p_high = success_probability(low), success_probability(high)
+    history[0].update(low=low, high=high)
+    _record_bracket(history, low, high)
+    while p_low >= probability and low > fitness_limits[0] and len(history) < max_evaluations:
+        low, high, p_high = max(fitness_limits[0], low - 2 * (high - low)), low, p_low
+        p_low = success_probability(low)
+        _record_bracket(history, low, high)
+    while p_high < probability and high < fitness_limits[1] and len(history) < max_evaluations:
+        low, high, p_low = high, min(fitness_limits[1], high + 2 * (high - low)), p_high
+        p_high = success_probability(high)
+        _record_bracket(history, low, high)
+
+    achievable = p_high >= probability or p_low >= probability
+    limit_binding = p_low >= probability and low == fitness_limits[0]
+    if p_low >= probability:
+        # Even the lowest fitness reached meets the target
+        fitness, p_fitness = low, p_low
+        converged = limit_binding
+    else:
+        if achievable:
+            while high - low > tolerance and len(history) < max_evaluations:
+                middle = (low + high) / 2
+                p_middle = success_probability(middle)
+                if p_middle >= probability:
+                    high, p_high = middle, p_middle
+                else:
+                    low, p_low = middle, p_middle
+                _record_bracket(history, low, high)
+        fitness, p_fitness = (high, p_high) if achievable else (None, None)
+        converged = achievable and high - low <= tolerance
+    result = {
+        'fitness': fitness,
+        'ctl': CTLFitnessTracker().fitness_to_ctl(fitness) if achievable else None,
+        'probability': p_fitness,
+        'converged': bool(converged),
+        'limit_binding': bool(limit_binding),
+        'target_hours': target_hours,
+        'required_probability': probability,
+        'bracket_history': pd.DataFrame(history, columns=['fitness', 'probability', 'low', 'high']),
+    }
+
+    if verbose:
+        if limit_binding:
+            print(f"✓ Even fitness {fitness:.3f} (the lower limit) gives "
+                  f"P(≤{target_hours:.2f}h) = {p_fitness:.1%}")
+        elif achievable:
+            print(f"✓ Fitness {fitness:.3f} (CTL {result['ctl']:.0f}) gives "
+                  f"P(≤{target_hours:.2f}h) = {p_fitness:.1%} after {len(history)} evaluations")
+        else:
+            print(f"✗ P(≤{target_hours:.2f}h) stays below {probability:.0%} up to fitness {high:.2f}")
+    return result
+
+
+def _success_probability(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    scenarios: ScenarioBatch,
+    draws: RaceDraws,
+    fitness: float,
+    target_hours: float,
+    cutoffs: bool
+) -> float:
+    """Share of the scenario set finishing within target_hours at one fitness"""
+    trial = dataclasses.replace(scenarios, fitness_level=np.full(len(scenarios), fitness))
+    summary = simulator.simulate_batch(
+        elevation_profile, trial, trial.pacing_strategy, draws=draws,
+        plan=simulator.compile_plan(elevation_profile), cutoffs=cutoffs
+    )['summary']
+    success = summary['total_time_hours'] <= target_hours
+    if cutoffs:
+        success &= summary['finished']
+    return float(success.mean())
+
+
+def _record_bracket(history: List[Dict], low: float, high: float):
+    history[-1]['low'] = low
+    history[-1]['high'] = high
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Importance sampling for tail risk
+
+Slow finishes and multi-incident respiratory runs come from cold, wet days
+and low fitness. A tilted ScenarioSampler draws those scenarios more often
+and gives each run a likelihood ratio weight ('IS Weight'); the weighted
+estimates below stay unbiased for the original distribution while spending
+most runs in the tails.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .monte_carlo_runner import DEFAULT_CHUNK_SIZE, run_monte_carlo_simulations
+from .profile_registry import load_simulator
+from .scenario_sampler import ScenarioSampler
+
+# Proposal favouring cold, wet days and low fitness. Beta(a < 1, 1) keeps
+# every likelihood ratio below 1 / a.
+DEFAULT_TAIL_TILT = {
+    'weather': {'Cold Day': 2.5, 'Typical March': 1.25},
+    'temperature': (0.6, 1.0),
+    'precipitation': (0.7, 1.0),
+    'fitness': (0.6, 1.0),
+}
+
+TAIL_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def weighted_quantile(values: np.ndarray, weights: np.ndarray, q: float) -> float:
+    """Quantile of the self-normalised weighted empirical distribution"""
+    order = np.argsort(values)
+    cumulative = np.cumsum(weights[order])
+    index = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+    return float(values[order][min(index, len(values) - 1)])
+
+
+def effective_sample_size(weights: np.ndarray) -> float:
+    """Kish effective sample size (sum w)^2 / sum w^2"""
+    return float(weights.sum() ** 2 / (weights ** 2).sum())
+
+
+def weighted_tail_estimates(
+    results_df: pd.DataFrame,
+    quantiles: Sequence[float] = TAIL_QUANTILES,
+    incident_threshold: int = 2,
+    slow_finish_hours: Optional[float] = None
+) -> Dict:
+    """
+    Weighted tail estimates from an importance-sampled run.
+
+    Args:
+        results_df: run_monte_carlo_simulations output (rows without an
+            'IS Weight' column count with weight 1)
+        quantiles: Finish-time quantiles to estimate
+        incident_threshold: Estimate P(respiratory incidents >= threshold)
+        slow_finish_hours: Also estimate P(finish time > slow_finish_hours)
+
+    Returns:
+        Dictionary with 'time_quantiles', 'p_incidents' (estimate and
+        standard error), optional 'p_slow_finish', 'ess' and 'ess_fraction'
+    """
+    times = results_df['Time (hours)'].to_numpy(dtype=float)
+    if 'IS Weight' in results_df:
+        weights = results_df['IS Weight'].to_numpy(dtype=float)
+    else:
+        weights = np.ones(len(times))
+    incidents = results_df['Respiratory Incidents'].to_numpy()
+
+    estimates = {
+        'total_simulations': len(times),
+        'time_quantiles': {f'p{round(q * 100):g}': weighted_quantile(times, weights, q) for q in quantiles},
+        'mean_time': float(np.average(times, weights=weights)),
+        'p_incidents': _weighted_probability(incidents >= incident_threshold, weights),
+        'incident_threshold': incident_threshold,
+        'ess': effective_sample_size(weights),
+    }
+    estimates['ess_fraction'] = estimates['ess'] / len(times)
+    if slow_finish_hours is not None:
+        estimates['p_slow_finish'] = _weighted_probability(times > slow_finish_hours, weights)
+        estimates['slow_finish_hours'] = slow_finish_hours
+    return estimates
+
+
+def run_importance_sampling(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    num_simulations: int = 2000,
+    tilt: Optional[Dict] = None,
+    quantiles: Sequence[float] = TAIL_QUANTILES,
+    incident_threshold: int = 2,
+    slow_finish_hours: Optional[float] = None,
+    fitness_range: tuple = (0.95, 1.15),
+    temperature_scenarios: List[Dict] = None,
+    verbose: bool = True,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sampling_scheme: str = 'mc'
+) -> Dict:
+    """
+    Run Monte Carlo simulations under a tail-tilted proposal.
+
+    Args:
+        elevation_profile: Course elevation data
+        athlete_profile_path: Path to athlete profile JSON
+        course_profile_path: Path to course profile JSON
+        num_simulations: Number of scenarios to simulate
+        tilt: Proposal (see ScenarioSampler); DEFAULT_TAIL_TILT when omitted
+        quantiles: Finish-time quantiles to estimate
+        incident_threshold: Estimate P(respiratory incidents >= threshold)
+        slow_finish_hours: Also estimate P(finish time > slow_finish_hours)
+        fitness_range: (min, max) fitness levels to test
+        temperature_scenarios: Custom temperature scenarios (optional)
+        verbose: Print progress updates
+        n_workers: Worker processes to spread chunks over
+        seed: Seed for reproducible results
+        chunk_size: Simulations per seeded chunk
+        sampling_scheme: Uniform design under the proposal
+
+    Returns:
+        Dictionary with 'results' (DataFrame with an 'IS Weight' column) and
+        'estimates' (weighted_tail_estimates). analyze_results ignores the
+        weights, so use the estimates for anything distributional.
+    """
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    sampler = ScenarioSampler.for_course(
+        simulator.course_profile,
+        weather_scenarios=temperature_scenarios,
+        fitness_range=fitness_range,
+        scheme=sampling_scheme,
+        tilt=tilt if tilt is not None else DEFAULT_TAIL_TILT
+    )
+    results_df = run_monte_carlo_simulations(
+        elevation_profile=elevation_profile,
+        athlete_profile_path=athlete_profile_path,
+        course_profile_path=course_profile_path,
+        num_simulations=num_simulations,
+        verbose=verbose,
+        n_workers=n_workers,
+        seed=seed,
+        chunk_size=chunk_size,
+        sampler=sampler
+    )
+    estimates = weighted_tail_estimates(results_df, quantiles, incident_threshold, slow_finish_hours)
+
+    if verbose:
+        print(f"   Effective sample size: {estimates['ess']:.0f} ({estimates['ess_fraction']:.0%})")
+        p = estimates['p_incidents']
+        print(f"   P(≥{incident_threshold} incidents): {p['estimate']:.4f} ± {p['standard_error']:.4f}")
+
+    return {'results': results_df, 'estimates': estimates}
+
+
+def _weighted_probability(event: np.ndarray, weights: np.ndarray) -> Dict[str, float]:
+    """Self-normalised estimate of P(event) with its delta-method standard error"""
+    estimate = float(np.sum(weights * event) / np.sum(weights))
+    standard_error = float(np.sqrt(np.sum(weights ** 2 * (event - estimate) ** 2)) / np.sum(weights))
+    return {'estimate': estimate, 'standard_error': standard_error}
@@ -3,11 +3,24 @@
 Monte Carlo simulation runner for ultra-running race predictions
 """
 
-import random
 import numpy as np
 import pandas as pd
-from typing import List, Dict
-from .digital_twin_v32_simulator import DigitalTwinV32, EnvironmentalConditions, NutritionStrategy
+from typing import List, Dict, Optional, Union
+from .checkpoint import MonteCarloCheckpoint
+from .course_plan import CoursePlan, content_hash
+from .digital_twin_v32_simulator import DigitalTwinV32
+from .parallel import get_simulation_pool
+from .profile_registry import load_simulator
+from .results_frame import (
+    ARRIVAL_SUFFIX, CHECKPOINT_COLUMN, SPLIT_SUFFIX, compact_results, result_categories
+)
+from .results_store import ResultStore
+from .scenario_sampler import ScenarioSampler, DEFAULT_WEATHER_MIXTURE
+from .streaming_stats import TIMING_QUANTILES, MonteCarloAggregator, dnf_statistics, stopped_arrivals
+
+
+# Simulations per seeded chunk; fixed so results do not depend on worker count
+DEFAULT_CHUNK_SIZE = 250
 
 
 def run_monte_carlo_simulations(
@@ -17,177 +30,573 @@ def run_monte_carlo_simulations(
     num_simulations: int = 200,
     fitness_range: tuple = (0.95, 1.15),
     temperature_scenarios: List[Dict] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sampler: Optional[ScenarioSampler] = None,
+    sampling_scheme: str = 'mc',
+    checkpoint_dir: Optional[str] = None,
+    cutoffs: bool = False,
+    time_cap_hours: Optional[float] = None,
+    splits: bool = False
 ) -> pd.DataFrame:
     """
     Run Monte Carlo simulations with varying conditions.
     
+    Simulations are split into chunks of chunk_size. Each chunk draws from
+    its own numpy.random.SeedSequence.spawn stream, so a given seed gives
+    bit-identical results for any number of workers.
+    
     Args:
         elevation_profile: Course elevation data
         athlete_profile_path: Path to athlete profile JSON
         course_profile_path: Path to course profile JSON
         num_simulations: Number of scenarios to simulate
         fitness_range: (min, max) fitness levels to test
-        temperature_scenarios: Custom temperature scenarios (optional)
+        temperature_scenarios: Custom temperature scenarios (optional; the
+            default weather mixture is sampled directly when omitted)
         verbose: Print progress updates
+        n_workers: Worker processes to spread chunks over (None or 1 runs in-process)
+        seed: Seed for reproducible results (random when omitted)
+        chunk_size: Simulations per seeded chunk
+        sampler: Custom ScenarioSampler (overrides fitness_range,
+            temperature_scenarios and sampling_scheme)
+        sampling_scheme: Uniform design, one of scenario_sampler.SAMPLING_SCHEMES.
+            Each chunk is an independent randomisation of the design.
+        checkpoint_dir: Directory to save each completed chunk to. Rerunning
+            with the same directory and arguments resumes the job (the seed
+            is taken from the checkpoint when omitted) and returns the same
+            DataFrame as an uninterrupted run.
+        cutoffs: Stop runs that miss a checkpoint cutoff of the course
+            profile and record them as DNFs
+        time_cap_hours: Stop runs once elapsed time passes this cap
+        splits: Add an arrival-time column per checkpoint and a split-time
+            column per course key segment
         
     Returns:
-        DataFrame with simulation results
+        DataFrame with simulation results in the compact dtypes of
+        results_frame (use results_frame.with_finish_times for HH:MM:SS
+        strings). Each row carries the chunk and offset that generated it,
+        and DataFrame.attrs keeps the seed entropy, chunk size, sampling
+        scheme and sampler hash, so any run can be re-simulated with
+        replay.RunReplayer. With cutoffs or a time cap the frame also has
+        'DNF' and 'DNF Checkpoint' columns, and 'Time (hours)' of a DNF is
+        the elapsed time where it stopped. Arrival and split columns are
+        named '<name> Arrival (hours)' and '<name> Split (hours)' (NaN
+        beyond a DNF), and attrs['checkpoint_cutoffs'] keeps the cutoffs.
     """
-    simulator = DigitalTwinV32(athlete_profile_path, course_profile_path)
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    root_seed = np.random.SeedSequence(seed)
+    race_options = make_race_options(cutoffs, time_cap_hours, splits)
+    
+    # Scenario sampler configured for the course
+    if sampler is None:
+        sampler = ScenarioSampler.for_course(
+            simulator.course_profile,
+            weather_scenarios=temperature_scenarios,
+            fitness_range=fitness_range,
+            scheme=sampling_scheme
+        )
     
-    # Default temperature scenarios if not provided
-    if temperature_scenarios is None:
-        temperature_scenarios = create_default_weather_scenarios()
+    checkpoint = None
+    results = {}
+    if checkpoint_dir is not None:
+        checkpoint = _open_checkpoint(
+            checkpoint_dir, 'simulations', simulator, elevation_profile, num_simulations,
+            chunk_size, root_seed, sampler, seed is not None, race_options
+        )
+        root_seed = checkpoint.root_seed
+        results = {chunk: checkpoint.load_chunk(chunk) for chunk in checkpoint.completed_chunks()}
+    
+    if verbose:
+        print(f"Running {num_simulations} Monte Carlo simulations...")
+        print("="*80)
+        if results:
+            print(f"Resuming from checkpoint: {len(results)} chunks already complete")
     
-    # Pacing strategies to test
-    pacing_strategies = [
-        'conservative', 'moderate', 'aggressive', 'even', 'negative_split', 'race_mode'
+    tasks = [
+        task + (race_options,)
+        for task in chunk_tasks(elevation_profile, num_simulations, chunk_size, root_seed, sampler)
     ]
+    pending = [chunk for chunk in range(len(tasks)) if chunk not in results]
+    completed = sum(len(chunk_df) for chunk_df in results.values())
+    chunk_results = map_chunks(simulator, simulate_chunk, [tasks[chunk] for chunk in pending], n_workers)
+    for chunk, chunk_df in zip(pending, chunk_results):
+        results[chunk] = chunk_df
+        if checkpoint is not None:
+            checkpoint.save_chunk(chunk, chunk_df)
+        completed += len(chunk_df)
+        if verbose:
+            print(f"Completed {completed}/{num_simulations} simulations...")
+    
+    if verbose:
+        print("="*80)
+        print(f"✓ {num_simulations} simulations complete")
+    
+    results_df = pd.concat([results[chunk] for chunk in range(len(tasks))], ignore_index=True)
+    results_df.attrs.update(run_attrs(root_seed, chunk_size, sampler, num_simulations, race_options))
+    if splits:
+        results_df.attrs['checkpoint_cutoffs'] = checkpoint_cutoffs(simulator.compile_plan(elevation_profile))
+    return results_df
+
+
+def run_monte_carlo_streaming(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    num_simulations: int = 200,
+    fitness_range: tuple = (0.95, 1.15),
+    temperature_scenarios: List[Dict] = None,
+    target_min_hours: float = None,
+    target_max_hours: float = None,
+    verbose: bool = True,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sampler: Optional[ScenarioSampler] = None,
+    sampling_scheme: str = 'mc',
+    checkpoint_dir: Optional[str] = None,
+    cutoffs: bool = False,
+    time_cap_hours: Optional[float] = None,
+    splits: bool = False
+) -> Dict:
+    """
+    Run Monte Carlo simulations and aggregate them chunk by chunk.
+    
+    Takes the same arguments as run_monte_carlo_simulations plus the
+    analyze_results targets. Per-run rows are never kept: each chunk is
+    reduced to a MonteCarloAggregator (inside the worker when n_workers > 1)
+    and the partial aggregates are merged, so memory stays constant in
+    num_simulations. Finish-time quantiles come from a KLL sketch and are
+    exact until the sketch first compacts, and so are the checkpoint
+    arrival and split quantiles with splits=True. With checkpoint_dir the
+    merged aggregate is saved after every chunk and a rerun resumes from it.
     
-    results = []
+    Returns:
+        Dictionary in the analyze_results format
+    """
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    root_seed = np.random.SeedSequence(seed)
+    race_options = make_race_options(cutoffs, time_cap_hours, splits)
+    
+    if sampler is None:
+        sampler = ScenarioSampler.for_course(
+            simulator.course_profile,
+            weather_scenarios=temperature_scenarios,
+            fitness_range=fitness_range,
+            scheme=sampling_scheme
+        )
     
     if verbose:
-        print(f"Running {num_simulations} Monte Carlo simulations...")
+        print(f"Running {num_simulations} Monte Carlo simulations (streaming)...")
         print("="*80)
     
-    for sim in range(num_simulations):
-        # Select weather scenario
-        weather_scenario = random.choice(temperature_scenarios)
-        
-        # Randomize parameters
-        scenario = {
-            'environment': EnvironmentalConditions(
-                temperature_celsius=weather_scenario['temp_c'],
-                altitude_m=random.uniform(
-                    simulator.course_profile['environment_profile']['altitude_band_m'][0],
-                    simulator.course_profile['environment_profile']['altitude_band_m'][1]
-                ),
-                humidity_pct=random.uniform(50, 80),
-                wind_speed_kmh=random.uniform(0, 20),
-                precipitation=weather_scenario.get('precipitation', 'dry')
-            ),
-            'nutrition': NutritionStrategy(
-                calories_per_hour=random.uniform(250, 290),
-                fluid_ml_per_hour=random.uniform(500, 650),
-                electrolytes_mg_per_hour=random.uniform(450, 600)
-            ),
-            'fitness_level': random.uniform(fitness_range[0], fitness_range[1]),
-            'pollen_level': random.choice(['low', 'low', 'low', 'medium'])
-        }
-        
-        pacing = random.choice(pacing_strategies)
-        
-        # Run simulation
-        result = simulator.simulate_race(elevation_profile, scenario, pacing)
-        
-        # Store results
-        results.append({
-            'Simulation': sim + 1,
-            'Pacing Strategy': pacing,
-            'Finish Time': result['summary']['total_time_formatted'],
-            'Time (hours)': result['summary']['total_time_hours'],
-            'Moving Time (hours)': result['summary']['moving_time_hours'],
-            'Aid Station Time (min)': result['summary']['aid_station_time_hours'] * 60,
-            'Avg Speed (km/h)': result['summary']['average_speed_kmh'],
-            'Temperature (°C)': scenario['environment'].temperature_celsius,
-            'Precipitation': scenario['environment'].precipitation,
-            'Fitness Level': scenario['fitness_level'],
-            'Calories/hr': scenario['nutrition'].calories_per_hour,
-            'Fluids (ml/hr)': scenario['nutrition'].fluid_ml_per_hour,
-            'Pollen Level': scenario['pollen_level'],
-            'Respiratory Incidents': result['summary']['respiratory_incidents'],
-            'Worst Respiratory': result['summary']['worst_respiratory_impact'],
-            'Hiking %': result['summary']['hiking_percentage'],
-            'Technical Multiplier': result['summary']['technical_multiplier'],
-            'Weather Scenario': weather_scenario['name']
-        })
-        
-        if verbose and (sim + 1) % 50 == 0:
-            print(f"Completed {sim + 1}/{num_simulations} simulations...")
+    checkpoint = None
+    aggregator, next_chunk = None, 0
+    if checkpoint_dir is not None:
+        checkpoint = _open_checkpoint(
+            checkpoint_dir, 'streaming', simulator, elevation_profile, num_simulations,
+            chunk_size, root_seed, sampler, seed is not None, race_options,
+            target_min_hours=target_min_hours, target_max_hours=target_max_hours
+        )
+        root_seed = checkpoint.root_seed
+        aggregator, next_chunk = checkpoint.load_aggregate()
+    if aggregator is None:
+        aggregator = MonteCarloAggregator(
+            target_min_hours, target_max_hours, seed=root_seed,
+            checkpoint_cutoffs=checkpoint_cutoffs(simulator.compile_plan(elevation_profile))
+        )
+    
+    tasks = [
+        task + (target_min_hours, target_max_hours, race_options)
+        for task in chunk_tasks(elevation_profile, num_simulations, chunk_size, root_seed, sampler)
+    ]
+    for chunk, partial in enumerate(
+        map_chunks(simulator, aggregate_chunk, tasks[next_chunk:], n_workers), start=next_chunk
+    ):
+        aggregator.merge(partial)
+        if checkpoint is not None:
+            checkpoint.save_aggregate(aggregator, chunk + 1)
+        if verbose:
+            print(f"Completed {aggregator.count}/{num_simulations} simulations...")
     
     if verbose:
         print("="*80)
         print(f"✓ {num_simulations} simulations complete")
     
-    return pd.DataFrame(results)
+    return aggregator.result()
 
 
-def create_default_weather_scenarios(num_scenarios: int = 200) -> List[Dict]:
+def run_monte_carlo_to_store(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    store_dir: str,
+    num_simulations: int = 200,
+    fitness_range: tuple = (0.95, 1.15),
+    temperature_scenarios: List[Dict] = None,
+    verbose: bool = True,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sampler: Optional[ScenarioSampler] = None,
+    sampling_scheme: str = 'mc',
+    cutoffs: bool = False,
+    time_cap_hours: Optional[float] = None,
+    splits: bool = False
+) -> ResultStore:
+    """
+    Run Monte Carlo simulations into an on-disk ResultStore.
+    
+    Takes the same arguments as run_monte_carlo_simulations plus the store
+    directory. Each chunk is written as a shard by the worker that simulated
+    it, so result rows never pass through the parent process and memory
+    stays constant in num_simulations. The rows are identical to those of
+    run_monte_carlo_simulations with the same seed.
+    
+    Returns:
+        ResultStore (use store.scan(), store.column() or analyze_results(store))
+    """
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    root_seed = np.random.SeedSequence(seed)
+    race_options = make_race_options(cutoffs, time_cap_hours, splits)
+    
+    if sampler is None:
+        sampler = ScenarioSampler.for_course(
+            simulator.course_profile,
+            weather_scenarios=temperature_scenarios,
+            fitness_range=fitness_range,
+            scheme=sampling_scheme
+        )
+    
+    attrs = run_attrs(root_seed, chunk_size, sampler, num_simulations, race_options)
+    if splits:
+        attrs['checkpoint_cutoffs'] = checkpoint_cutoffs(simulator.compile_plan(elevation_profile))
+    store = ResultStore.create(store_dir, attrs=attrs)
+    
+    if verbose:
+        print(f"Running {num_simulations} Monte Carlo simulations into {store_dir}...")
+        print("="*80)
+    
+    tasks = [
+        task + (store_dir, chunk, race_options)
+        for chunk, task in enumerate(chunk_tasks(elevation_profile, num_simulations, chunk_size, root_seed, sampler))
+    ]
+    for shard in map_chunks(simulator, _store_chunk, tasks, n_workers):
+        store.add_shard(shard)
+        if verbose:
+            print(f"Completed {len(store)}/{num_simulations} simulations...")
+    
+    if verbose:
+        print("="*80)
+        print(f"✓ {num_simulations} simulations complete")
+    
+    return store
+
+
+def make_race_options(cutoffs: bool, time_cap_hours: Optional[float], splits: bool = False) -> Dict:
+    """Per-run options of a job (empty when all are off)"""
+    if time_cap_hours is not None and time_cap_hours <= 0:
+        raise ValueError(f"time_cap_hours must be positive, got {time_cap_hours}")
+    options = {}
+    if cutoffs or time_cap_hours is not None:
+        options.update({'cutoffs': bool(cutoffs), 'time_cap_hours': time_cap_hours})
+    if splits:
+        options['splits'] = True
+    return options
+
+
+def stop_rule_kwargs(race_options: Optional[Dict]) -> Dict:
+    """The simulate_batch keywords among a job's race options"""
+    return {key: value for key, value in (race_options or {}).items() if key in ('cutoffs', 'time_cap_hours')}
+
+
+def checkpoint_cutoffs(plan: CoursePlan) -> Dict[str, Optional[float]]:
+    """Elapsed-time cutoff per checkpoint name (None where there is none)"""
+    return {
+        name: None if np.isinf(cutoff) else float(cutoff)
+        for name, cutoff in zip(plan.checkpoint_names, plan.checkpoint_cutoff_hours.tolist())
+    }
+
+
+def run_attrs(
+    root_seed: np.random.SeedSequence,
+    chunk_size: int,
+    sampler: ScenarioSampler,
+    num_simulations: int,
+    race_options: Optional[Dict] = None
+) -> Dict:
+    """Metadata needed to reproduce any run of a Monte Carlo job"""
+    return {
+        'seed': root_seed.entropy,
+        'chunk_size': chunk_size,
+        'num_simulations': num_simulations,
+        'sampling_scheme': sampler.scheme,
+        'sampler_hash': content_hash(vars(sampler)),
+        'race_options': dict(race_options or {}),
+    }
+
+
+def _open_checkpoint(
+    checkpoint_dir: str,
+    runner: str,
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    num_simulations: int,
+    chunk_size: int,
+    root_seed: np.random.SeedSequence,
+    sampler: ScenarioSampler,
+    seed_given: bool,
+    race_options: Optional[Dict] = None,
+    **settings
+) -> MonteCarloCheckpoint:
+    """Create or resume the checkpoint of a runner"""
+    if race_options:
+        settings['race_options'] = race_options
+    settings.update({
+        'runner': runner,
+        'num_simulations': num_simulations,
+        'chunk_size': chunk_size,
+        'profile_key': simulator.profile_key,
+        'elevation_hash': content_hash(elevation_profile),
+    })
+    return MonteCarloCheckpoint.open(checkpoint_dir, root_seed, settings, sampler, seed_given)
+
+
+def chunk_seed(root_seed: np.random.SeedSequence, chunk: int) -> np.random.SeedSequence:
+    """
+    Seed stream of one chunk.
+    
+    Identical to the chunk-th child of root_seed.spawn(), but can be built
+    for any chunk index directly.
+    """
+    return np.random.SeedSequence(
+        root_seed.entropy,
+        spawn_key=tuple(root_seed.spawn_key) + (chunk,),
+        pool_size=root_seed.pool_size
+    )
+
+
+def chunk_tasks(
+    elevation_profile: List[Dict],
+    num_simulations: int,
+    chunk_size: int,
+    root_seed: np.random.SeedSequence,
+    sampler: ScenarioSampler,
+    first_chunk: int = 0
+) -> List[tuple]:
+    """Split num_simulations into seeded simulate_chunk tasks"""
+    num_chunks = -(-num_simulations // chunk_size)
+    return [
+        (
+            elevation_profile,
+            chunk * chunk_size,
+            min(chunk_size, num_simulations - (chunk - first_chunk) * chunk_size),
+            chunk_seed(root_seed, chunk),
+            sampler
+        )
+        for chunk in range(first_chunk, first_chunk + num_chunks)
+    ]
+
+
+def map_chunks(simulator: DigitalTwinV32, fn, tasks: List[tuple], n_workers: Optional[int]):
+    """Run chunk tasks in order, on the persistent pool when n_workers > 1"""
+    if n_workers is not None and n_workers > 1:
+        return get_simulation_pool(simulator, n_workers).map(fn, tasks)
+    return (fn(simulator, *task) for task in tasks)
+
+
+def aggregate_chunk(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    first_simulation: int,
+    num_simulations: int,
+    seed_sequence: np.random.SeedSequence,
+    sampler: ScenarioSampler,
+    target_min_hours: float = None,
+    target_max_hours: float = None,
+    race_options: Optional[Dict] = None
+) -> MonteCarloAggregator:
+    """Simulate one chunk and reduce it to a partial aggregate"""
+    chunk_df = simulate_chunk(
+        simulator, elevation_profile, first_simulation, num_simulations, seed_sequence, sampler, race_options
+    )
+    aggregator = MonteCarloAggregator(
+        target_min_hours, target_max_hours, seed=seed_sequence,
+        checkpoint_cutoffs=checkpoint_cutoffs(simulator.compile_plan(elevation_profile))
+    )
+    aggregator.update(chunk_df)
+    return aggregator
+
+
+def _store_chunk(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    first_simulation: int,
+    num_simulations: int,
+    seed_sequence: np.random.SeedSequence,
+    sampler: ScenarioSampler,
+    store_dir: str,
+    shard: int,
+    race_options: Optional[Dict] = None
+) -> Dict:
+    """Simulate one chunk and write it to the result store as a shard"""
+    chunk_df = simulate_chunk(
+        simulator, elevation_profile, first_simulation, num_simulations, seed_sequence, sampler, race_options
+    )
+    return ResultStore.write_shard(store_dir, shard, chunk_df)
+
+
+def sample_chunk(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    num_simulations: int,
+    seed_sequence: np.random.SeedSequence,
+    sampler: ScenarioSampler
+) -> tuple:
+    """(plan, scenarios, draws, weights) of one seeded chunk, all drawn up front"""
+    rng = np.random.default_rng(seed_sequence)
+    plan = simulator.compile_plan(elevation_profile)
+    scenarios, weights = sampler.sample_weighted(num_simulations, rng)
+    draws = sampler.sample_race_draws(num_simulations, plan.n_segments, rng)
+    return plan, scenarios, draws, weights
+
+
+def simulate_chunk(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    first_simulation: int,
+    num_simulations: int,
+    seed_sequence: np.random.SeedSequence,
+    sampler: ScenarioSampler,
+    race_options: Optional[Dict] = None
+) -> pd.DataFrame:
+    """Simulate one seeded chunk of Monte Carlo runs in a single batch"""
+    plan, scenarios, draws, weights = sample_chunk(
+        simulator, elevation_profile, num_simulations, seed_sequence, sampler
+    )
+    summary = simulator.simulate_batch(
+        elevation_profile, scenarios, scenarios.pacing_strategy, draws=draws, plan=plan, **stop_rule_kwargs(race_options)
+    )['summary']
+    
+    # chunk_seed() puts the chunk index last in the spawn key
+    chunk_df = pd.DataFrame({
+        'Simulation': np.arange(first_simulation + 1, first_simulation + num_simulations + 1),
+        'Chunk': np.full(num_simulations, seed_sequence.spawn_key[-1]),
+        'Chunk Offset': np.arange(num_simulations),
+        'Pacing Strategy': scenarios.pacing_strategy,
+        'Time (hours)': summary['total_time_hours'],
+        'Moving Time (hours)': summary['moving_time_hours'],
+        'Aid Station Time (min)': summary['aid_station_time_hours'] * 60,
+        'Avg Speed (km/h)': summary['average_speed_kmh'],
+        'Temperature (°C)': scenarios.temperature_c,
+        'Precipitation': scenarios.precipitation,
+        'Fitness Level': scenarios.fitness_level,
+        'Calories/hr': scenarios.calories_per_hour,
+        'Fluids (ml/hr)': scenarios.fluid_ml_per_hour,
+        'Pollen Level': scenarios.pollen_level,
+        'Respiratory Incidents': summary['respiratory_incidents'],
+        'Worst Respiratory': summary['worst_respiratory_impact'],
+        'Hiking %': summary['hiking_percentage'],
+        'Technical Multiplier': summary['technical_multiplier'],
+        'Weather Scenario': scenarios.weather_scenario
+    })
+    if sampler.tilt:
+        chunk_df['IS Weight'] = weights
+    categories = result_categories(sampler)
+    if stop_rule_kwargs(race_options):
+        chunk_df['DNF'] = ~summary['finished']
+        chunk_df[CHECKPOINT_COLUMN] = summary['dnf_checkpoint']
+        categories[CHECKPOINT_COLUMN] = plan.checkpoint_names
+    if (race_options or {}).get('splits'):
+        for j, name in enumerate(plan.checkpoint_names):
+            chunk_df[name + ARRIVAL_SUFFIX] = summary['checkpoint_hours'][:, j]
+        for j, name in enumerate(plan.key_segment_names):
+            chunk_df[name + SPLIT_SUFFIX] = summary['key_segment_hours'][:, j]
+    return compact_results(chunk_df, categories)
+
+
+def create_default_weather_scenarios(
+    num_scenarios: int = 200,
+    rng: Optional[np.random.Generator] = None
+) -> List[Dict]:
     """
     Create default weather scenarios for Monte Carlo simulations.
     
     Args:
         num_scenarios: Number of scenarios to generate
+        rng: NumPy generator (the numpy.random module functions when omitted)
         
     Returns:
         List of weather scenario dictionaries
     """
+    rng = rng if rng is not None else np.random
     scenarios = []
     
-    # Typical March conditions (40%)
-    for _ in range(int(num_scenarios * 0.4)):
-        temp = np.random.normal(11, 2.5)
-        scenarios.append({
-            'name': 'Typical March',
-            'temp_c': max(4, min(16, temp)),
-            'precipitation': 'dry' if random.random() > 0.25 else 'light_rain'
-        })
-    
-    # Cold scenarios (20%)
-    for _ in range(int(num_scenarios * 0.2)):
-        temp = np.random.normal(7, 2)
-        scenarios.append({
-            'name': 'Cold Day',
-            'temp_c': max(2, min(10, temp)),
-            'precipitation': 'dry'
-        })
-    
-    # Optimal scenarios (30%)
-    for _ in range(int(num_scenarios * 0.3)):
-        temp = np.random.normal(14, 1.5)
-        scenarios.append({
-            'name': 'Optimal',
-            'temp_c': max(12, min(16, temp)),
-            'precipitation': 'dry'
-        })
-    
-    # Warm scenarios (10%)
-    for _ in range(int(num_scenarios * 0.1)):
-        temp = np.random.normal(17, 2)
-        scenarios.append({
-            'name': 'Warm Day',
-            'temp_c': max(15, min(20, temp)),
-            'precipitation': 'dry'
-        })
+    # Typical March 40%, Cold 20%, Optimal 30%, Warm 10%
+    for component in DEFAULT_WEATHER_MIXTURE:
+        count = int(num_scenarios * component['weight'])
+        temps = np.clip(
+            rng.normal(component['temp_mean'], component['temp_std'], size=count),
+            component['temp_min'],
+            component['temp_max']
+        )
+        if component['light_rain_probability'] > 0:
+            dry = rng.random(count) > component['light_rain_probability']
+        else:
+            dry = np.ones(count, dtype=bool)
+        scenarios.extend(
+            {'name': component['name'], 'temp_c': temp, 'precipitation': 'dry' if is_dry else 'light_rain'}
+            for temp, is_dry in zip(temps.tolist(), dry.tolist())
+        )
     
     return scenarios
 
 
-def analyze_results(results_df: pd.DataFrame, target_min_hours: float = None, target_max_hours: float = None) -> Dict:
+def analyze_results(
+    results_df: Union[pd.DataFrame, ResultStore],
+    target_min_hours: float = None,
+    target_max_hours: float = None
+) -> Dict:
     """
     Analyze Monte Carlo simulation results.
     
     Args:
-        results_df: DataFrame from run_monte_carlo_simulations
+        results_df: DataFrame from run_monte_carlo_simulations, or a
+            ResultStore (analysed shard by shard with MonteCarloAggregator)
         target_min_hours: Minimum target time (optional)
         target_max_hours: Maximum target time (optional)
         
     Returns:
-        Dictionary with analysis statistics
+        Dictionary with analysis statistics. For runs with cutoffs the time,
+        pacing and weather statistics cover finishers only, the target
+        success rate counts DNFs as misses, and 'dnf_statistics' gives the
+        DNF rate overall and by checkpoint. Results with splits also get
+        'checkpoint_statistics' (arrival-time mean and quantiles, the share
+        of runs getting past each checkpoint, which leaves out runs stopped
+        there by a cutoff or the time cap, and, where there is a cutoff,
+        P(arriving after it) out of all runs) and 'split_statistics'.
     """
+    if isinstance(results_df, ResultStore):
+        return results_df.analyze(target_min_hours, target_max_hours)
+    
+    finishers = results_df
+    if 'DNF' in results_df:
+        finishers = results_df[~results_df['DNF'].to_numpy(dtype=bool)]
+    
     analysis = {
         'total_simulations': len(results_df),
         'time_statistics': {
-            'mean': results_df['Time (hours)'].mean(),
-            'median': results_df['Time (hours)'].median(),
-            'std': results_df['Time (hours)'].std(),
-            'min': results_df['Time (hours)'].min(),
-            'max': results_df['Time (hours)'].max(),
-            'p10': results_df['Time (hours)'].quantile(0.10),
-            'p25': results_df['Time (hours)'].quantile(0.25),
-            'p75': results_df['Time (hours)'].quantile(0.75),
-            'p90': results_df['Time (hours)'].quantile(0.90),
+            'mean': finishers['Time (hours)'].mean(),
+            'median': finishers['Time (hours)'].median(),
+            'std': finishers['Time (hours)'].std(),
+            'min': finishers['Time (hours)'].min(),
+            'max': finishers['Time (hours)'].max(),
+            'p10': finishers['Time (hours)'].quantile(0.10),
+            'p25': finishers['Time (hours)'].quantile(0.25),
+            'p75': finishers['Time (hours)'].quantile(0.75),
+            'p90': finishers['Time (hours)'].quantile(0.90),
         },
         'respiratory_statistics': {
             'mean_incidents': results_df['Respiratory Incidents'].mean(),
@@ -195,15 +604,15 @@ def analyze_results(results_df: pd.DataFrame, target_min_hours: float = None, ta
             'max_incidents': results_df['Respiratory Incidents'].max(),
             'zero_incident_rate': (results_df['Respiratory Incidents'] == 0).sum() / len(results_df)
         },
-        'pacing_performance': results_df.groupby('Pacing Strategy')['Time (hours)'].agg(['mean', 'std', 'count']).to_dict(),
-        'weather_performance': results_df.groupby('Weather Scenario')['Time (hours)'].agg(['mean', 'std', 'count']).to_dict(),
+        'pacing_performance': finishers.groupby('Pacing Strategy', observed=True)['Time (hours)'].agg(['mean', 'std', 'count']).to_dict(),
+        'weather_performance': finishers.groupby('Weather Scenario', observed=True)['Time (hours)'].agg(['mean', 'std', 'count']).to_dict(),
     }
     
     # Target achievement analysis
     if target_min_hours and target_max_hours:
-        in_target = results_df[
-            (results_df['Time (hours)'] >= target_min_hours) & 
-            (results_df['Time (hours)'] <= target_max_hours)
+        in_target = finishers[
+            (finishers['Time (hours)'] >= target_min_hours) & 
+            (finishers['Time (hours)'] <= target_max_hours)
         ]
         
         analysis['target_achievement'] = {
@@ -213,6 +622,39 @@ def analyze_results(results_df: pd.DataFrame, target_min_hours: float = None, ta
             'mean_temp_in_target': in_target['Temperature (°C)'].mean() if len(in_target) > 0 else None,
         }
     
+    # DNFs by checkpoint
+    if 'DNF' in results_df:
+        dnf = results_df['DNF'].to_numpy(dtype=bool)
+        dnf_counts = results_df[CHECKPOINT_COLUMN][dnf].value_counts(sort=False).to_dict()
+        analysis['dnf_statistics'] = dnf_statistics(dnf_counts, len(results_df))
+    
+    # Checkpoint arrivals and key segment splits
+    cutoffs = results_df.attrs.get('checkpoint_cutoffs', {})
+    checkpoints, splits = {}, {}
+    for column in results_df.columns:
+        if not column.endswith((ARRIVAL_SUFFIX, SPLIT_SUFFIX)):
+            continue
+        values = results_df[column].to_numpy(dtype=float)
+        reached = values[~np.isnan(values)]
+        entry = {'mean': float(reached.mean()) if len(reached) else float('nan')}
+        entry.update({
+            name: float(np.quantile(reached, q)) if len(reached) else float('nan')
+            for name, q in TIMING_QUANTILES.items()
+        })
+        if column.endswith(ARRIVAL_SUFFIX):
+            name = column[:-len(ARRIVAL_SUFFIX)]
+            stopped = int(np.count_nonzero(stopped_arrivals(results_df, name, values)))
+            entry['reached_rate'] = (len(reached) - stopped) / len(results_df)
+            if cutoffs.get(name) is not None:
+                entry['cutoff_hours'] = cutoffs[name]
+                entry['p_miss_cutoff'] = int(np.count_nonzero(reached > cutoffs[name])) / len(results_df)
+            checkpoints[name] = entry
+        else:
+            splits[column[:-len(SPLIT_SUFFIX)]] = entry
+    if checkpoints or splits:
+        analysis['checkpoint_statistics'] = checkpoints
+        analysis['split_statistics'] = splits
+    
     return analysis
 
 
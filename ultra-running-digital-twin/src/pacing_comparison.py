@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Paired pacing-strategy comparison with common random numbers
+
+Every sampled scenario, together with its respiratory-incident and aid
+station draws, is run under every pacing strategy in a single
+simulate_batch call. Differences between strategies are therefore paired:
+weather, fitness and race-day luck cancel out, and each strategy is seen
+on all N scenarios instead of about N/6.
+"""
+
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from .digital_twin_v32_simulator import DigitalTwinV32
+from .monte_carlo_runner import DEFAULT_CHUNK_SIZE, chunk_tasks, map_chunks
+from .profile_registry import load_simulator
+from .scenario_sampler import PACING_STRATEGIES, ScenarioSampler
+
+
+def compare_pacing_strategies(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    num_scenarios: int = 500,
+    strategies: Sequence[str] = tuple(PACING_STRATEGIES),
+    fitness_range: tuple = (0.95, 1.15),
+    temperature_scenarios: List[Dict] = None,
+    confidence: float = 0.95,
+    verbose: bool = True,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sampler: Optional[ScenarioSampler] = None,
+    sampling_scheme: str = 'mc'
+) -> Dict:
+    """
+    Evaluate every pacing strategy on the same scenarios and draws.
+
+    Args:
+        elevation_profile: Course elevation data
+        athlete_profile_path: Path to athlete profile JSON
+        course_profile_path: Path to course profile JSON
+        num_scenarios: Number of scenarios (each run once per strategy)
+        strategies: Pacing strategies to compare
+        fitness_range: (min, max) fitness levels to test
+        temperature_scenarios: Custom temperature scenarios (optional)
+        confidence: Confidence level of the paired mean-difference intervals
+        verbose: Print progress updates
+        n_workers: Worker processes to spread chunks over
+        seed: Seed for reproducible results
+        chunk_size: Scenarios per seeded chunk
+        sampler: Custom ScenarioSampler (its pacing draw is ignored)
+        sampling_scheme: Uniform design for the default sampler
+
+    Returns:
+        Dictionary with:
+            'times': DataFrame of finish times (hours), one row per scenario
+                and one column per strategy
+            'strategies': per-strategy mean/median/p10/p90, mean rank and
+                probability of being fastest
+            'pairwise': one row per strategy pair (A, B) with the mean paired
+                difference A - B in minutes, its CI and std, and P(A faster)
+            'win_probability': matrix of P(row strategy faster than column)
+    """
+    strategies = list(strategies)
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    root_seed = np.random.SeedSequence(seed)
+    if sampler is None:
+        sampler = ScenarioSampler.for_course(
+            simulator.course_profile,
+            weather_scenarios=temperature_scenarios,
+            fitness_range=fitness_range,
+            scheme=sampling_scheme
+        )
+
+    if verbose:
+        print(f"Comparing {len(strategies)} pacing strategies on {num_scenarios} common scenarios...")
+
+    tasks = [
+        task + (strategies,)
+        for task in chunk_tasks(elevation_profile, num_scenarios, chunk_size, root_seed, sampler)
+    ]
+    times = np.concatenate(list(map_chunks(simulator, _paired_chunk, tasks, n_workers)))
+
+    times_df = pd.DataFrame(times, columns=strategies)
+    times_df.index = pd.RangeIndex(1, len(times_df) + 1, name='Scenario')
+    times_df.attrs['seed'] = root_seed.entropy
+
+    if verbose:
+        print(f"✓ {num_scenarios * len(strategies)} paired simulations complete")
+
+    return {
+        'times': times_df,
+        'strategies': _strategy_table(times, strategies),
+        'pairwise': _pairwise_table(times, strategies, confidence),
+        'win_probability': _win_matrix(times, strategies),
+    }
+
+
+def _paired_chunk(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    first_simulation: int,
+    num_scenarios: int,
+    seed_sequence: np.random.SeedSequence,
+    sampler: ScenarioSampler,
+    strategies: List[str]
+) -> np.ndarray:
+    """Finish times (num_scenarios, len(strategies)) for one seeded chunk"""
+    rng = np.random.default_rng(seed_sequence)
+    plan = simulator.compile_plan(elevation_profile)
+    scenarios = sampler.sample(num_scenarios, rng)
+    draws = sampler.sample_race_draws(num_scenarios, plan.n_segments, rng)
+
+    # Repeat every scenario (and its draws) once per strategy
+    rows = np.repeat(np.arange(num_scenarios), len(strategies))
+    pacing = np.tile(np.array(strategies, dtype=object), num_scenarios)
+    summary = simulator.simulate_batch(
+        elevation_profile, scenarios[rows], pacing, draws=draws[rows], plan=plan
+    )['summary']
+    return summary['total_time_hours'].reshape(num_scenarios, len(strategies))
+
+
+def _strategy_table(times: np.ndarray, strategies: List[str]) -> pd.DataFrame:
+    """Marginal distribution and ranking of each strategy"""
+    ranks = times.argsort(axis=1).argsort(axis=1) + 1
+    fastest = np.bincount(times.argmin(axis=1), minlength=len(strategies))
+    return pd.DataFrame({
+        'mean': times.mean(axis=0),
+        'median': np.median(times, axis=0),
+        'p10': np.quantile(times, 0.10, axis=0),
+        'p90': np.quantile(times, 0.90, axis=0),
+        'mean_rank': ranks.mean(axis=0),
+        'p_fastest': fastest / len(times),
+    }, index=pd.Index(strategies, name='Pacing Strategy')).sort_values('mean_rank')
+
+
+def _pairwise_table(times: np.ndarray, strategies: List[str], confidence: float) -> pd.DataFrame:
+    """Paired differences and win probabilities for every strategy pair"""
+    z = norm.ppf(0.5 + confidence / 2)
+    n = len(times)
+    rows = []
+    for a, b in combinations(range(len(strategies)), 2):
+        diff_minutes = (times[:, a] - times[:, b]) * 60
+        mean = diff_minutes.mean()
+        std = diff_minutes.std(ddof=1) if n > 1 else float('nan')
+        half_width = z * std / np.sqrt(n)
+        rows.append({
+            'strategy_a': strategies[a],
+            'strategy_b': strategies[b],
+            'mean_diff_min': mean,
+            'ci_low_min': mean - half_width,
+            'ci_high_min': mean + half_width,
+            'std_diff_min': std,
+            'p_a_faster': float((diff_minutes < 0).mean()),
+            'p_tie': float((diff_minutes == 0).mean()),
+        })
+    return pd.DataFrame(rows)
+
+
+def _win_matrix(times: np.ndarray, strategies: List[str]) -> pd.DataFrame:
+    """P(row strategy finishes faster than column strategy)"""
+    wins = (times[:, :, None] < times[:, None, :]).mean(axis=0)
+    return pd.DataFrame(wins, index=strategies, columns=strategies)
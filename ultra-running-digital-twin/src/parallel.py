@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Persistent process pools for Monte Carlo simulation
+
+Each worker receives the simulator once, through the pool initializer, and
+then only small task tuples (chunk index, size and seed stream) are sent per
+task. Pools are kept alive between runs and shut down at interpreter exit.
+"""
+
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+# Simulator held by each worker process
+_WORKER_SIMULATOR = None
+
+_POOLS: Dict[Tuple[str, int], "SimulationPool"] = {}
+
+
+def _init_worker(simulator):
+    """Store the simulator in the worker process"""
+    global _WORKER_SIMULATOR
+    _WORKER_SIMULATOR = simulator
+
+
+def _run_task(fn: Callable, args: tuple):
+    """Call fn(simulator, *args) inside a worker"""
+    return fn(_WORKER_SIMULATOR, *args)
+
+
+class SimulationPool:
+    """
+    Process pool whose workers each hold one DigitalTwinV32 instance
+    """
+
+    def __init__(self, simulator, n_workers: int):
+        self.n_workers = n_workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(simulator,)
+        )
+
+    def map(self, fn: Callable, tasks: Iterable[tuple]) -> Iterator:
+        """
+        Run fn(simulator, *task) for every task, yielding results in task order.
+
+        fn must be a module-level function so it can be sent to the workers.
+        """
+        tasks = list(tasks)
+        return self.executor.map(_run_task, [fn] * len(tasks), tasks)
+
+    def submit(self, fn: Callable, *args):
+        """Schedule fn(simulator, *args) and return its future"""
+        return self.executor.submit(_run_task, fn, args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+def get_simulation_pool(simulator, n_workers: int) -> SimulationPool:
+    """
+    Get a persistent pool for a simulator, creating it on first use.
+
+    Pools are keyed by the simulator's profile content and worker count.
+    """
+    key = (simulator.profile_key, n_workers)
+    pool = _POOLS.get(key)
+    if pool is None:
+        pool = SimulationPool(simulator, n_workers)
+        _POOLS[key] = pool
+    return pool
+
+
+@atexit.register
+def shutdown_pools():
+    """Shut down all persistent simulation pools"""
+    while _POOLS:
+        _, pool = _POOLS.popitem()
+        pool.shutdown()
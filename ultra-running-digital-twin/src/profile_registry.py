@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Profile registry: parse profiles once, reuse them across simulators and runs
+
+DigitalTwinV32 json.loads both profiles on every construction, although the
+model only reads a handful of sections (the athlete profile also carries
+training history and long free-text notes). ProfileRegistry parses each
+profile file once per process and caches a split form on disk, so a fresh
+process only parses the sections the model reads. The runners build their
+simulators through the process-wide registry (load_simulator).
+
+    cache_dir/
+        <sha1 of the absolute path>.cache
+
+A cache entry is one JSON header line followed by the compressed JSON of
+the other sections; it holds no pickles, so a shared cache directory
+cannot run code. The header records the source file's mtime and size
+(checked on every load) and the SHA-1 of its contents (checked when the
+mtime or size changed, so touching a file does not force a re-parse).
+Sections the model reads (EAGER_SECTIONS) are in the header; every other
+section is only decompressed and parsed when first read, through
+LazyProfile.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+from .digital_twin_v32_simulator import DigitalTwinV32
+
+# Default on-disk cache location
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ultra-running-digital-twin', 'profiles')
+
+# Bump when the cache entry layout changes
+CACHE_VERSION = 2
+
+# Top-level profile sections decoded up front (everything read by the model
+# and the runners); all other sections load lazily
+EAGER_SECTIONS = (
+    # Athlete profile
+    'metadata', 'athlete_info', 'fitness_baseline', 'performance_by_gradient',
+    'physiological_profile', 'respiratory_profile', 'race_overrides', '2026_race_calendar_context',
+    # Course profile
+    'course_metadata', 'environment_profile', 'terrain_profile', 'aid_stations',
+    'aid_station_model', 'key_segments', 'simulation_defaults', 'validation_targets',
+)
+
+
+class LazyProfile(dict):
+    """
+    Parsed profile whose rarely used sections stay encoded until first read.
+
+    Reading one section (profile[key], get(), in) decodes only that
+    section. Anything that needs the whole mapping (iteration, len,
+    equality, JSON encoding, copies, mutation) decodes the rest first, so
+    the profile behaves like the dict json.load returns, in the same key
+    order.
+    """
+
+    def __init__(self, sections: Dict, lazy_sections: Dict[str, bytes], order: Sequence[str]):
+        super().__init__(sections)
+        self._lazy = dict(lazy_sections)
+        self._order = list(order)
+
+    @property
+    def lazy_sections(self) -> List[str]:
+        """Sections not decoded yet"""
+        return list(self._lazy)
+
+    def _decode(self, key: str):
+        value = json.loads(zlib.decompress(self._lazy.pop(key)))
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _decode_all(self):
+        """Decode every lazy section and restore the file's key order"""
+        if not self._lazy:
+            return
+        for key in list(self._lazy):
+            self._decode(key)
+        rank = {key: i for i, key in enumerate(self._order)}
+        items = sorted(dict.items(self), key=lambda item: rank.get(item[0], len(rank)))
+        dict.clear(self)
+        dict.update(self, items)
+
+    def __missing__(self, key):
+        if key in self._lazy:
+            return self._decode(key)
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self, key) or key in self._lazy
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __eq__(self, other) -> bool:
+        self._decode_all()
+        if isinstance(other, LazyProfile):
+            other._decode_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __reduce_ex__(self, protocol):
+        # Pickles and deep copies stay lazy
+        return LazyProfile, (dict(dict.items(self)), dict(self._lazy), list(self._order))
+
+
+def _decoding(name: str):
+    """dict method that decodes every lazy section first"""
+    method = getattr(dict, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._decode_all()
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in (
+    '__iter__', '__reversed__', '__len__', '__repr__', '__or__', '__ior__',
+    '__setitem__', '__delitem__', 'keys', 'items', 'values', 'copy', 'pop', 'popitem',
+    'setdefault', 'update', 'clear'
+):
+    setattr(LazyProfile, _name, _decoding(_name))
+
+
+class ProfileRegistry:
+    """
+    Parsed athlete and course profiles, shared in memory and cached on disk.
+
+    Profiles returned by load() are shared between every simulator built
+    from them and must be treated as read-only (copy.deepcopy one to edit
+    it).
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: Directory for cache entries (DEFAULT_CACHE_DIR when
+                omitted); entries that cannot be written are skipped
+        """
+        self.cache_dir = cache_dir if cache_dir is not None else DEFAULT_CACHE_DIR
+        self._profiles = {}
+
+    def load(self, path: str) -> LazyProfile:
+        """Parsed profile for a JSON file, from memory, the disk cache or the file"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        loaded = self._profiles.get(path)
+        if loaded is not None and loaded[0] == signature:
+            return loaded[1]
+
+        cache_path = self.cache_path(path)
+        entry = _read_entry(cache_path, path)
+        if entry is None or entry['signature'] != signature:
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha1(data).hexdigest()
+            if entry is None or entry['sha1'] != digest:
+                entry = _encode_entry(path, json.loads(data), digest)
+            entry['signature'] = signature
+            _write_entry(cache_path, entry)
+
+        profile = LazyProfile(entry['sections'], entry['lazy'], entry['order'])
+        self._profiles[path] = (signature, profile)
+        return profile
+
+    def simulator(self, athlete_profile_path: str, course_profile_path: str) -> DigitalTwinV32:
+        """DigitalTwinV32 built from registry profiles"""
+        return DigitalTwinV32.from_profiles(self.load(athlete_profile_path), self.load(course_profile_path))
+
+    def cache_path(self, path: str) -> str:
+        """Cache entry file of a profile path"""
+        name = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name + '.cache')
+
+    def clear(self, disk: bool = False):
+        """Forget loaded profiles, and with disk=True delete the cache entries"""
+        if disk:
+            for path in self._profiles:
+                try:
+                    os.remove(self.cache_path(path))
+                except FileNotFoundError:
+                    pass
+        self._profiles.clear()
+
+
+_DEFAULT_REGISTRY: Optional[ProfileRegistry] = None
+
+
+def default_registry() -> ProfileRegistry:
+    """Process-wide registry on DEFAULT_CACHE_DIR"""
+    global _DEFAULT_REGISTRY
+    if _DEFAULT_REGISTRY is None:
+        _DEFAULT_REGISTRY = ProfileRegistry()
+    return _DEFAULT_REGISTRY
+
+
+def load_simulator(athlete_profile_path: str, course_profile_path: str) -> DigitalTwinV32:
+    """DigitalTwinV32 for two profile files, built from the process-wide registry"""
+    return default_registry().simulator(athlete_profile_path, course_profile_path)
+
+
+def _encode_entry(path: str, profile: Dict, digest: str) -> Dict:
+    """Cache entry of a parsed profile (eager sections as is, the rest compressed)"""
+    if not isinstance(profile, dict):
+        raise ValueError(f"{path} does not hold a JSON object")
+    eager = {key: value for key, value in profile.items() if key in EAGER_SECTIONS}
+    if not eager:
+        eager = profile
+    return {
+        'version': CACHE_VERSION,
+        'path': path,
+        'sha1': digest,
+        'order': list(profile),
+        'sections': eager,
+        'lazy': {
+            key: zlib.compress(json.dumps(value).encode('utf-8'))
+            for key, value in profile.items() if key not in eager
+        },
+    }
+
+
+def _read_entry(cache_path: str, path: str) -> Optional[Dict]:
+    """Cache entry for path, or None when missing, stale in format or unreadable"""
+    try:
+        with open(cache_path, 'rb') as f:
+            header = json.loads(f.readline())
+            if (
+                not isinstance(header, dict) or header.get('version') != CACHE_VERSION
+                or header.get('path') != path
+            ):
+                return None
+            lazy = {}
+            for key, size in header.pop('lazy_sizes'):
+                lazy[key] = f.read(size)
+                if len(lazy[key]) != size:
+                    return None
+            if f.read(1):
+                return None
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing, truncated or corrupt entries are rebuilt from the source file
+        return None
+    return dict(header, lazy=lazy)
+
+
+def _write_entry(cache_path: str, entry: Dict):
+    """Write a cache entry atomically; a read-only cache only costs the speed-up"""
+    header = {key: value for key, value in entry.items() if key != 'lazy'}
+    header['lazy_sizes'] = [[key, len(data)] for key, data in entry['lazy'].items()]
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            for data in entry['lazy'].values():
+                f.write(data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
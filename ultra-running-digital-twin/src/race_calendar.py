@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Race calendar: Monte Carlo predictions for a season of races
+
+run_race_calendar() takes the races of a calendar (course profile,
+elevation profile, race date and where race-day fitness comes from) and
+runs the streaming Monte Carlo for all of them concurrently. The athlete
+profile is parsed once and shared by every race (DigitalTwinV32.from_profiles),
+and the results come back as one comparative table.
+
+Fitness sources:
+- a number: fixed race-day fitness
+- (low, high): fitness range sampled per scenario
+- {'ctl': value}: fitness from a CTL value (CTLFitnessTracker.ctl_to_fitness)
+- {'ctl_history': path, 'training_plan': 'moderate'}: latest CTL of a
+  history file projected to the race date (predict_ctl_progression)
+- 'calendar' or {'calendar': race_key}: fitness_target of the race in the
+  athlete's 2026_race_calendar_context (matched by date for 'calendar')
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .ctl_fitness_tracker import CTLFitnessTracker
+from .digital_twin_v32_simulator import DigitalTwinV32
+from .monte_carlo_runner import (
+    DEFAULT_CHUNK_SIZE, aggregate_chunk, checkpoint_cutoffs, chunk_tasks, map_chunks, make_race_options
+)
+from .parallel import SimulationPool
+from .profile_registry import default_registry
+from .scenario_sampler import ScenarioSampler
+from .streaming_stats import MonteCarloAggregator
+
+CALENDAR_CONTEXT = '2026_race_calendar_context'
+
+
+@dataclass
+class CalendarRace:
+    """One race of a calendar"""
+    course_profile: Union[str, Dict]  # Path to the course profile JSON, or the parsed profile
+    elevation_profile: Union[str, List[Dict]]  # Path to an elevation JSON ('profile' list), or the points
+    race_date: str  # YYYY-MM-DD
+    fitness: Union[float, Tuple[float, float], str, Dict]  # Fitness source (see module docstring)
+    name: Optional[str] = None  # Defaults to the course's race_name
+
+
+def run_race_calendar(
+    athlete_profile_path: str,
+    races: Sequence[Union[CalendarRace, tuple]],
+    num_simulations: int = 1000,
+    fitness_spread: float = 0.0,
+    temperature_scenarios: List[Dict] = None,
+    cutoffs: bool = False,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    verbose: bool = True
+) -> pd.DataFrame:
+    """
+    Predict every race of a calendar and compare them in one table.
+
+    Each race runs the same chunked, seeded Monte Carlo as
+    run_monte_carlo_streaming (with a sampler configured for its course),
+    so a race's row matches a separate streaming run with the same seed and
+    fitness range.
+
+    Args:
+        athlete_profile_path: Path to athlete profile JSON
+        races: CalendarRace entries, or (course profile, elevation profile,
+            race date, fitness source[, name]) tuples
+        num_simulations: Simulations per race
+        fitness_spread: Half-width of the fitness range around a fixed
+            race-day fitness
+        temperature_scenarios: Custom temperature scenarios for every race
+            (each course's default weather otherwise)
+        cutoffs: Stop runs that miss a checkpoint cutoff (adds a DNF rate)
+        n_workers: Races run at once in worker processes (one per race by
+            default; 1 runs them in-process one after another)
+        seed: Seed shared by every race
+        chunk_size: Simulations per seeded chunk
+        verbose: Print progress updates
+
+    Returns:
+        DataFrame with one row per race in date order: date, course,
+        distance, fitness and its source, finish-time mean and quantiles,
+        respiratory incidents and (with cutoffs) the DNF rate.
+        DataFrame.attrs['analyses'] keeps each race's full analysis in
+        the analyze_results format.
+    """
+    athlete_profile = default_registry().load(athlete_profile_path)
+    races = sorted(
+        (race if isinstance(race, CalendarRace) else CalendarRace(*race) for race in races),
+        key=lambda race: race.race_date
+    )
+    if not races:
+        raise ValueError("Race calendar is empty")
+
+    tasks = []
+    for race in races:
+        course_profile = _load_profile(race.course_profile)
+        elevation_profile = _load_json(race.elevation_profile)
+        if isinstance(elevation_profile, dict):
+            elevation_profile = elevation_profile['profile']
+        name = race.name or course_profile.get('course_metadata', {}).get('race_name', 'Race')
+        fitness_range, source = race_fitness(athlete_profile, race, fitness_spread)
+        tasks.append((
+            name, course_profile, elevation_profile, fitness_range, source, race.race_date,
+            num_simulations, temperature_scenarios, cutoffs, seed, chunk_size
+        ))
+    names = [task[0] for task in tasks]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Race names must be unique, got {names}")
+
+    if verbose:
+        print(f"Running {num_simulations} simulations for each of {len(races)} races...")
+
+    n_workers = len(tasks) if n_workers is None else n_workers
+    if n_workers > 1:
+        pool = SimulationPool(athlete_profile, min(n_workers, len(tasks)))
+        try:
+            rows = list(pool.map(_calendar_race, tasks))
+        finally:
+            pool.shutdown()
+    else:
+        rows = [_calendar_race(athlete_profile, *task) for task in tasks]
+
+    analyses = {row.pop('analysis_name'): row.pop('analysis') for row in rows}
+    table = pd.DataFrame(rows).set_index('Race')
+    table.attrs['analyses'] = analyses
+
+    if verbose:
+        print(f"✓ {len(races)} races complete")
+    return table
+
+
+def race_fitness(
+    athlete_profile: Dict,
+    race: CalendarRace,
+    fitness_spread: float = 0.0
+) -> Tuple[Tuple[float, float], str]:
+    """
+    Race-day fitness range and a label of where it came from.
+
+    Raises:
+        ValueError: for an unknown fitness source or a calendar race that
+            is not in the athlete profile
+    """
+    source = race.fitness
+    tracker = CTLFitnessTracker()
+    if isinstance(source, (int, float)):
+        fitness, label = float(source), 'fixed'
+    elif isinstance(source, (tuple, list)) and len(source) == 2:
+        return (float(source[0]), float(source[1])), 'range'
+    elif source == 'calendar' or (isinstance(source, dict) and 'calendar' in source):
+        calendar = athlete_profile.get(CALENDAR_CONTEXT, {})
+        if source == 'calendar':
+            matches = [key for key, entry in calendar.items()
+                       if isinstance(entry, dict) and entry.get('date') == race.race_date]
+            if not matches:
+                raise ValueError(f"No race on {race.race_date} in the athlete's {CALENDAR_CONTEXT}")
+            key = matches[0]
+        else:
+            key = source['calendar']
+        if 'fitness_target' not in calendar.get(key, {}):
+            raise ValueError(f"No fitness_target for '{key}' in the athlete's {CALENDAR_CONTEXT}")
+        fitness, label = float(calendar[key]['fitness_target']), f'calendar:{key}'
+    elif isinstance(source, dict) and 'ctl' in source:
+        fitness, label = tracker.ctl_to_fitness(source['ctl']), f"ctl:{source['ctl']:g}"
+    elif isinstance(source, dict) and 'ctl_history' in source:
+        tracker.load_history(source['ctl_history'])
+        latest = tracker.get_latest_ctl()
+        if latest is None:
+            raise ValueError(f"No CTL records in {source['ctl_history']}")
+        plan = source.get('training_plan', 'moderate')
+        progression = tracker.predict_ctl_progression(latest[1], latest[0], race.race_date, plan)
+        fitness = progression['race_day_fitness']
+        label = f"ctl {latest[1]:g} on {latest[0]} -> {progression['race_day_ctl']:g} ({plan})"
+    else:
+        raise ValueError(f"Unknown fitness source: {source!r}")
+    return (fitness - fitness_spread, fitness + fitness_spread), label
+
+
+def _load_profile(source: Union[str, Dict]) -> Dict:
+    """Load a profile file through the process-wide registry, or pass a parsed profile through"""
+    if not isinstance(source, str):
+        return source
+    return default_registry().load(source)
+
+
+def _load_json(source: Union[str, Dict, List]):
+    """Parse a JSON file, or pass an already parsed object through"""
+    if not isinstance(source, str):
+        return source
+    with open(source, 'r') as f:
+        return json.load(f)
+
+
+def _calendar_race(
+    athlete_profile: Dict,
+    name: str,
+    course_profile: Dict,
+    elevation_profile: List[Dict],
+    fitness_range: Tuple[float, float],
+    fitness_source: str,
+    race_date: str,
+    num_simulations: int,
+    temperature_scenarios: Optional[List[Dict]],
+    cutoffs: bool,
+    seed: Optional[int],
+    chunk_size: int
+) -> Dict:
+    """Streaming Monte Carlo of one race, reduced to its table row"""
+    simulator = DigitalTwinV32.from_profiles(athlete_profile, course_profile)
+    sampler = ScenarioSampler.for_course(
+        course_profile, weather_scenarios=temperature_scenarios, fitness_range=fitness_range
+    )
+    root_seed = np.random.SeedSequence(seed)
+    plan = simulator.compile_plan(elevation_profile)
+    race_options = make_race_options(cutoffs, None)
+    aggregator = MonteCarloAggregator(seed=root_seed, checkpoint_cutoffs=checkpoint_cutoffs(plan))
+    tasks = [
+        task + (None, None, race_options)
+        for task in chunk_tasks(elevation_profile, num_simulations, chunk_size, root_seed, sampler)
+    ]
+    for partial in map_chunks(simulator, aggregate_chunk, tasks, None):
+        aggregator.merge(partial)
+    analysis = aggregator.result()
+
+    times = analysis['time_statistics']
+    respiratory = analysis['respiratory_statistics']
+    row = {
+        'Race': name,
+        'Date': race_date,
+        'Course': course_profile.get('course_metadata', {}).get('race_id'),
+        'Distance (km)': plan.total_distance_km,
+        'Fitness': float(np.mean(fitness_range)),
+        'Fitness Source': fitness_source,
+        'Mean (hours)': times['mean'],
+        'P10 (hours)': times['p10'],
+        'P50 (hours)': times['median'],
+        'P90 (hours)': times['p90'],
+        'P50 Time': simulator.format_time(times['median']),
+        'Mean Incidents': respiratory['mean_incidents'],
+        'Zero Incident Rate': respiratory['zero_incident_rate'],
+    }
+    if 'dnf_statistics' in analysis:
+        row['DNF Rate'] = analysis['dnf_statistics']['dnf_rate']
+    row['analysis_name'] = name
+    row['analysis'] = analysis
+    return row
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Lazy segment-level replay of Monte Carlo runs
+
+Bulk runs only keep summary rows. Every row records the chunk and offset
+that generated it, and the result attrs keep the seed, chunk size and
+sampler hash, so any single run can be re-simulated later with full
+segment detail. The chunk is re-simulated exactly as in the bulk run, so
+the replayed numbers are bit-identical to the summary row.
+"""
+
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .course_plan import content_hash
+from .digital_twin_v32_simulator import DigitalTwinV32, SegmentView
+from .monte_carlo_runner import DEFAULT_CHUNK_SIZE, sample_chunk, stop_rule_kwargs, chunk_seed
+from .profile_registry import load_simulator
+from .results_store import ResultStore
+from .scenario_sampler import ScenarioSampler
+
+
+class RunReplayer:
+    """
+    Re-simulates individual Monte Carlo runs with full segment output.
+
+    Build one with RunReplayer.from_results() for a result DataFrame or
+    ResultStore, then call replay(run_id) with a 'Simulation' number.
+    """
+
+    def __init__(
+        self,
+        elevation_profile: List[Dict],
+        athlete_profile_path: str,
+        course_profile_path: str,
+        seed: int,
+        num_simulations: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        sampler: Optional[ScenarioSampler] = None,
+        fitness_range: tuple = (0.95, 1.15),
+        temperature_scenarios: List[Dict] = None,
+        sampling_scheme: str = 'mc',
+        race_options: Optional[Dict] = None
+    ):
+        """
+        Args:
+            elevation_profile: Course elevation data of the original job
+            athlete_profile_path: Path to athlete profile JSON
+            course_profile_path: Path to course profile JSON
+            seed: Seed entropy of the original job (results.attrs['seed'])
+            num_simulations: Number of runs in the original job
+            chunk_size: Chunk size of the original job
+            sampler: ScenarioSampler of the original job; otherwise built from
+                fitness_range, temperature_scenarios and sampling_scheme as
+                the runners do
+            race_options: Stop rules of the original job
+                (results.attrs['race_options'])
+        """
+        self.elevation_profile = elevation_profile
+        self.simulator = load_simulator(athlete_profile_path, course_profile_path)
+        self.root_seed = np.random.SeedSequence(seed)
+        self.num_simulations = num_simulations
+        self.chunk_size = chunk_size
+        if sampler is None:
+            sampler = ScenarioSampler.for_course(
+                self.simulator.course_profile,
+                weather_scenarios=temperature_scenarios,
+                fitness_range=fitness_range,
+                scheme=sampling_scheme
+            )
+        self.sampler = sampler
+        self.race_options = dict(race_options or {})
+
+    @classmethod
+    def from_results(
+        cls,
+        results: Union[pd.DataFrame, ResultStore],
+        elevation_profile: List[Dict],
+        athlete_profile_path: str,
+        course_profile_path: str,
+        sampler: Optional[ScenarioSampler] = None,
+        fitness_range: tuple = (0.95, 1.15),
+        temperature_scenarios: List[Dict] = None
+    ) -> 'RunReplayer':
+        """
+        Replayer for the job that produced a result DataFrame or ResultStore.
+
+        Raises:
+            ValueError: the results carry no replay metadata, or the sampler
+                differs from the one the job used
+        """
+        attrs = results.attrs
+        missing = [key for key in ('seed', 'chunk_size', 'num_simulations') if key not in attrs]
+        if missing:
+            raise ValueError(f"Results have no replay metadata ({', '.join(missing)} missing from attrs)")
+        replayer = cls(
+            elevation_profile, athlete_profile_path, course_profile_path,
+            seed=attrs['seed'],
+            num_simulations=attrs['num_simulations'],
+            chunk_size=attrs['chunk_size'],
+            sampler=sampler,
+            fitness_range=fitness_range,
+            temperature_scenarios=temperature_scenarios,
+            sampling_scheme=attrs.get('sampling_scheme', 'mc'),
+            race_options=attrs.get('race_options')
+        )
+        if 'sampler_hash' in attrs and content_hash(vars(replayer.sampler)) != attrs['sampler_hash']:
+            raise ValueError("Sampler differs from the one that produced the results; pass the original sampler")
+        return replayer
+
+    def locate(self, run_id: int) -> tuple:
+        """(chunk, offset) of a 1-based 'Simulation' number"""
+        if not 1 <= run_id <= self.num_simulations:
+            raise ValueError(f"Run {run_id} is outside 1..{self.num_simulations}")
+        return divmod(run_id - 1, self.chunk_size)
+
+    def replay(self, run_id: int) -> Dict:
+        """
+        Re-simulate one run with full segment detail.
+
+        Returns:
+            Dictionary in the simulate_race format ('segments', 'summary',
+            'respiratory_incidents', 'conditions') plus 'run' with the
+            simulation number, chunk and offset. A run stopped by a cutoff
+            only has the segments it completed.
+        """
+        return self.replay_many([run_id])[run_id]
+
+    def replay_many(self, run_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Replay several runs, sampling each chunk involved only once"""
+        by_chunk: Dict[int, List[tuple]] = {}
+        for run_id in run_ids:
+            chunk, offset = self.locate(int(run_id))
+            by_chunk.setdefault(chunk, []).append((int(run_id), offset))
+
+        replays = {}
+        for chunk, runs in by_chunk.items():
+            num_runs = min(self.chunk_size, self.num_simulations - chunk * self.chunk_size)
+            plan, scenarios, draws, _ = sample_chunk(
+                self.simulator, self.elevation_profile, num_runs, chunk_seed(self.root_seed, chunk), self.sampler
+            )
+            # The chunk is sampled whole to reproduce its RNG stream, but
+            # only the requested rows are simulated (runs are independent)
+            offsets = [offset for _, offset in runs]
+            scenarios, draws = scenarios[offsets], draws[offsets]
+            batch = self.simulator.simulate_batch(
+                self.elevation_profile, scenarios, scenarios.pacing_strategy,
+                draws=draws, plan=plan, detail='columnar', **stop_rule_kwargs(self.race_options)
+            )
+            for row, (run_id, offset) in enumerate(runs):
+                replays[run_id] = _run_result(self.simulator, batch, scenarios, row)
+                replays[run_id]['run'] = {'simulation': run_id, 'chunk': chunk, 'offset': offset}
+        return replays
+
+
+def _run_result(simulator: DigitalTwinV32, batch: Dict, scenarios, offset: int) -> Dict:
+    """simulate_race-style result for one row of a columnar batch"""
+    completed = np.count_nonzero(~np.isnan(batch['columns']['cumulative_time_hours'][offset]))
+    segments = SegmentView.from_batch(batch['columns'], offset).to_list()[:completed]
+    summary = {name: values[offset] for name, values in batch['summary'].items()}
+    summary = {
+        name: value.tolist() if isinstance(value, (np.generic, np.ndarray)) else value
+        for name, value in summary.items()
+    }
+    summary['total_time_formatted'] = simulator.format_time(summary['total_time_hours'])
+
+    respiratory_incidents = [
+        {
+            'distance_km': segment['distance_km'],
+            'impact': segment['respiratory_multiplier'],
+            'hr_estimate': segment['hr_estimate'],
+            'temperature': segment['temperature_c'],
+            'gradient': segment['gradient_pct']
+        }
+        for segment, incident in zip(segments, batch['incidents'][offset].tolist())
+        if incident
+    ]
+    return {
+        'segments': segments,
+        'summary': summary,
+        'respiratory_incidents': respiratory_incidents,
+        'conditions': scenarios.scenario(offset)
+    }
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Compact Monte Carlo result frames
+
+Result frames use categorical dtypes for the string columns, float32 for
+inputs and secondary outputs, and keep finish times as hours only; the
+HH:MM:SS strings are formatted on demand with finish_time_strings() or
+with_finish_times(). to_arrow()/write_parquet() export a frame without going
+through CSV (pyarrow is optional and only imported when used).
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columns stored as pandas categoricals, with the ScenarioBatch field they come from
+CATEGORICAL_COLUMNS = {
+    'Pacing Strategy': 'pacing_strategy',
+    'Precipitation': 'precipitation',
+    'Pollen Level': 'pollen_level',
+    'Weather Scenario': 'weather_scenario',
+}
+
+# Outcome column with the course checkpoints as categories (runs with cutoffs only)
+CHECKPOINT_COLUMN = 'DNF Checkpoint'
+
+# Per-checkpoint arrival and per-key-segment split columns (runs with splits only)
+ARRIVAL_SUFFIX = ' Arrival (hours)'
+SPLIT_SUFFIX = ' Split (hours)'
+
+# Columns where float32 (about 7 significant digits) is ample
+FLOAT32_COLUMNS = (
+    'Aid Station Time (min)', 'Avg Speed (km/h)', 'Temperature (°C)', 'Fitness Level',
+    'Calories/hr', 'Fluids (ml/hr)', 'Worst Respiratory', 'Hiking %', 'Technical Multiplier'
+)
+
+INTEGER_COLUMNS = {
+    'Simulation': np.int32, 'Chunk': np.int32, 'Chunk Offset': np.int32, 'Respiratory Incidents': np.int16
+}
+
+
+def result_categories(sampler) -> Dict[str, List[str]]:
+    """Category lists of the categorical result columns for a ScenarioSampler"""
+    categories = sampler.categories()
+    return {column: categories[field] for column, field in CATEGORICAL_COLUMNS.items()}
+
+
+def compact_results(results_df: pd.DataFrame, categories: Optional[Dict[str, List[str]]] = None) -> pd.DataFrame:
+    """
+    Convert a result frame to the compact dtypes.
+
+    Args:
+        results_df: Monte Carlo result frame
+        categories: Category list per categorical column (e.g. from
+            result_categories()); chunks built with the same lists
+            concatenate without falling back to object dtype
+
+    Returns:
+        New DataFrame with compact dtypes (a legacy 'Finish Time' string
+        column is dropped)
+    """
+    categories = categories or {}
+    columns = {}
+    for name, values in results_df.items():
+        if name == 'Finish Time':
+            continue
+        if name in CATEGORICAL_COLUMNS or name == CHECKPOINT_COLUMN:
+            columns[name] = pd.Categorical(values, categories=categories.get(name))
+        elif name in FLOAT32_COLUMNS or name.endswith((ARRIVAL_SUFFIX, SPLIT_SUFFIX)):
+            columns[name] = values.to_numpy(dtype=np.float32)
+        elif name in INTEGER_COLUMNS:
+            columns[name] = values.to_numpy(dtype=INTEGER_COLUMNS[name])
+        else:
+            columns[name] = values.to_numpy()
+    compact = pd.DataFrame(columns)
+    compact.attrs.update(results_df.attrs)
+    return compact
+
+
+def finish_time_strings(hours) -> np.ndarray:
+    """Format finish times in hours as HH:MM:SS (same truncation as format_time)"""
+    total_seconds = (np.asarray(hours, dtype=float) * 3600).astype(np.int64)
+    hh = np.char.zfill((total_seconds // 3600).astype(str), 2)
+    mm = np.char.zfill(((total_seconds % 3600) // 60).astype(str), 2)
+    ss = np.char.zfill((total_seconds % 60).astype(str), 2)
+    return np.char.add(np.char.add(np.char.add(np.char.add(hh, ':'), mm), ':'), ss)
+
+
+def with_finish_times(results_df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of a result frame with the formatted 'Finish Time' column restored"""
+    formatted = results_df.copy()
+    formatted.insert(
+        min(2, len(formatted.columns)), 'Finish Time', finish_time_strings(results_df['Time (hours)'])
+    )
+    return formatted
+
+
+def to_arrow(results_df: pd.DataFrame):
+    """
+    Convert a result frame to a pyarrow Table.
+
+    Numeric columns are shared with the frame without copying and
+    categoricals become dictionary-encoded columns.
+
+    Raises:
+        ImportError: pyarrow is not installed
+    """
+    pa = _import_pyarrow()
+    return pa.Table.from_pandas(results_df, preserve_index=False)
+
+
+def write_parquet(results_df: pd.DataFrame, path: str, compression: str = 'zstd'):
+    """
+    Write a result frame to Parquet (read back with pandas.read_parquet).
+
+    Raises:
+        ImportError: pyarrow is not installed
+    """
+    _import_pyarrow()
+    import pyarrow.parquet as pq
+    pq.write_table(to_arrow(results_df), path, compression=compression)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError("Arrow/Parquet export requires pyarrow (pip install pyarrow)") from exc
+    return pyarrow
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Out-of-core Monte Carlo result store
+
+Results are kept on disk as shards of fixed-width columns, one .npy file
+per column, plus a small JSON manifest. Categorical columns are stored as
+integer codes with their categories in the manifest. Columns are read
+through numpy memory maps, so scans and analyze_results only page in the
+columns they touch and never hold more than one shard in memory.
+
+    store_dir/
+        manifest.json
+        shard_000000/
+            c00.npy  c01.npy  ...
+        shard_000001/
+        ...
+"""
+
+import json
+import os
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .results_frame import ARRIVAL_SUFFIX, SPLIT_SUFFIX
+from .streaming_stats import MonteCarloAggregator
+
+MANIFEST_FILE = 'manifest.json'
+
+# Short names usable in scan() expressions
+COLUMN_ALIASES = {
+    'simulation': 'Simulation',
+    'chunk': 'Chunk',
+    'offset': 'Chunk Offset',
+    'pacing': 'Pacing Strategy',
+    'time': 'Time (hours)',
+    'moving_time': 'Moving Time (hours)',
+    'aid_time': 'Aid Station Time (min)',
+    'speed': 'Avg Speed (km/h)',
+    'temp': 'Temperature (°C)',
+    'precip': 'Precipitation',
+    'fitness': 'Fitness Level',
+    'calories': 'Calories/hr',
+    'fluids': 'Fluids (ml/hr)',
+    'pollen': 'Pollen Level',
+    'incidents': 'Respiratory Incidents',
+    'worst_respiratory': 'Worst Respiratory',
+    'hiking': 'Hiking %',
+    'technical': 'Technical Multiplier',
+    'weather': 'Weather Scenario',
+    'weight': 'IS Weight',
+    'dnf': 'DNF',
+    'dnf_checkpoint': 'DNF Checkpoint',
+}
+
+# Columns MonteCarloAggregator needs (the DNF columns only exist for runs with cutoffs)
+ANALYSIS_COLUMNS = (
+    'Time (hours)', 'Respiratory Incidents', 'Pacing Strategy', 'Weather Scenario',
+    'Fitness Level', 'Temperature (°C)', 'DNF', 'DNF Checkpoint'
+)
+
+
+class ResultStore:
+    """
+    Memory-mapped, append-only store of Monte Carlo result shards.
+
+    Open an existing store with ResultStore(directory) or start one with
+    ResultStore.create(directory).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE), 'r') as f:
+            self.manifest = json.load(f)
+
+    @classmethod
+    def create(cls, directory: str, attrs: Optional[Dict] = None) -> 'ResultStore':
+        """Create an empty store (the directory must not hold a store already)"""
+        path = os.path.join(directory, MANIFEST_FILE)
+        if os.path.exists(path):
+            raise ValueError(f"A result store already exists in {directory}")
+        os.makedirs(directory, exist_ok=True)
+        _write_json(path, {'columns': None, 'shards': [], 'attrs': attrs or {}})
+        return cls(directory)
+
+    @staticmethod
+    def write_shard(directory: str, shard: int, chunk_df: pd.DataFrame) -> Dict:
+        """
+        Write one result chunk as a shard (safe to call from worker processes).
+
+        Returns:
+            Shard metadata to pass to add_shard()
+        """
+        name = f'shard_{shard:06d}'
+        shard_dir = os.path.join(directory, name)
+        os.makedirs(shard_dir, exist_ok=True)
+        columns = []
+        for i, column in enumerate(chunk_df.columns):
+            values = chunk_df[column]
+            spec = {'name': column}
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                spec['categories'] = [str(c) for c in values.cat.categories]
+                values = values.cat.codes
+            array = values.to_numpy()
+            if array.dtype == object:
+                raise ValueError(f"Column {column} is not fixed-width; store it as a categorical")
+            spec['dtype'] = array.dtype.str
+            np.save(os.path.join(shard_dir, f'c{i:02d}.npy'), array)
+            columns.append(spec)
+        return {'name': name, 'rows': len(chunk_df), 'columns': columns}
+
+    def add_shard(self, shard: Dict):
+        """Record a written shard in the manifest"""
+        if self.manifest['columns'] is None:
+            self.manifest['columns'] = shard['columns']
+        elif shard['columns'] != self.manifest['columns']:
+            raise ValueError(f"Shard {shard['name']} does not match the store's column layout")
+        self.manifest['shards'].append({'name': shard['name'], 'rows': shard['rows']})
+        _write_json(os.path.join(self.directory, MANIFEST_FILE), self.manifest)
+
+    def append(self, chunk_df: pd.DataFrame):
+        """Write a result chunk and record it"""
+        self.add_shard(self.write_shard(self.directory, len(self.manifest['shards']), chunk_df))
+
+    def __len__(self) -> int:
+        return sum(shard['rows'] for shard in self.manifest['shards'])
+
+    @property
+    def columns(self) -> List[str]:
+        return [spec['name'] for spec in self.manifest['columns'] or []]
+
+    @property
+    def attrs(self) -> Dict:
+        return self.manifest['attrs']
+
+    def _spec(self, column: str) -> tuple:
+        column = COLUMN_ALIASES.get(column, column)
+        for i, spec in enumerate(self.manifest['columns'] or []):
+            if spec['name'] == column:
+                return i, spec
+        raise KeyError(column)
+
+    def iter_column(self, column: str) -> Iterator[np.ndarray]:
+        """Memory-mapped arrays of one column, shard by shard (categoricals as codes)"""
+        i, _ = self._spec(column)
+        for shard in self.manifest['shards']:
+            yield np.load(os.path.join(self.directory, shard['name'], f'c{i:02d}.npy'), mmap_mode='r')
+
+    def column(self, column: str) -> Union[np.ndarray, pd.Categorical]:
+        """One column over every shard (a Categorical for categorical columns)"""
+        _, spec = self._spec(column)
+        values = np.concatenate(list(self.iter_column(column)))
+        if 'categories' in spec:
+            return pd.Categorical.from_codes(values, spec['categories'])
+        return values
+
+    def scan(
+        self,
+        where: Union[str, Callable[[pd.DataFrame], np.ndarray], None] = None,
+        columns: Optional[Sequence[str]] = None,
+        chunk_rows: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Filtered scan, one DataFrame per shard (or per chunk_rows slice).
+
+        Args:
+            where: Row filter. Either a pandas expression using full column
+                names (in backticks unless they are plain identifiers, such
+                as DNF) or the COLUMN_ALIASES short names, e.g.
+                "fitness > 1.1 and temp < 8", or a callable taking a frame
+                and returning a boolean mask
+            columns: Columns to return (all when omitted)
+            chunk_rows: Maximum rows read per step
+
+        Yields:
+            DataFrames of the matching rows
+        """
+        columns = [COLUMN_ALIASES.get(c, c) for c in (columns or self.columns)]
+        filter_columns = _expression_columns(where, self.columns) if isinstance(where, str) else self.columns
+        if where is None:
+            filter_columns = []
+
+        for index, shard in enumerate(self.manifest['shards']):
+            step = chunk_rows or shard['rows']
+            for start in range(0, shard['rows'], step):
+                rows = slice(start, min(start + step, shard['rows']))
+                if where is None:
+                    yield self._read(index, columns, rows)
+                    continue
+                frame = self._read(index, filter_columns, rows)
+                if isinstance(where, str):
+                    mask = _alias_frame(frame).eval(where).to_numpy(dtype=bool)
+                else:
+                    mask = np.asarray(where(frame), dtype=bool)
+                if mask.any():
+                    yield self._read(index, columns, rows, mask)
+
+    def _read(self, shard_index: int, columns: Sequence[str], rows: slice, mask: np.ndarray = None) -> pd.DataFrame:
+        shard = self.manifest['shards'][shard_index]
+        data = {}
+        for column in columns:
+            i, spec = self._spec(column)
+            values = np.load(os.path.join(self.directory, shard['name'], f'c{i:02d}.npy'), mmap_mode='r')[rows]
+            values = np.asarray(values[mask] if mask is not None else values)
+            if 'categories' in spec:
+                values = pd.Categorical.from_codes(values, spec['categories'])
+            data[spec['name']] = values
+        return pd.DataFrame(data)
+
+    def to_dataframe(self, where=None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Materialise (a filtered subset of) the store as one DataFrame"""
+        frames = list(self.scan(where, columns))
+        if not frames:
+            columns = [COLUMN_ALIASES.get(c, c) for c in (columns or self.columns)]
+            if not self.manifest['shards']:
+                # Nothing written yet, so there are no column types to read
+                return pd.DataFrame(columns=columns)
+            return self._read(0, columns, slice(0, 0))
+        return pd.concat(frames, ignore_index=True)
+
+    def analyze(self, target_min_hours: float = None, target_max_hours: float = None) -> Dict:
+        """analyze_results over the store, one shard at a time"""
+        aggregator = MonteCarloAggregator(
+            target_min_hours, target_max_hours, seed=self.attrs.get('seed'),
+            checkpoint_cutoffs=self.attrs.get('checkpoint_cutoffs')
+        )
+        columns = [
+            column for column in self.columns
+            if column in ANALYSIS_COLUMNS or column.endswith((ARRIVAL_SUFFIX, SPLIT_SUFFIX))
+        ]
+        for frame in self.scan(columns=columns):
+            aggregator.update(frame)
+        return aggregator.result()
+
+
+def _expression_columns(expression: str, columns: List[str]) -> List[str]:
+    """Full names of the store columns a scan expression refers to"""
+    quoted = re.findall(r'`([^`]+)`', expression)
+    names = re.findall(r'[A-Za-z_]\w*', re.sub(r'`[^`]+`|"[^"]*"|\'[^\']*\'', ' ', expression))
+    referenced = set(quoted) | {COLUMN_ALIASES.get(name, name) for name in names}
+    return [column for column in columns if column in referenced]
+
+
+def _alias_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Add the short alias names next to the full column names"""
+    aliased = frame.copy()
+    for alias, column in COLUMN_ALIASES.items():
+        if column in frame.columns:
+            aliased[alias] = frame[column]
+    return aliased
+
+
+def _write_json(path: str, data: Dict):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
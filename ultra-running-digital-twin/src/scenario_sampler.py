@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Vectorized scenario sampling for Monte Carlo simulations
+
+Draws all N scenarios at once from a numpy.random.Generator into a
+ScenarioBatch (struct-of-arrays) instead of building dataclasses one
+simulation at a time. The uniform design behind the draws can be plain
+pseudo-random, quasi-random or variance-reduced (see SAMPLING_SCHEMES).
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import beta, qmc
+
+from .digital_twin_v32_simulator import RaceDraws, ScenarioBatch
+
+# Pacing strategies sampled by the Monte Carlo runners
+PACING_STRATEGIES = [
+    'conservative', 'moderate', 'aggressive', 'even', 'negative_split', 'race_mode'
+]
+
+# Pollen levels, drawn with equal probability (75% low, 25% medium)
+POLLEN_LEVELS = ['low', 'low', 'low', 'medium']
+
+# Weather mixture behind create_default_weather_scenarios
+DEFAULT_WEATHER_MIXTURE = [
+    {'name': 'Typical March', 'weight': 0.4, 'temp_mean': 11, 'temp_std': 2.5,
+     'temp_min': 4, 'temp_max': 16, 'light_rain_probability': 0.25},
+    {'name': 'Cold Day', 'weight': 0.2, 'temp_mean': 7, 'temp_std': 2,
+     'temp_min': 2, 'temp_max': 10, 'light_rain_probability': 0.0},
+    {'name': 'Optimal', 'weight': 0.3, 'temp_mean': 14, 'temp_std': 1.5,
+     'temp_min': 12, 'temp_max': 16, 'light_rain_probability': 0.0},
+    {'name': 'Warm Day', 'weight': 0.1, 'temp_mean': 17, 'temp_std': 2,
+     'temp_min': 15, 'temp_max': 20, 'light_rain_probability': 0.0},
+]
+
+# Columns of the uniform design matrix consumed by ScenarioSampler.transform
+SAMPLE_DIMENSIONS = (
+    'weather', 'temperature', 'precipitation', 'altitude', 'humidity', 'wind',
+    'calories', 'fluids', 'electrolytes', 'fitness', 'pacing', 'pollen'
+)
+
+# Designs for the uniform matrix:
+#   'mc'          plain pseudo-random
+#   'lhs'         Latin hypercube (every dimension stratified into n bins)
+#   'sobol'       scrambled Sobol sequence (balanced for power-of-two chunk sizes)
+#   'antithetic'  pairs u / 1 - u, including the race draws
+#   'stratified'  weather components allocated in proportion to their weight
+SAMPLING_SCHEMES = ('mc', 'lhs', 'sobol', 'antithetic', 'stratified')
+
+# Dimensions drawn as equal-or-weighted categories (tilted by per-category multipliers)
+CATEGORICAL_DIMENSIONS = ('weather', 'pacing', 'pollen')
+
+
+class ScenarioSampler:
+    """
+    Draws Monte Carlo scenarios as a ScenarioBatch.
+
+    Every scenario is a deterministic transform of one row of uniforms
+    (see SAMPLE_DIMENSIONS), so the same sampler can be driven by plain
+    pseudo-random numbers or by any other design on the unit hypercube.
+    Categorical draws (weather, pacing, precipitation, pollen) are inverse-CDF
+    transforms of their own column, so LHS, Sobol and antithetic designs
+    balance them as well.
+
+    With a tilt, design uniforms are first mapped through an importance
+    sampling proposal (see propose()) and every scenario gets a likelihood
+    ratio weight from sample_weighted().
+    """
+
+    def __init__(
+        self,
+        weather_scenarios: Optional[List[Dict]] = None,
+        weather_mixture: Optional[List[Dict]] = None,
+        fitness_range: Tuple[float, float] = (0.95, 1.15),
+        altitude_band_m: Tuple[float, float] = (150, 700),
+        humidity_range: Tuple[float, float] = (50, 80),
+        wind_range_kmh: Tuple[float, float] = (0, 20),
+        calories_range: Tuple[float, float] = (250, 290),
+        fluid_range_ml: Tuple[float, float] = (500, 650),
+        electrolytes_range_mg: Tuple[float, float] = (450, 600),
+        pacing_strategies: Sequence[str] = tuple(PACING_STRATEGIES),
+        pollen_levels: Sequence[str] = tuple(POLLEN_LEVELS),
+        scheme: str = 'mc',
+        tilt: Optional[Dict[str, object]] = None
+    ):
+        """
+        Args:
+            weather_scenarios: Explicit weather scenario dicts ('name', 'temp_c',
+                'precipitation'), drawn with equal probability. Takes precedence
+                over weather_mixture.
+            weather_mixture: Parametric weather components (see DEFAULT_WEATHER_MIXTURE)
+            fitness_range: (min, max) fitness levels
+            altitude_band_m: (min, max) altitude
+            humidity_range: (min, max) humidity percentage
+            wind_range_kmh: (min, max) wind speed
+            calories_range: (min, max) calories per hour
+            fluid_range_ml: (min, max) fluid ml per hour
+            electrolytes_range_mg: (min, max) electrolytes mg per hour
+            pacing_strategies: Pacing strategies drawn with equal probability
+            pollen_levels: Pollen levels drawn with equal probability
+            scheme: Uniform design, one of SAMPLING_SCHEMES
+            tilt: Importance sampling proposal per SAMPLE_DIMENSIONS entry:
+                (a, b) draws that column from Beta(a, b) instead of U(0, 1)
+                (a < 1 favours low values, b < 1 high values), and for the
+                CATEGORICAL_DIMENSIONS a {category: multiplier} dict scales
+                category probabilities (every value must be > 0)
+        """
+        if scheme not in SAMPLING_SCHEMES:
+            raise ValueError(f"Unknown sampling scheme: {scheme}")
+        for name, spec in (tilt or {}).items():
+            if name not in SAMPLE_DIMENSIONS:
+                raise ValueError(f"Unknown sample dimension: {name}")
+            if isinstance(spec, dict) and name not in CATEGORICAL_DIMENSIONS:
+                raise ValueError(f"Category multipliers only apply to {', '.join(CATEGORICAL_DIMENSIONS)}")
+            # A zero multiplier would never propose a category the target can draw
+            values = spec.values() if isinstance(spec, dict) else spec
+            if not all(np.isfinite(value) and value > 0 for value in values):
+                raise ValueError(f"Tilt for {name} must be positive and finite, got {spec}")
+        self.weather_scenarios = weather_scenarios
+        self.weather_mixture = weather_mixture if weather_mixture is not None else DEFAULT_WEATHER_MIXTURE
+        self.fitness_range = fitness_range
+        self.altitude_band_m = altitude_band_m
+        self.humidity_range = humidity_range
+        self.wind_range_kmh = wind_range_kmh
+        self.calories_range = calories_range
+        self.fluid_range_ml = fluid_range_ml
+        self.electrolytes_range_mg = electrolytes_range_mg
+        self.pacing_strategies = np.array(pacing_strategies)
+        self.pollen_levels = np.array(pollen_levels)
+        self.scheme = scheme
+        self.tilt = tilt
+
+    @classmethod
+    def for_course(cls, course_profile: Dict, **overrides) -> 'ScenarioSampler':
+        """
+        Configure a sampler from a course profile's environment_profile.
+
+        Altitude comes from altitude_band_m and wind from wind_band_kmh (when
+        present); any keyword argument overrides the course value.
+        """
+        environment = course_profile['environment_profile']
+        config = {'altitude_band_m': tuple(environment['altitude_band_m'])}
+        if 'wind_band_kmh' in environment:
+            config['wind_range_kmh'] = tuple(environment['wind_band_kmh'])
+        config.update(overrides)
+        return cls(**config)
+
+    @property
+    def dimensions(self) -> int:
+        return len(SAMPLE_DIMENSIONS)
+
+    def categories(self) -> Dict[str, List[str]]:
+        """Every value each categorical ScenarioBatch field can take"""
+        if self.weather_scenarios is not None:
+            names = [w['name'] for w in self.weather_scenarios]
+            precipitation = [w.get('precipitation', 'dry') for w in self.weather_scenarios]
+        else:
+            names = [c['name'] for c in self.weather_mixture]
+            precipitation = ['dry', 'light_rain']
+        return {
+            'pacing_strategy': _unique(self.pacing_strategies),
+            'precipitation': _unique(precipitation),
+            'pollen_level': _unique(self.pollen_levels),
+            'weather_scenario': _unique(names),
+        }
+
+    def sample(self, num_scenarios: int, rng: np.random.Generator) -> ScenarioBatch:
+        """Draw num_scenarios scenarios in one pass"""
+        return self.sample_weighted(num_scenarios, rng)[0]
+
+    def sample_weighted(self, num_scenarios: int, rng: np.random.Generator) -> Tuple[ScenarioBatch, np.ndarray]:
+        """Draw scenarios with their likelihood ratio weights (all 1 without a tilt)"""
+        u, weights = self.propose(self.design(num_scenarios, rng))
+        return self.transform(u), weights
+
+    def propose(self, u: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Map design uniforms through the tilted proposal.
+
+        Returns:
+            (uniforms for transform(), likelihood ratio target / proposal)
+        """
+        if not self.tilt:
+            return u, np.ones(len(u))
+        u = u.copy()
+        log_ratio = np.zeros(len(u))
+        for name, spec in self.tilt.items():
+            j = SAMPLE_DIMENSIONS.index(name)
+            if isinstance(spec, dict):
+                labels, p = self._category_slots(name)
+                q = p * np.array([spec.get(label, 1.0) for label in labels], dtype=float)
+                q = q / q.sum()
+                # Piecewise-linear map from proposal CDF to target CDF
+                p_edges = np.concatenate([[0.0], np.cumsum(p)])
+                q_edges = np.concatenate([[0.0], np.cumsum(q)])
+                k = np.clip(np.searchsorted(q_edges, u[:, j], side='right') - 1, 0, len(p) - 1)
+                u[:, j] = p_edges[k] + (u[:, j] - q_edges[k]) / q[k] * p[k]
+                log_ratio += np.log(p[k] / q[k])
+            else:
+                a, b = spec
+                u[:, j] = beta.ppf(u[:, j], a, b)
+                log_ratio -= beta.logpdf(u[:, j], a, b)
+        return u, np.exp(log_ratio)
+
+    def _category_slots(self, name: str) -> Tuple[List[str], np.ndarray]:
+        """Labels and target probabilities of the slots of a categorical dimension"""
+        if name == 'weather':
+            if self.weather_scenarios is not None:
+                labels = [w['name'] for w in self.weather_scenarios]
+                weights = np.ones(len(labels))
+            else:
+                labels = [c['name'] for c in self.weather_mixture]
+                weights = np.array([c['weight'] for c in self.weather_mixture], dtype=float)
+        elif name == 'pacing':
+            labels = [str(p) for p in self.pacing_strategies]
+            weights = np.ones(len(labels))
+        else:
+            labels = [str(p) for p in self.pollen_levels]
+            weights = np.ones(len(labels))
+        return labels, weights / weights.sum()
+
+    def sample_race_draws(self, num_scenarios: int, num_segments: int, rng: np.random.Generator) -> RaceDraws:
+        """
+        Race-day draws to go with sample().
+
+        The antithetic scheme mirrors these too (every race draw is a
+        uniform, paired u / 1 - u); every other scheme uses plain
+        RaceDraws.sample.
+        """
+        if self.scheme != 'antithetic':
+            return RaceDraws.sample(rng, num_scenarios, num_segments)
+        half = RaceDraws.sample(rng, -(-num_scenarios // 2), num_segments)
+        return RaceDraws(
+            incident_uniform=np.concatenate([half.incident_uniform, 1 - half.incident_uniform])[:num_scenarios],
+            aid_count_uniform=np.concatenate([half.aid_count_uniform, 1 - half.aid_count_uniform])[:num_scenarios],
+            aid_stop_uniform=np.concatenate([half.aid_stop_uniform, 1 - half.aid_stop_uniform])[:num_scenarios]
+        )
+
+    def design(self, num_scenarios: int, rng: np.random.Generator) -> np.ndarray:
+        """(num_scenarios, dimensions) matrix of uniforms for the sampler's scheme"""
+        n, d = num_scenarios, self.dimensions
+        if self.scheme == 'lhs':
+            return qmc.LatinHypercube(d, seed=rng).random(n)
+        if self.scheme == 'sobol':
+            # The first n points of the sequence; only power-of-two n keep
+            # Sobol balance, and scipy warns for any other chunk size
+            return qmc.Sobol(d, scramble=True, seed=rng).random(n)
+        if self.scheme == 'antithetic':
+            half = rng.random((-(-n // 2), d))
+            return np.concatenate([half, 1 - half])[:n]
+        if self.scheme == 'stratified':
+            u = rng.random((n, d))
+            u[:, SAMPLE_DIMENSIONS.index('weather')] = self._stratified_weather(n, rng)
+            return u
+        return rng.random((n, d))
+
+    def _stratified_weather(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """Weather uniforms with proportional allocation to each component"""
+        if self.weather_scenarios is not None:
+            weights = np.ones(len(self.weather_scenarios))
+        else:
+            weights = np.array([c['weight'] for c in self.weather_mixture], dtype=float)
+        weights = weights / weights.sum()
+        edges = np.concatenate([[0.0], np.cumsum(weights)])
+        edges[-1] = 1.0
+
+        # Largest-remainder rounding of n * weight
+        quota = n * weights
+        counts = np.floor(quota).astype(int)
+        counts[np.argsort(counts - quota)[:n - counts.sum()]] += 1
+
+        stratum = np.repeat(np.arange(len(weights)), counts)
+        return edges[stratum] + (edges[stratum + 1] - edges[stratum]) * rng.random(n)
+
+    def transform(self, u: np.ndarray) -> ScenarioBatch:
+        """
+        Map a (n, len(SAMPLE_DIMENSIONS)) matrix of uniforms to scenarios.
+        """
+        col = {name: u[:, i] for i, name in enumerate(SAMPLE_DIMENSIONS)}
+
+        if self.weather_scenarios is not None:
+            index = _categorical(col['weather'], len(self.weather_scenarios))
+            names = np.array([w['name'] for w in self.weather_scenarios])[index]
+            temperature = np.array([w['temp_c'] for w in self.weather_scenarios], dtype=float)[index]
+            precipitation = np.array([w.get('precipitation', 'dry') for w in self.weather_scenarios])[index]
+        else:
+            index = self.weather_component(col['weather'])
+            mixture = self.weather_mixture
+            mean = np.array([c['temp_mean'] for c in mixture], dtype=float)[index]
+            std = np.array([c['temp_std'] for c in mixture], dtype=float)[index]
+            low = np.array([c['temp_min'] for c in mixture], dtype=float)[index]
+            high = np.array([c['temp_max'] for c in mixture], dtype=float)[index]
+            rain = np.array([c.get('light_rain_probability', 0.0) for c in mixture])[index]
+            names = np.array([c['name'] for c in mixture])[index]
+            temperature = np.clip(mean + std * ndtri(col['temperature']), low, high)
+            precipitation = np.where(col['precipitation'] < rain, 'light_rain', 'dry')
+
+        return ScenarioBatch(
+            temperature_c=temperature,
+            altitude_m=_uniform(col['altitude'], self.altitude_band_m),
+            humidity_pct=_uniform(col['humidity'], self.humidity_range),
+            wind_speed_kmh=_uniform(col['wind'], self.wind_range_kmh),
+            precipitation=precipitation,
+            calories_per_hour=_uniform(col['calories'], self.calories_range),
+            fluid_ml_per_hour=_uniform(col['fluids'], self.fluid_range_ml),
+            electrolytes_mg_per_hour=_uniform(col['electrolytes'], self.electrolytes_range_mg),
+            fitness_level=_uniform(col['fitness'], self.fitness_range),
+            pollen_level=self.pollen_levels[_categorical(col['pollen'], len(self.pollen_levels))],
+            pacing_strategy=self.pacing_strategies[_categorical(col['pacing'], len(self.pacing_strategies))],
+            weather_scenario=names
+        )
+
+    def weather_component(self, u: np.ndarray) -> np.ndarray:
+        """Mixture component index for uniforms on the weather dimension"""
+        weights = np.array([c['weight'] for c in self.weather_mixture], dtype=float)
+        cumulative = np.cumsum(weights / weights.sum())
+        return np.minimum(np.searchsorted(cumulative, u, side='right'), len(weights) - 1)
+
+
+def _uniform(u: np.ndarray, bounds: Tuple[float, float]) -> np.ndarray:
+    """Scale uniforms onto [low, high)"""
+    return bounds[0] + (bounds[1] - bounds[0]) * u
+
+
+def _unique(values) -> List[str]:
+    """Distinct values in first-seen order"""
+    return list(dict.fromkeys(str(v) for v in values))
+
+
+def _categorical(u: np.ndarray, num_categories: int) -> np.ndarray:
+    """Equal-probability category index for uniforms"""
+    return np.minimum((u * num_categories).astype(int), num_categories - 1)
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Streaming, constant-memory aggregation of Monte Carlo results
+
+MonteCarloAggregator is fed result chunks one at a time and produces the
+same dictionary as monte_carlo_runner.analyze_results without keeping the
+per-run rows. Every accumulator is mergeable, so partial aggregates built in
+parallel workers can be combined.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .results_frame import ARRIVAL_SUFFIX, CHECKPOINT_COLUMN, SPLIT_SUFFIX
+
+# Quantiles reported for checkpoint arrival and split times
+TIMING_QUANTILES = {'p10': 0.10, 'p25': 0.25, 'median': 0.50, 'p75': 0.75, 'p90': 0.90}
+
+
+class RunningMoments:
+    """Count, mean, variance, min and max using Welford/Chan updates"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: Iterable[float]):
+        """Add a batch of values"""
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return
+        batch = RunningMoments()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other: 'RunningMoments'):
+        """Combine with another accumulator (Chan et al. parallel update)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, as pandas)"""
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else float('nan')
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (KLL compactor hierarchy).
+
+    Items at level h stand for 2**h original values. Until the first
+    compaction the sketch holds every value and quantiles are exact
+    (linear interpolation, as pandas).
+    """
+
+    def __init__(self, k: int = 400, seed: Optional[int] = None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: Iterable[float]):
+        """Add a batch of values"""
+        values = np.asarray(values, dtype=float)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self._compress()
+
+    def merge(self, other: 'KLLSketch'):
+        """Combine with another sketch"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[level])
+                # An odd item out stays at this level
+                self.levels[level] = items[len(items) - len(items) % 2:]
+                items = items[:len(items) - len(items) % 2]
+                offset = int(self._rng.integers(2))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset::2]])
+            level += 1
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self.levels) == 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile of everything seen so far"""
+        if self.n == 0:
+            return float('nan')
+        if self.is_exact:
+            return float(np.quantile(self.levels[0], q))
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values)
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(values[order][min(index, len(values) - 1)])
+
+    def cdf(self, x: float) -> float:
+        """Approximate fraction of values <= x"""
+        if self.n == 0:
+            return float('nan')
+        total = sum(2.0 ** level * np.count_nonzero(items <= x) for level, items in enumerate(self.levels))
+        weight = sum(2.0 ** level * len(items) for level, items in enumerate(self.levels))
+        return float(total / weight)
+
+
+class MonteCarloAggregator:
+    """
+    Constant-memory replacement for analyze_results over a stream of chunks.
+
+    Holds Welford moments and a KLL sketch of finish times, an exact
+    incident histogram, per-pacing and per-weather moments, the
+    target-window counters and, for runs with cutoffs, DNF counts per
+    checkpoint. Finish-time statistics cover finishers only. Checkpoint
+    arrival and key segment split columns each get their own moments and
+    sketch, plus counts of arrivals after the checkpoint cutoff and of
+    arrivals where the run was stopped.
+    """
+
+    TIME_QUANTILES = {'p10': 0.10, 'p25': 0.25, 'p75': 0.75, 'p90': 0.90}
+
+    def __init__(
+        self,
+        target_min_hours: float = None,
+        target_max_hours: float = None,
+        sketch_k: int = 400,
+        seed: Optional[int] = None,
+        checkpoint_cutoffs: Optional[Dict[str, Optional[float]]] = None
+    ):
+        """
+        Args:
+            target_min_hours: Target window for target_achievement
+            target_max_hours: Target window for target_achievement
+            sketch_k: KLL sketch accuracy parameter
+            seed: Seed of the sketch compaction coin flips
+            checkpoint_cutoffs: Elapsed-time cutoff per checkpoint name (None
+                for no cutoff), for P(missing cutoff)
+        """
+        self.target_min_hours = target_min_hours
+        self.target_max_hours = target_max_hours
+        self.run_count = 0
+        self.time_moments = RunningMoments()
+        self.time_sketch = KLLSketch(k=sketch_k, seed=seed)
+        self.incident_counts = np.zeros(0, dtype=np.int64)
+        self.group_moments: Dict[str, Dict[str, RunningMoments]] = {
+            'Pacing Strategy': {},
+            'Weather Scenario': {},
+        }
+        self.target_count = 0
+        self.target_fitness_sum = 0.0
+        self.target_temp_sum = 0.0
+        self.dnf_counts: Optional[Dict[str, int]] = None
+        self.sketch_k = sketch_k
+        self.seed = seed
+        self.checkpoint_cutoffs = checkpoint_cutoffs or {}
+        self.timing: Dict[str, Dict] = {}
+
+    @property
+    def count(self) -> int:
+        return self.run_count
+
+    def update(self, results_df: pd.DataFrame):
+        """Add a chunk of run_monte_carlo_simulations rows"""
+        self.run_count += len(results_df)
+        incidents = np.bincount(results_df['Respiratory Incidents'].to_numpy(dtype=np.int64))
+        self._add_incidents(incidents)
+
+        for column in results_df.columns:
+            if column.endswith((ARRIVAL_SUFFIX, SPLIT_SUFFIX)):
+                values = results_df[column].to_numpy(dtype=float)
+                reached = values[~np.isnan(values)]
+                timing = self._timing(column)
+                timing['moments'].update(reached)
+                timing['sketch'].update(reached)
+                if column.endswith(ARRIVAL_SUFFIX):
+                    name = column[:-len(ARRIVAL_SUFFIX)]
+                    cutoff = self.checkpoint_cutoffs.get(name)
+                    if cutoff is not None:
+                        timing['late'] += int(np.count_nonzero(reached > cutoff))
+                    timing['stopped'] += int(np.count_nonzero(stopped_arrivals(results_df, name, values)))
+
+        finishers = results_df
+        if 'DNF' in results_df:
+            dnf = results_df['DNF'].to_numpy(dtype=bool)
+            self._add_dnf(results_df['DNF Checkpoint'][dnf].value_counts(sort=False).to_dict())
+            finishers = results_df[~dnf]
+
+        times = finishers['Time (hours)'].to_numpy(dtype=float)
+        self.time_moments.update(times)
+        self.time_sketch.update(times)
+
+        for column, groups in self.group_moments.items():
+            for name, group_times in finishers.groupby(column, observed=True)['Time (hours)']:
+                groups.setdefault(name, RunningMoments()).update(group_times.to_numpy(dtype=float))
+
+        if self.target_min_hours and self.target_max_hours:
+            in_target = (times >= self.target_min_hours) & (times <= self.target_max_hours)
+            self.target_count += int(in_target.sum())
+            self.target_fitness_sum += float(finishers['Fitness Level'].to_numpy(dtype=float)[in_target].sum())
+            self.target_temp_sum += float(finishers['Temperature (°C)'].to_numpy(dtype=float)[in_target].sum())
+
+    def merge(self, other: 'MonteCarloAggregator'):
+        """Combine with a partial aggregate (e.g. from another worker)"""
+        self.run_count += other.run_count
+        if other.dnf_counts is not None:
+            self._add_dnf(other.dnf_counts)
+        self.time_moments.merge(other.time_moments)
+        self.time_sketch.merge(other.time_sketch)
+        self._add_incidents(other.incident_counts)
+        for column, groups in other.group_moments.items():
+            for name, moments in groups.items():
+                self.group_moments[column].setdefault(name, RunningMoments()).merge(moments)
+        self.target_count += other.target_count
+        self.target_fitness_sum += other.target_fitness_sum
+        self.target_temp_sum += other.target_temp_sum
+        for column, other_timing in other.timing.items():
+            timing = self._timing(column)
+            timing['moments'].merge(other_timing['moments'])
+            timing['sketch'].merge(other_timing['sketch'])
+            timing['late'] += other_timing['late']
+            timing['stopped'] += other_timing['stopped']
+
+    def _timing(self, column: str) -> Dict:
+        if column not in self.timing:
+            self.timing[column] = {
+                'moments': RunningMoments(), 'sketch': KLLSketch(k=self.sketch_k, seed=self.seed),
+                'late': 0, 'stopped': 0
+            }
+        return self.timing[column]
+
+    def _add_incidents(self, counts: np.ndarray):
+        size = max(len(self.incident_counts), len(counts))
+        self.incident_counts = (
+            np.pad(self.incident_counts, (0, size - len(self.incident_counts)))
+            + np.pad(counts, (0, size - len(counts)))
+        )
+
+    def _add_dnf(self, counts: Dict[str, int]):
+        if self.dnf_counts is None:
+            self.dnf_counts = {}
+        for name, count in counts.items():
+            self.dnf_counts[name] = self.dnf_counts.get(name, 0) + int(count)
+
+    def _incident_median(self) -> float:
+        """Exact median from the incident histogram (pandas convention)"""
+        n = self.count
+        cumulative = np.cumsum(self.incident_counts)
+        lower = int(np.searchsorted(cumulative, (n - 1) // 2, side='right'))
+        upper = int(np.searchsorted(cumulative, n // 2, side='right'))
+        return (lower + upper) / 2
+
+    def result(self) -> Dict:
+        """Analysis dictionary in the analyze_results format"""
+        n = self.count
+        incidents = np.arange(len(self.incident_counts))
+        moments = self.time_moments
+        finishers = moments.count > 0
+        # NaN without finishers, as pandas reports for an empty column
+        time_statistics = {
+            'mean': moments.mean if finishers else float('nan'),
+            'median': self.time_sketch.quantile(0.5),
+            'std': moments.std,
+            'min': moments.min if finishers else float('nan'),
+            'max': moments.max if finishers else float('nan'),
+        }
+        time_statistics.update({name: self.time_sketch.quantile(q) for name, q in self.TIME_QUANTILES.items()})
+
+        analysis = {
+            'total_simulations': n,
+            'time_statistics': time_statistics,
+            'respiratory_statistics': {
+                'mean_incidents': float((incidents * self.incident_counts).sum() / n),
+                'median_incidents': self._incident_median(),
+                'max_incidents': int(incidents[self.incident_counts > 0].max()),
+                'zero_incident_rate': float(self.incident_counts[0] / n) if len(self.incident_counts) else 0.0
+            },
+            'pacing_performance': self._group_table('Pacing Strategy'),
+            'weather_performance': self._group_table('Weather Scenario'),
+        }
+
+        if self.target_min_hours and self.target_max_hours:
+            analysis['target_achievement'] = {
+                'count': self.target_count,
+                'success_rate': self.target_count / n,
+                'mean_fitness_in_target': self.target_fitness_sum / self.target_count if self.target_count > 0 else None,
+                'mean_temp_in_target': self.target_temp_sum / self.target_count if self.target_count > 0 else None,
+            }
+
+        if self.dnf_counts is not None:
+            analysis['dnf_statistics'] = dnf_statistics(self.dnf_counts, n)
+
+        checkpoints, splits = {}, {}
+        for column, timing in self.timing.items():
+            entry = {'mean': timing['moments'].mean if timing['moments'].count else float('nan')}
+            entry.update({name: timing['sketch'].quantile(q) for name, q in TIMING_QUANTILES.items()})
+            if column.endswith(ARRIVAL_SUFFIX):
+                name = column[:-len(ARRIVAL_SUFFIX)]
+                entry['reached_rate'] = (timing['moments'].count - timing['stopped']) / n
+                cutoff = self.checkpoint_cutoffs.get(name)
+                if cutoff is not None:
+                    entry['cutoff_hours'] = cutoff
+                    entry['p_miss_cutoff'] = timing['late'] / n
+                checkpoints[name] = entry
+            else:
+                splits[column[:-len(SPLIT_SUFFIX)]] = entry
+        if self.timing:
+            analysis['checkpoint_statistics'] = checkpoints
+            analysis['split_statistics'] = splits
+
+        return analysis
+
+    def _group_table(self, column: str) -> Dict:
+        groups = self.group_moments[column]
+        names = sorted(groups)
+        return {
+            'mean': {name: groups[name].mean for name in names},
+            'std': {name: groups[name].std for name in names},
+            'count': {name: groups[name].count for name in names},
+        }
+
+
+def stopped_arrivals(results_df: pd.DataFrame, checkpoint: str, arrivals: np.ndarray) -> np.ndarray:
+    """
+    Runs with an arrival time at a checkpoint that were stopped there.
+
+    A run that misses a cutoff or the time cap on the segment reaching a
+    checkpoint records its (late) arrival and is a DNF at that checkpoint;
+    it did not get past it, so it does not count towards reached_rate.
+    """
+    if 'DNF' not in results_df:
+        return np.zeros(len(arrivals), dtype=bool)
+    dnf = results_df['DNF'].to_numpy(dtype=bool)
+    return dnf & (results_df[CHECKPOINT_COLUMN].to_numpy(dtype=object) == checkpoint) & ~np.isnan(arrivals)
+
+
+def dnf_statistics(dnf_counts: Dict[str, int], total: int) -> Dict:
+    """
+    DNF rate overall and by checkpoint (rates are fractions of all runs).
+
+    Args:
+        dnf_counts: Number of DNFs per checkpoint, in course order
+        total: Number of runs
+    """
+    dnf_count = int(sum(dnf_counts.values()))
+    return {
+        'dnf_count': dnf_count,
+        'dnf_rate': dnf_count / total,
+        'by_checkpoint': {
+            name: {'count': int(count), 'rate': count / total} for name, count in dnf_counts.items()
+        },
+    }
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Vectorized n-dimensional parameter sweeps
+
+sweep() evaluates the full Cartesian grid of the given axes (fitness x
+temperature x pacing x precipitation x start hour, ...) with simulate_batch,
+a chunk of grid cells per batch, and returns the results as a labelled
+array. Every cell uses the same race draws (common random numbers), so
+differences between cells come from the parameters alone.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .digital_twin_v32_simulator import (
+    DigitalTwinV32, EnvironmentalConditions, NutritionStrategy, RaceDraws, ScenarioBatch
+)
+from .monte_carlo_runner import map_chunks
+from .profile_registry import load_simulator
+
+# Sweepable axes and the ScenarioBatch field each one sets ('start_hour'
+# is the simulate_batch start_time_hour)
+SWEEP_AXES = {
+    'fitness': 'fitness_level',
+    'temperature': 'temperature_c',
+    'precipitation': 'precipitation',
+    'altitude': 'altitude_m',
+    'humidity': 'humidity_pct',
+    'wind': 'wind_speed_kmh',
+    'calories': 'calories_per_hour',
+    'fluids': 'fluid_ml_per_hour',
+    'electrolytes': 'electrolytes_mg_per_hour',
+    'pollen': 'pollen_level',
+    'pacing': 'pacing_strategy',
+    'start_hour': 'start_hour',
+}
+
+# Per-scenario simulate_batch summary values that can be swept
+SWEEP_METRICS = (
+    'total_time_hours', 'moving_time_hours', 'aid_station_time_hours', 'average_speed_kmh',
+    'hiking_percentage', 'respiratory_incidents', 'worst_respiratory_impact'
+)
+
+# Values of the axes that are not swept (the simulate_race defaults)
+DEFAULT_SWEEP_BASE = {
+    'fitness': 1.0,
+    'temperature': EnvironmentalConditions.temperature_celsius,
+    'precipitation': EnvironmentalConditions.precipitation,
+    'altitude': EnvironmentalConditions.altitude_m,
+    'humidity': EnvironmentalConditions.humidity_pct,
+    'wind': EnvironmentalConditions.wind_speed_kmh,
+    'calories': NutritionStrategy.calories_per_hour,
+    'fluids': NutritionStrategy.fluid_ml_per_hour,
+    'electrolytes': NutritionStrategy.electrolytes_mg_per_hour,
+    'pollen': 'low',
+    'pacing': 'even',
+    'start_hour': 6,
+}
+
+# Grid rows simulated per batch
+DEFAULT_SWEEP_CHUNK_SIZE = 20000
+
+
+@dataclass
+class SweepResult:
+    """
+    Labelled array of one metric over a parameter grid.
+
+    values has one axis per entry of dims; coords maps each dim to its
+    coordinate values.
+    """
+    values: np.ndarray
+    dims: Tuple[str, ...]
+    coords: Dict[str, np.ndarray]
+    metric: str
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.values.shape
+
+    def __array__(self, dtype=None, copy=None):
+        return self.values if dtype is None else self.values.astype(dtype)
+
+    def sel(self, **selection) -> Union['SweepResult', float]:
+        """
+        Select coordinates by value, e.g. sel(pacing='even', start_hour=6).
+
+        Selected dims are dropped; selecting every dim returns a float.
+        """
+        index = []
+        for dim in self.dims:
+            if dim not in selection:
+                index.append(slice(None))
+                continue
+            matches = np.flatnonzero(self.coords[dim] == selection.pop(dim))
+            if not len(matches):
+                raise KeyError(f"Coordinate not on the {dim} axis")
+            index.append(int(matches[0]))
+        if selection:
+            raise KeyError(f"Unknown dims: {', '.join(selection)}")
+        dims = tuple(dim for dim, i in zip(self.dims, index) if isinstance(i, slice))
+        values = self.values[tuple(index)]
+        if not dims:
+            return float(values)
+        return SweepResult(values, dims, {dim: self.coords[dim] for dim in dims}, self.metric)
+
+    def reduce(self, func, dim: Union[str, Sequence[str]]) -> 'SweepResult':
+        """Apply a NumPy reduction (e.g. np.mean) over one or more dims"""
+        dims = [dim] if isinstance(dim, str) else list(dim)
+        axes = tuple(self.dims.index(d) for d in dims)
+        kept = tuple(d for d in self.dims if d not in dims)
+        return SweepResult(func(self.values, axis=axes), kept, {d: self.coords[d] for d in kept}, self.metric)
+
+    def mean(self, dim: Union[str, Sequence[str]]) -> 'SweepResult':
+        return self.reduce(np.mean, dim)
+
+    def argmin(self) -> Dict:
+        """Coordinates of the smallest value"""
+        index = np.unravel_index(np.argmin(self.values), self.shape)
+        return {dim: self.coords[dim][i].item() for dim, i in zip(self.dims, index)}
+
+    def to_series(self) -> pd.Series:
+        """Long-form Series indexed by every coordinate combination"""
+        index = pd.MultiIndex.from_product([self.coords[d] for d in self.dims], names=list(self.dims))
+        return pd.Series(self.values.reshape(-1), index=index, name=self.metric)
+
+    def to_xarray(self):
+        """
+        Convert to an xarray.DataArray.
+
+        Raises:
+            ImportError: xarray is not installed
+        """
+        try:
+            import xarray
+        except ImportError as exc:
+            raise ImportError("to_xarray requires xarray (pip install xarray)") from exc
+        return xarray.DataArray(self.values, dims=self.dims, coords=self.coords, name=self.metric)
+
+
+def sweep(
+    elevation_profile: List[Dict],
+    athlete_profile_path: str,
+    course_profile_path: str,
+    axes: Dict[str, Sequence],
+    base: Optional[Dict] = None,
+    metrics: Union[str, Sequence[str]] = 'total_time_hours',
+    replicates: int = 1,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_SWEEP_CHUNK_SIZE,
+    n_workers: Optional[int] = None
+) -> Union[SweepResult, Dict[str, SweepResult]]:
+    """
+    Simulate every combination of the axis values.
+
+    Args:
+        elevation_profile: Course elevation data
+        athlete_profile_path: Path to athlete profile JSON
+        course_profile_path: Path to course profile JSON
+        axes: Values per swept axis (keys from SWEEP_AXES), in dim order,
+            e.g. {'fitness': np.linspace(1.0, 1.25, 10), 'pacing': [...]}
+        base: Values of the axes that are not swept (DEFAULT_SWEEP_BASE otherwise)
+        metrics: One summary value (SWEEP_METRICS), or several
+        replicates: Race draws per cell; above 1 adds a trailing 'replicate' dim
+        seed: Seed of the shared race draws
+        chunk_size: Grid rows per simulate_batch call
+        n_workers: Worker processes to spread chunks over
+
+    Returns:
+        SweepResult, or a dict of them by metric when metrics is a sequence
+    """
+    if not axes:
+        raise ValueError("sweep needs at least one axis")
+    unknown = [name for name in list(axes) + list(base or {}) if name not in SWEEP_AXES]
+    if unknown:
+        raise ValueError(f"Unknown sweep axes: {', '.join(unknown)}")
+    metric_names = [metrics] if isinstance(metrics, str) else list(metrics)
+    unknown = [name for name in metric_names if name not in SWEEP_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown sweep metrics: {', '.join(unknown)}")
+    if replicates < 1:
+        raise ValueError(f"replicates must be at least 1, got {replicates}")
+
+    coords = {name: np.asarray(values) for name, values in axes.items()}
+    if any(values.ndim != 1 or len(values) == 0 for values in coords.values()):
+        raise ValueError("Every sweep axis needs a non-empty 1-D list of values")
+    if 'pacing' in coords:
+        unknown = sorted(set(coords['pacing'].tolist()) - set(DigitalTwinV32.PACING_MULTIPLIERS))
+        if unknown:
+            raise ValueError(f"Unknown pacing strategies: {', '.join(unknown)}")
+    fixed = dict(DEFAULT_SWEEP_BASE)
+    fixed.update(base or {})
+
+    simulator = load_simulator(athlete_profile_path, course_profile_path)
+    plan = simulator.compile_plan(elevation_profile)
+    draws = RaceDraws.sample(np.random.default_rng(seed), replicates, plan.n_segments)
+
+    shape = tuple(len(values) for values in coords.values())
+    num_rows = int(np.prod(shape)) * replicates
+    grid = (coords, fixed, replicates)
+    tasks = [
+        (elevation_profile, grid, draws, first, min(chunk_size, num_rows - first), metric_names)
+        for first in range(0, num_rows, chunk_size)
+    ]
+    chunks = list(map_chunks(simulator, _sweep_chunk, tasks, n_workers))
+
+    dim_coords = dict(coords)
+    if replicates > 1:
+        dim_coords['replicate'] = np.arange(replicates)
+        shape += (replicates,)
+    results = {
+        name: SweepResult(
+            np.concatenate([chunk[name] for chunk in chunks]).reshape(shape), tuple(dim_coords), dim_coords, name
+        )
+        for name in metric_names
+    }
+    return results[metrics] if isinstance(metrics, str) else results
+
+
+def _sweep_chunk(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    grid: tuple,
+    draws: RaceDraws,
+    first_row: int,
+    num_rows: int,
+    metrics: List[str]
+) -> Dict[str, np.ndarray]:
+    """Simulate grid rows first_row.. (cell-major, replicate-minor)"""
+    coords, fixed, replicates = grid
+    cells, replicate = np.divmod(np.arange(first_row, first_row + num_rows), replicates)
+    index = np.unravel_index(cells, tuple(len(values) for values in coords.values()))
+
+    values = {name: np.full(num_rows, fixed[name]) for name in SWEEP_AXES}
+    for (name, axis_values), axis_index in zip(coords.items(), index):
+        values[name] = axis_values[axis_index]
+    return simulate_values(simulator, elevation_profile, values, draws[replicate], metrics)
+
+
+def simulate_values(
+    simulator: DigitalTwinV32,
+    elevation_profile: List[Dict],
+    values: Dict[str, np.ndarray],
+    draws: RaceDraws,
+    metrics: Sequence[str],
+    course_parameters: Optional[Dict[str, np.ndarray]] = None
+) -> Dict[str, np.ndarray]:
+    """simulate_batch over per-row values of every SWEEP_AXES axis"""
+    scenarios = ScenarioBatch(
+        weather_scenario=np.full(len(draws), ''),
+        **{field: values[name] for name, field in SWEEP_AXES.items() if name != 'start_hour'}
+    )
+    summary = simulator.simulate_batch(
+        elevation_profile, scenarios, scenarios.pacing_strategy,
+        start_time_hour=values['start_hour'], draws=draws,
+        plan=simulator.compile_plan(elevation_profile), course_parameters=course_parameters
+    )['summary']
+    return {name: summary[name] for name in metrics}
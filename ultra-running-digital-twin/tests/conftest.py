@@ -0,0 +1,67 @@
+"""Shared fixtures: the bundled athlete, Chianti course and elevation profile"""
+
+import copy
+import json
+import os
+
+import pytest
+
+from src import DigitalTwinV32, profile_registry
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+ATHLETE_PROFILE = os.path.join(DATA_DIR, 'profiles', 'simbarashe_enhanced_profile_v3_3.json')
+COURSE_PROFILE = os.path.join(DATA_DIR, 'courses', 'chianti_74k_course_profile_v1_3_FINAL.json')
+ELEVATION_PROFILE = os.path.join(DATA_DIR, 'elevation', 'chianti_elevation_profile.json')
+
+
+@pytest.fixture(scope='session', autouse=True)
+def profile_cache(tmp_path_factory):
+    """Keep the process-wide profile registry's disk cache out of the home directory"""
+    registry = profile_registry.ProfileRegistry(cache_dir=str(tmp_path_factory.mktemp('profile_cache')))
+    previous, profile_registry._DEFAULT_REGISTRY = profile_registry._DEFAULT_REGISTRY, registry
+    yield registry
+    profile_registry._DEFAULT_REGISTRY = previous
+
+
+@pytest.fixture(scope='session')
+def elevation_profile():
+    with open(ELEVATION_PROFILE, 'r') as f:
+        return json.load(f)['profile']
+
+
+@pytest.fixture(scope='session')
+def athlete_path():
+    return ATHLETE_PROFILE
+
+
+@pytest.fixture(scope='session')
+def course_path():
+    return COURSE_PROFILE
+
+
+@pytest.fixture(scope='session')
+def cutoff_course_path(tmp_path_factory):
+    """Chianti with two intermediate checkpoints, elapsed-time cutoffs and key segments"""
+    with open(COURSE_PROFILE, 'r') as f:
+        course = json.load(f)
+    course = copy.deepcopy(course)
+    course['course_metadata']['start_time'] = '06:00'
+    course['aid_stations'] = [
+        {'name': 'Start', 'distance_km': 0, 'type': 'start', 'cumulative_cutoff_time': '06:00'},
+        {'name': 'CP1', 'distance_km': 20, 'type': 'aid', 'cumulative_cutoff_time': '10:00'},
+        {'name': 'CP2', 'distance_km': 45, 'type': 'aid', 'cumulative_cutoff_time': '14:30'},
+        {'name': 'End', 'distance_km': 74, 'type': 'finish', 'cumulative_cutoff_time': '20:30'},
+    ]
+    course['key_segments'] = [
+        {'name': 'Opening', 'start_km': 0, 'end_km': 12},
+        {'name': 'Middle', 'start_km': 20, 'end_km': 45},
+    ]
+    path = tmp_path_factory.mktemp('courses') / 'chianti_cutoffs.json'
+    with open(path, 'w') as f:
+        json.dump(course, f)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def simulator():
+    return DigitalTwinV32(ATHLETE_PROFILE, COURSE_PROFILE)
@@ -0,0 +1,74 @@
+"""Adaptive Monte Carlo: confidence intervals and stopping rules"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import norm
+
+from src import run_adaptive_monte_carlo, run_monte_carlo_simulations
+from src.adaptive_monte_carlo import proportion_confidence_interval, quantile_confidence_interval
+
+RUN = {'chunk_size': 250, 'batch_size': 500, 'min_simulations': 500, 'seed': 3, 'verbose': False}
+
+
+def test_quantile_interval_covers_the_true_quantile():
+    rng = np.random.default_rng(0)
+    covered = 0
+    for _ in range(400):
+        lower, upper = quantile_confidence_interval(np.sort(rng.normal(size=400)), 0.9)
+        covered += lower <= norm.ppf(0.9) <= upper
+    assert covered / 400 == pytest.approx(0.95, abs=0.03)
+
+
+def test_proportion_interval_brackets_the_estimate():
+    lower, upper = proportion_confidence_interval(30, 200)
+    assert lower < 0.15 < upper
+    assert upper - lower == pytest.approx(2 * 1.96 * np.sqrt(0.15 * 0.85 / 200), rel=0.05)
+
+
+def test_loose_targets_converge_on_a_prefix_of_the_full_run(elevation_profile, athlete_path, course_path):
+    adaptive = run_adaptive_monte_carlo(
+        elevation_profile, athlete_path, course_path, ci_targets={'median': 0.5}, max_simulations=5000, **RUN
+    )
+    assert adaptive['converged'] and adaptive['stop_reason'] == 'converged'
+    results_df = adaptive['results']
+    assert len(results_df) == RUN['min_simulations']
+    assert adaptive['trace'][-1]['ci_widths']['median'] <= 0.5
+
+    full = run_monte_carlo_simulations(
+        elevation_profile, athlete_path, course_path, num_simulations=1000,
+        chunk_size=RUN['chunk_size'], seed=RUN['seed'], verbose=False
+    )
+    pd.testing.assert_frame_equal(results_df, full.iloc[:len(results_df)], check_like=True)
+
+
+def test_unreachable_target_stops_at_the_simulation_budget(elevation_profile, athlete_path, course_path):
+    adaptive = run_adaptive_monte_carlo(
+        elevation_profile, athlete_path, course_path, ci_targets={'median': 1e-6}, max_simulations=1000, **RUN
+    )
+    assert not adaptive['converged']
+    assert adaptive['stop_reason'] == 'max_simulations'
+    assert len(adaptive['results']) == 1000
+    assert [entry['simulations'] for entry in adaptive['trace']] == [500, 1000]
+
+
+def test_last_batch_is_cut_to_the_simulation_budget(elevation_profile, athlete_path, course_path):
+    adaptive = run_adaptive_monte_carlo(
+        elevation_profile, athlete_path, course_path, ci_targets={'median': 1e-6}, max_simulations=600, **RUN
+    )
+    assert adaptive['stop_reason'] == 'max_simulations'
+    assert [entry['simulations'] for entry in adaptive['trace']] == [500, 600]
+
+    full = run_monte_carlo_simulations(
+        elevation_profile, athlete_path, course_path, num_simulations=600,
+        chunk_size=RUN['chunk_size'], seed=RUN['seed'], verbose=False
+    )
+    pd.testing.assert_frame_equal(adaptive['results'], full, check_like=True)
+
+
+def test_time_budget_is_checked_after_every_chunk(elevation_profile, athlete_path, course_path):
+    adaptive = run_adaptive_monte_carlo(
+        elevation_profile, athlete_path, course_path, ci_targets={'median': 1e-6}, time_budget_seconds=0.0, **RUN
+    )
+    assert adaptive['stop_reason'] == 'time_budget'
+    assert len(adaptive['results']) == RUN['chunk_size']
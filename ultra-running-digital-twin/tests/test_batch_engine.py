@@ -0,0 +1,145 @@
+"""simulate_batch against simulate_race on shared RaceDraws"""
+
+import numpy as np
+import pytest
+
+from src import DigitalTwinV32, EnvironmentalConditions, NutritionStrategy, RaceDraws, ScenarioSampler, SegmentView
+
+NUM_SCENARIOS = 60
+
+STOP_RULES = [
+    {},
+    {'cutoffs': True},
+    {'time_cap_hours': 12.5},
+    {'cutoffs': True, 'time_cap_hours': 14.0},
+]
+
+SUMMARY_KEYS = (
+    'total_time_hours', 'moving_time_hours', 'aid_station_time_hours', 'average_speed_kmh',
+    'hiking_percentage', 'worst_respiratory_impact'
+)
+
+
+def random_scenarios(num_scenarios, rng):
+    """Scenario dicts in the simulate_race format, with their pacing strategies"""
+    scenarios = [
+        {
+            'environment': EnvironmentalConditions(
+                temperature_celsius=rng.uniform(2, 30),
+                altitude_m=rng.uniform(100, 900),
+                precipitation=rng.choice(['dry', 'light_rain', 'wet'])
+            ),
+            'nutrition': NutritionStrategy(calories_per_hour=rng.uniform(180, 300)),
+            'fitness_level': rng.uniform(0.85, 1.2),
+        }
+        for _ in range(num_scenarios)
+    ]
+    pacing = rng.choice(['even', 'conservative', 'aggressive', 'negative_split'], num_scenarios)
+    return scenarios, pacing
+
+
+def test_batch_matches_scalar_runs(simulator, elevation_profile):
+    rng = np.random.default_rng(7)
+    scenarios, pacing = random_scenarios(NUM_SCENARIOS, rng)
+    draws = RaceDraws.sample(rng, NUM_SCENARIOS, len(elevation_profile) - 1)
+    batch = simulator.simulate_batch(elevation_profile, scenarios, pacing, draws=draws)['summary']
+
+    for i in range(0, NUM_SCENARIOS, 7):
+        single = simulator.simulate_race(elevation_profile, scenarios[i], pacing[i], draws=draws[i])['summary']
+        for key in SUMMARY_KEYS:
+            assert single[key] == pytest.approx(batch[key][i], rel=1e-12, abs=0)
+        assert single['respiratory_incidents'] == batch['respiratory_incidents'][i]
+
+
+def test_batch_is_reproducible_from_a_seeded_generator(simulator, elevation_profile):
+    scenarios, pacing = random_scenarios(10, np.random.default_rng(1))
+    first = simulator.simulate_batch(elevation_profile, scenarios, pacing, rng=np.random.default_rng(2))
+    second = simulator.simulate_batch(elevation_profile, scenarios, pacing, rng=np.random.default_rng(2))
+    np.testing.assert_array_equal(first['summary']['total_time_hours'], second['summary']['total_time_hours'])
+
+
+def test_detail_levels_agree(simulator, elevation_profile):
+    scenarios, pacing = random_scenarios(1, np.random.default_rng(5))
+    draws = RaceDraws.sample(np.random.default_rng(6), 1, len(elevation_profile) - 1)[0]
+    full = simulator.simulate_race(elevation_profile, scenarios[0], pacing[0], draws=draws)
+    summary = simulator.simulate_race(elevation_profile, scenarios[0], pacing[0], draws=draws, detail='summary')
+    columnar = simulator.simulate_race(elevation_profile, scenarios[0], pacing[0], draws=draws, detail='columnar')
+
+    assert summary['summary'] == full['summary']
+    assert 'segments' not in summary
+    assert SegmentView(columnar['columns']).to_list() == full['segments']
+
+
+def test_batch_segment_columns_match_scalar_run(simulator, elevation_profile):
+    rng = np.random.default_rng(3)
+    scenarios, pacing = random_scenarios(20, rng)
+    draws = RaceDraws.sample(rng, 20, len(elevation_profile) - 1)
+    batch = simulator.simulate_batch(elevation_profile, scenarios, pacing, draws=draws, detail='columnar')
+    for i in (0, 11, 19):
+        single = simulator.simulate_race(
+            elevation_profile, scenarios[i], pacing[i], draws=draws[i], detail='columnar'
+        )
+        for name in ('final_speed_kmh', 'hr_estimate', 'cumulative_time_hours'):
+            np.testing.assert_allclose(single['columns'][name], batch['columns'][name][i], rtol=1e-12)
+        assert SegmentView.from_batch(batch['columns'], i)[-1]['distance_km'] == elevation_profile[-1]['distance_km']
+
+
+@pytest.fixture(scope='module')
+def cutoff_simulator(athlete_path, cutoff_course_path):
+    return DigitalTwinV32(athlete_path, cutoff_course_path)
+
+
+@pytest.mark.parametrize('stop_rules', STOP_RULES)
+def test_stop_rules_match_scalar_runs(cutoff_simulator, elevation_profile, stop_rules):
+    plan = cutoff_simulator.compile_plan(elevation_profile)
+    sampler = ScenarioSampler.for_course(cutoff_simulator.course_profile, fitness_range=(0.8, 1.3))
+    rng = np.random.default_rng(7)
+    scenarios = sampler.sample(200, rng)
+    draws = sampler.sample_race_draws(200, plan.n_segments, rng)
+    batch = cutoff_simulator.simulate_batch(
+        elevation_profile, scenarios, scenarios.pacing_strategy, draws=draws, plan=plan, **stop_rules
+    )['summary']
+    if stop_rules:
+        assert 0 < batch['finished'].sum() < 200
+
+    for i in range(0, 200, 7):
+        single = cutoff_simulator.simulate_race(
+            elevation_profile, scenarios.scenario(i), scenarios.pacing_strategy[i],
+            draws=draws[i], plan=plan, detail='summary', **stop_rules
+        )['summary']
+        for key in ('total_time_hours', 'moving_time_hours', 'aid_station_time_hours', 'hiking_percentage'):
+            assert single[key] == pytest.approx(batch[key][i], rel=1e-12, abs=0)
+        assert single['respiratory_incidents'] == batch['respiratory_incidents'][i]
+        np.testing.assert_allclose(single['checkpoint_hours'], batch['checkpoint_hours'][i], rtol=1e-12)
+        np.testing.assert_allclose(single['key_segment_hours'], batch['key_segment_hours'][i], rtol=1e-12)
+        if stop_rules:
+            assert single['finished'] == batch['finished'][i]
+            assert single['dnf_checkpoint'] == batch['dnf_checkpoint'][i]
+
+
+def test_time_cap_stops_runs_at_the_next_checkpoint(cutoff_simulator, elevation_profile):
+    scenarios, pacing = random_scenarios(40, np.random.default_rng(9))
+    batch = cutoff_simulator.simulate_batch(elevation_profile, scenarios, pacing, rng=np.random.default_rng(9))
+    capped = cutoff_simulator.simulate_batch(
+        elevation_profile, scenarios, pacing, rng=np.random.default_rng(9), time_cap_hours=12.5
+    )['summary']
+    slow = batch['summary']['total_time_hours'] > 12.5
+    np.testing.assert_array_equal(capped['finished'], ~slow)
+    assert (capped['total_time_hours'][slow] <= batch['summary']['total_time_hours'][slow]).all()
+
+
+def test_course_parameters_override_the_profile(simulator, elevation_profile):
+    scenarios, pacing = random_scenarios(20, np.random.default_rng(4))
+    draws = RaceDraws.sample(np.random.default_rng(4), 20, len(elevation_profile) - 1)
+    default = simulator.simulate_batch(elevation_profile, scenarios, pacing, draws=draws)['summary']
+    same = simulator.simulate_batch(
+        elevation_profile, scenarios, pacing, draws=draws, course_parameters=simulator.course_parameter_values()
+    )['summary']
+    np.testing.assert_allclose(same['total_time_hours'], default['total_time_hours'], rtol=1e-12)
+
+    values = simulator.course_parameter_values()
+    harder = dict(values, fatigue_per_km_base=np.full(20, values['fatigue_per_km_base'] - 0.002))
+    slower = simulator.simulate_batch(
+        elevation_profile, scenarios, pacing, draws=draws, course_parameters=harder
+    )['summary']
+    assert (slower['total_time_hours'] > default['total_time_hours']).all()
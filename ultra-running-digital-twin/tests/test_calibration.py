@@ -0,0 +1,51 @@
+"""Course calibration: the written profile reproduces the fitted parameters"""
+
+import numpy as np
+import pytest
+
+from src import DigitalTwinV32, ScenarioSampler, calibrate
+
+
+def test_written_profile_matches_fitted_parameters(elevation_profile, athlete_path, course_path, tmp_path):
+    output_path = str(tmp_path / 'calibrated.json')
+    result = calibrate(
+        elevation_profile, athlete_path, course_path, num_scenarios=200, max_evaluations=10,
+        output_path=output_path, verbose=False
+    )
+    assert result['output_path'] == output_path
+
+    original = DigitalTwinV32(athlete_path, course_path)
+    calibrated = DigitalTwinV32(athlete_path, output_path)
+    sampler = ScenarioSampler.for_course(original.course_profile)
+    rng = np.random.default_rng(4)
+    plan = original.compile_plan(elevation_profile)
+    scenarios = sampler.sample(100, rng)
+    draws = sampler.sample_race_draws(100, plan.n_segments, rng)
+
+    expected = original.simulate_batch(
+        elevation_profile, scenarios, scenarios.pacing_strategy, draws=draws,
+        course_parameters=result['parameters']
+    )['summary']['total_time_hours']
+    actual = calibrated.simulate_batch(
+        elevation_profile, scenarios, scenarios.pacing_strategy, draws=draws
+    )['summary']['total_time_hours']
+    np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+
+def test_fit_closes_the_target_miss(elevation_profile, athlete_path, course_path):
+    targets = [{'name': 'p50', 'hours': 12.5, 'quantile': 0.5, 'fitness': None}]
+    result = calibrate(
+        elevation_profile, athlete_path, course_path, parameters=['dry_multiplier'], targets=targets,
+        num_scenarios=200, write=False, verbose=False
+    )
+    table = result['targets'].iloc[0]
+    assert abs(table['Initial (hours)'] - 12.5) * 60 > 20
+    assert abs(table['Miss (min)']) < 5
+    # A faster median needs faster dry-trail running
+    assert result['parameters']['dry_multiplier'] > result['initial']['dry_multiplier']
+    assert result['output_path'] is None
+
+
+def test_unknown_parameters_raise(elevation_profile, athlete_path, course_path):
+    with pytest.raises(ValueError):
+        calibrate(elevation_profile, athlete_path, course_path, parameters=['pacing'], write=False, verbose=False)
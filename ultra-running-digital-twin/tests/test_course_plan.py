@@ -0,0 +1,63 @@
+"""Compiled course plans: content-keyed caching and agreement with the scalar model"""
+
+import copy
+
+import numpy as np
+
+from src import DigitalTwinV32, EnvironmentalConditions, NutritionStrategy, RaceDraws
+
+from .conftest import ATHLETE_PROFILE, COURSE_PROFILE
+
+
+def test_compile_plan_is_cached_by_content(simulator, elevation_profile):
+    plan = simulator.compile_plan(elevation_profile)
+    assert simulator.compile_plan(elevation_profile) is plan
+    assert simulator.compile_plan(copy.deepcopy(elevation_profile)) is plan
+    assert DigitalTwinV32(ATHLETE_PROFILE, COURSE_PROFILE).compile_plan(elevation_profile) is plan
+
+    shifted = copy.deepcopy(elevation_profile)
+    shifted[5]['gradient_pct'] += 1.0
+    assert simulator.compile_plan(shifted).key != plan.key
+
+
+def test_plan_terms_match_scalar_model(simulator, elevation_profile):
+    plan = simulator.compile_plan(elevation_profile)
+    assert plan.n_segments == len(elevation_profile) - 1
+    for i in (0, plan.n_segments // 2, plan.n_segments - 1):
+        point, prev_point = elevation_profile[i + 1], elevation_profile[i]
+        assert plan.base_speed_kmh[i] == simulator.get_base_speed(point['gradient_pct'])
+        assert plan.field_loss[i] == simulator.calculate_field_loss(point['distance_km'], point['gradient_pct'])
+        assert plan.fatigue[i] == simulator.calculate_fatigue_impact(prev_point['distance_km'])
+
+
+def test_precompiled_plan_gives_the_same_race(simulator, elevation_profile):
+    scenario = {
+        'environment': EnvironmentalConditions(temperature_celsius=18.0),
+        'nutrition': NutritionStrategy(),
+        'fitness_level': 1.05,
+    }
+    draws = RaceDraws.sample(np.random.default_rng(0), 1, len(elevation_profile) - 1)
+    plan = simulator.compile_plan(elevation_profile)
+    with_plan = simulator.simulate_race(elevation_profile, scenario, draws=draws[0], plan=plan)
+    without_plan = simulator.simulate_race(elevation_profile, scenario, draws=draws[0])
+    assert with_plan['summary']['total_time_hours'] == without_plan['summary']['total_time_hours']
+
+
+def test_timing_slots_point_at_checkpoints_and_key_segments(elevation_profile, cutoff_course_path):
+    plan = DigitalTwinV32(ATHLETE_PROFILE, cutoff_course_path).compile_plan(elevation_profile)
+    timing = plan.timing_segments
+    assert (np.diff(timing) > 0).all()
+    np.testing.assert_array_equal(timing[plan.checkpoint_slot], plan.checkpoint_segment)
+    np.testing.assert_array_equal(timing[plan.key_segment_end_slot], plan.key_segment_end)
+    started = plan.key_segment_start >= 0
+    np.testing.assert_array_equal(timing[plan.key_segment_start_slot][started], plan.key_segment_start[started])
+    assert not started.all()
+
+
+def test_in_place_edit_recompiles_the_plan(simulator, elevation_profile):
+    edited = copy.deepcopy(elevation_profile)
+    plan = simulator.compile_plan(edited)
+    edited[5]['gradient_pct'] += 1.0
+    recompiled = simulator.compile_plan(edited)
+    assert recompiled.key != plan.key
+    assert recompiled.base_speed_kmh[4] == simulator.get_base_speed(edited[5]['gradient_pct'])
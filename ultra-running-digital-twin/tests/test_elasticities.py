@@ -0,0 +1,36 @@
+"""Finish-time elasticities: direct terms, the finite-difference fallback and chunk merging"""
+
+import numpy as np
+import pytest
+
+from src import DigitalTwinV32, run_elasticity_analysis
+
+RUN = {'num_simulations': 400, 'chunk_size': 200, 'seed': 5, 'verbose': False}
+
+
+@pytest.fixture(scope='module')
+def elasticities(elevation_profile, athlete_path, course_path):
+    return run_elasticity_analysis(elevation_profile, athlete_path, course_path, **RUN)
+
+
+def test_finite_differences_are_close_to_the_direct_terms(elasticities):
+    factors = elasticities['factors']
+    assert list(factors.index) == list(DigitalTwinV32.SPEED_FACTORS)
+    # Heart rate, zone 3 and respiratory thresholds only add a small indirect effect
+    assert factors['total_hours'].to_numpy() == pytest.approx(factors['direct_hours'].to_numpy(), rel=0.02)
+    assert (factors['direct_hours'] < 0).all()
+
+
+def test_direct_terms_add_up_to_moving_time(simulator, elevation_profile, elasticities):
+    factors = elasticities['factors']
+    # Every factor but nutrition scales speed on every segment
+    direct = factors['direct_hours'].drop('nutrition')
+    assert direct.to_numpy() == pytest.approx(np.full(len(direct), direct.iloc[0]))
+    assert -direct.iloc[0] < elasticities['mean_time_hours']
+    assert -elasticities['segments'].sum().drop('nutrition').to_numpy() == pytest.approx(-direct.to_numpy(), rel=1e-9)
+    assert len(elasticities['segments']) == simulator.compile_plan(elevation_profile).n_segments
+
+
+def test_worker_count_does_not_change_elasticities(elevation_profile, athlete_path, course_path, elasticities):
+    parallel = run_elasticity_analysis(elevation_profile, athlete_path, course_path, n_workers=2, **RUN)
+    assert parallel['factors'].to_numpy() == pytest.approx(elasticities['factors'].to_numpy())
@@ -0,0 +1,74 @@
+"""Field simulator: a one-athlete field is a plain batch on shared conditions, and standings"""
+
+import dataclasses
+import warnings
+
+import numpy as np
+import pytest
+
+from src import FieldSimulator, ScenarioSampler
+from src.field_simulator import SHARED_CONDITIONS, field_standings
+
+
+def test_single_athlete_field_matches_batch(elevation_profile, athlete_path, course_path, simulator):
+    field = FieldSimulator([athlete_path], course_path)
+    result = field.simulate(elevation_profile, 300, seed=3)
+
+    sampler = ScenarioSampler.for_course(simulator.course_profile)
+    rng = np.random.default_rng(3)
+    conditions = sampler.sample(300, rng)
+    personal = sampler.sample(300, rng)
+    scenarios = dataclasses.replace(personal, **{name: getattr(conditions, name) for name in SHARED_CONDITIONS})
+    plan = simulator.compile_plan(elevation_profile)
+    draws = sampler.sample_race_draws(300, plan.n_segments, rng)
+    batch = simulator.simulate_batch(
+        elevation_profile, scenarios, scenarios.pacing_strategy, draws=draws, plan=plan
+    )['summary']
+
+    np.testing.assert_allclose(result['finish_hours'][0], batch['total_time_hours'], rtol=1e-12)
+    assert result['predicted_order'] == field.names
+
+
+
+def test_standings_of_known_times():
+    finish_hours = np.array([[10.0, 12.0, 11.0, 10.0], [11.0, 11.0, 12.0, 10.0]])
+    standings = field_standings(finish_hours, ['A', 'B'])
+    assert standings['summary']['P(Win)'].tolist() == [0.75, 0.25]
+    assert standings['positions'].loc['A'].tolist() == [0.75, 0.25]
+    assert standings['head_to_head'].loc['A', 'B'] == 0.625
+    assert standings['head_to_head'].loc['B', 'A'] == 0.375
+    assert standings['predicted_order'] == ['A', 'B']
+
+
+
+def test_scenarios_without_finishers_have_no_winner():
+    finish_hours = np.array([[np.inf, np.inf, 10.0], [np.inf, np.inf, 11.0]])
+    standings = field_standings(finish_hours, ['A', 'B'])
+    summary = standings['summary']
+    assert summary['P(Win)'].tolist() == pytest.approx([1 / 3, 0.0])
+    assert standings['no_winner_rate'] == pytest.approx(2 / 3)
+    assert summary['P(Win)'].sum() + standings['no_winner_rate'] == pytest.approx(1.0)
+    # Both DNF scenarios put everyone in the shared last place
+    assert summary['Expected Position'].tolist() == pytest.approx([5 / 3, 2.0])
+    assert standings['positions'].loc['A'].tolist() == pytest.approx([1 / 3, 0.0])
+    assert standings['positions'].loc['B'].tolist() == pytest.approx([0.0, 1 / 3])
+
+
+def test_dnfs_rank_behind_every_finisher():
+    finish_hours = np.array([[np.inf, 12.0], [11.0, np.inf], [13.0, 10.0]])
+    standings = field_standings(finish_hours, ['A', 'B', 'C'])
+    summary = standings['summary']
+    assert summary['P(Win)'].tolist() == [0.0, 0.5, 0.5]
+    assert summary['Expected Position'].tolist() == [2.5, 2.0, 1.5]
+    np.testing.assert_allclose(standings['positions'].sum(axis=1), summary['Finish Rate'])
+    assert standings['no_winner_rate'] == 0.0
+
+def test_field_without_finishers_warns_nothing(elevation_profile, athlete_path, course_path):
+    field = FieldSimulator([athlete_path, athlete_path], course_path, names=['A', 'B'])
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        result = field.simulate(elevation_profile, 50, time_cap_hours=5.0, seed=3)
+    assert np.isinf(result['finish_hours']).all()
+    assert result['no_winner_rate'] == 1.0
+    assert (result['summary']['P(Win)'] == 0).all()
+    assert result['summary']['Mean (hours)'].isna().all()
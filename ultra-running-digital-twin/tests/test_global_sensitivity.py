@@ -0,0 +1,47 @@
+"""Global sensitivity: the Sobol estimator on Ishigami and the simulator inputs"""
+
+import numpy as np
+import pytest
+from scipy.stats import qmc
+
+from src import global_sensitivity
+from src.global_sensitivity import _sobol_indices
+
+# Inputs with a known ordering; fluid intake does not enter the model
+INPUTS = {'fitness': (0.95, 1.25), 'temperature': (2.0, 24.0), 'calories': (150.0, 300.0), 'fluids': (400.0, 700.0)}
+
+# Ishigami (a=7, b=0.1) first-order and total indices
+ISHIGAMI_S1 = [0.3139, 0.4424, 0.0]
+ISHIGAMI_ST = [0.5576, 0.4424, 0.2437]
+
+
+def ishigami(x: np.ndarray) -> np.ndarray:
+    return np.sin(x[:, 0]) + 7 * np.sin(x[:, 1]) ** 2 + 0.1 * x[:, 2] ** 4 * np.sin(x[:, 0])
+
+
+def test_sobol_indices_match_ishigami():
+    d, n = 3, 2 ** 14
+    rng = np.random.default_rng(0)
+    design = qmc.Sobol(2 * d, scramble=True, seed=rng).random(n)
+    a, b = design[:, :d], design[:, d:]
+    ab = np.repeat(a[None], d, axis=0)
+    ab[np.arange(d), :, np.arange(d)] = b.T
+    unit = np.concatenate([a, b, ab.reshape(-1, d)])
+
+    f = ishigami(-np.pi + 2 * np.pi * unit)
+    indices = _sobol_indices(f.reshape(d + 2, n), ['x1', 'x2', 'x3'], 20, rng)
+    assert indices['S1'].to_numpy() == pytest.approx(ISHIGAMI_S1, abs=0.03)
+    assert indices['ST'].to_numpy() == pytest.approx(ISHIGAMI_ST, abs=0.03)
+    assert (indices['S1 conf'] > 0).all()
+
+
+@pytest.mark.parametrize('method, budget, column', [('sobol', 6000, 'ST'), ('morris', 1000, 'mu_star')])
+def test_simulator_inputs_are_ranked(elevation_profile, athlete_path, course_path, method, budget, column):
+    result = global_sensitivity(
+        elevation_profile, athlete_path, course_path, inputs=INPUTS, outputs=('total_time_hours',),
+        method=method, budget=budget, seed=1
+    )
+    assert result['evaluations'] <= budget
+    indices = result['indices']['total_time_hours'][column]
+    assert list(indices.sort_values(ascending=False).index) == ['fitness', 'temperature', 'calories', 'fluids']
+    assert indices['fluids'] == 0
@@ -0,0 +1,55 @@
+"""Goal solver: the returned fitness is the smallest meeting the target probability"""
+
+import numpy as np
+import pytest
+
+from src import ScenarioSampler, solve_required_fitness
+from src.goal_solver import _success_probability
+
+RUN = {'target_hours': 13.0, 'probability': 0.8, 'num_scenarios': 300, 'seed': 0, 'verbose': False}
+
+
+def common_scenarios(simulator, elevation_profile, num_scenarios, seed):
+    """The solver's scenario set and race draws"""
+    sampler = ScenarioSampler.for_course(simulator.course_profile)
+    rng = np.random.default_rng(seed)
+    scenarios = sampler.sample(num_scenarios, rng)
+    draws = sampler.sample_race_draws(num_scenarios, simulator.compile_plan(elevation_profile).n_segments, rng)
+    return scenarios, draws
+
+
+def test_solution_is_the_smallest_fitness_meeting_the_target(simulator, elevation_profile, athlete_path, course_path):
+    result = solve_required_fitness(elevation_profile, athlete_path, course_path, **RUN)
+    assert result['converged']
+    assert not result['limit_binding']
+    assert result['probability'] >= 0.8
+
+    scenarios, draws = common_scenarios(simulator, elevation_profile, RUN['num_scenarios'], RUN['seed'])
+    at = _success_probability(simulator, elevation_profile, scenarios, draws, result['fitness'], 13.0, False)
+    below = _success_probability(simulator, elevation_profile, scenarios, draws, result['fitness'] - 0.002, 13.0, False)
+    assert at == result['probability']
+    assert below < 0.8
+
+    history = result['bracket_history']
+    assert history['high'].iloc[-1] - history['low'].iloc[-1] <= 0.001
+    assert result['ctl'] is not None
+
+
+def test_lower_limit_is_returned_when_it_meets_the_target(elevation_profile, athlete_path, course_path):
+    result = solve_required_fitness(elevation_profile, athlete_path, course_path, **{**RUN, 'target_hours': 30.0})
+    assert result['fitness'] == 0.5
+    assert result['limit_binding']
+    assert result['converged']
+    assert result['probability'] >= 0.8
+
+
+def test_unreachable_target_returns_no_fitness(elevation_profile, athlete_path, course_path):
+    result = solve_required_fitness(elevation_profile, athlete_path, course_path, **{**RUN, 'target_hours': 2.0})
+    assert result['fitness'] is None
+    assert not result['converged']
+
+
+@pytest.mark.parametrize('kwargs', [{'probability': 1.0}, {'fitness_bracket': (1.2, 1.0)}])
+def test_invalid_settings_raise(elevation_profile, athlete_path, course_path, kwargs):
+    with pytest.raises(ValueError):
+        solve_required_fitness(elevation_profile, athlete_path, course_path, **{**RUN, **kwargs})
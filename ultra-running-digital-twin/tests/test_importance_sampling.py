@@ -0,0 +1,48 @@
+"""Importance sampling: likelihood ratio weights keep estimates unbiased"""
+
+import numpy as np
+import pytest
+
+from src import (
+    ScenarioSampler, run_importance_sampling, run_monte_carlo_simulations, weighted_tail_estimates
+)
+from src.importance_sampling import DEFAULT_TAIL_TILT
+
+
+def test_weighted_sample_recovers_the_target_distribution():
+    sampler = ScenarioSampler(fitness_range=(0.95, 1.15), tilt=DEFAULT_TAIL_TILT)
+    scenarios, weights = sampler.sample_weighted(200000, np.random.default_rng(0))
+    cold = scenarios.weather_scenario == 'Cold Day'
+    assert weights.mean() == pytest.approx(1.0, abs=0.01)
+    assert cold.mean() > 0.3
+    assert np.average(cold, weights=weights) == pytest.approx(0.2, abs=0.005)
+    assert scenarios.fitness_level.mean() < 1.04
+    assert np.average(scenarios.fitness_level, weights=weights) == pytest.approx(1.05, abs=0.001)
+
+
+def test_untilted_sampler_has_unit_weights():
+    _, weights = ScenarioSampler().sample_weighted(100, np.random.default_rng(1))
+    np.testing.assert_array_equal(weights, 1.0)
+
+
+def test_weighted_estimates_are_unbiased_and_sharpen_the_tail(elevation_profile, athlete_path, course_path):
+    plain = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, 10000, seed=1, verbose=False)
+    times = plain['Time (hours)']
+    slow = float(times.quantile(0.95))
+    tilted = run_importance_sampling(
+        elevation_profile, athlete_path, course_path, 4000, slow_finish_hours=slow, seed=2, verbose=False
+    )['estimates']
+    reference = weighted_tail_estimates(plain.iloc[:4000], slow_finish_hours=slow)
+
+    standard_error = times.std() / np.sqrt(4000)
+    assert tilted['mean_time'] == pytest.approx(times.mean(), abs=4 * standard_error)
+    p_slow = tilted['p_slow_finish']
+    assert p_slow['estimate'] == pytest.approx(0.05, abs=3 * p_slow['standard_error'])
+    assert p_slow['standard_error'] < reference['p_slow_finish']['standard_error']
+    assert 0 < tilted['ess_fraction'] < 1
+
+
+@pytest.mark.parametrize('tilt', [{'pacing': {'even': 0.0}}, {'fitness': (0.0, 1.0)}, {'fitness': (1.0, np.inf)}])
+def test_non_positive_tilt_raises(tilt):
+    with pytest.raises(ValueError):
+        ScenarioSampler(tilt=tilt)
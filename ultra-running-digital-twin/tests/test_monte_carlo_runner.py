@@ -0,0 +1,141 @@
+"""Monte Carlo runners: reproducibility, checkpoint resume and analysis"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import analyze_results, run_monte_carlo_simulations, run_monte_carlo_streaming
+
+RUN = {'num_simulations': 300, 'chunk_size': 100, 'seed': 11, 'verbose': False}
+
+
+def test_results_do_not_depend_on_worker_count(elevation_profile, athlete_path, course_path):
+    serial = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, n_workers=1, **RUN)
+    parallel = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, n_workers=2, **RUN)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_seed_controls_the_results(elevation_profile, athlete_path, course_path):
+    first = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **RUN)
+    second = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **RUN)
+    other = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **dict(RUN, seed=12))
+    pd.testing.assert_frame_equal(first, second)
+    assert len(first) == RUN['num_simulations']
+    assert not first['Time (hours)'].equals(other['Time (hours)'])
+
+
+def test_streaming_matches_dataframe_analysis(elevation_profile, athlete_path, course_path):
+    analysis = analyze_results(run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **RUN))
+    streamed = run_monte_carlo_streaming(elevation_profile, athlete_path, course_path, **RUN)
+    assert streamed['total_simulations'] == analysis['total_simulations']
+    for name in ('mean', 'std', 'min', 'max', 'median'):
+        assert streamed['time_statistics'][name] == pytest.approx(analysis['time_statistics'][name], rel=1e-9)
+    assert streamed['respiratory_statistics'] == pytest.approx(analysis['respiratory_statistics'])
+
+
+def test_streaming_does_not_depend_on_worker_count(elevation_profile, athlete_path, course_path):
+    serial = run_monte_carlo_streaming(elevation_profile, athlete_path, course_path, n_workers=1, **RUN)
+    parallel = run_monte_carlo_streaming(elevation_profile, athlete_path, course_path, n_workers=2, **RUN)
+    assert serial['time_statistics'] == parallel['time_statistics']
+
+
+def test_checkpoint_resume_matches_uninterrupted_run(elevation_profile, athlete_path, course_path, tmp_path):
+    reference = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **RUN)
+
+    checkpoint_dir = str(tmp_path / 'checkpoint')
+    run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, checkpoint_dir=checkpoint_dir, **RUN)
+    # Interrupted after the first chunk
+    for name in ('chunk_000001.npz', 'chunk_000002.npz'):
+        os.remove(os.path.join(checkpoint_dir, name))
+    resumed = run_monte_carlo_simulations(
+        elevation_profile, athlete_path, course_path, checkpoint_dir=checkpoint_dir, **dict(RUN, seed=None)
+    )
+    pd.testing.assert_frame_equal(reference, resumed)
+
+
+def test_streaming_checkpoint_resumes_to_the_same_analysis(elevation_profile, athlete_path, course_path, tmp_path):
+    checkpoint_dir = str(tmp_path / 'checkpoint')
+    first = run_monte_carlo_streaming(
+        elevation_profile, athlete_path, course_path, checkpoint_dir=checkpoint_dir, **RUN
+    )
+    resumed = run_monte_carlo_streaming(
+        elevation_profile, athlete_path, course_path, checkpoint_dir=checkpoint_dir, **dict(RUN, seed=None)
+    )
+    assert resumed['time_statistics'] == first['time_statistics']
+
+
+def test_checkpoint_rejects_different_settings(elevation_profile, athlete_path, course_path, tmp_path):
+    checkpoint_dir = str(tmp_path / 'checkpoint')
+    run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, checkpoint_dir=checkpoint_dir, **RUN)
+    with pytest.raises(ValueError):
+        run_monte_carlo_simulations(
+            elevation_profile, athlete_path, course_path, checkpoint_dir=checkpoint_dir, **dict(RUN, chunk_size=150)
+        )
+
+
+@pytest.mark.parametrize('stop_rules', [{'time_cap_hours': 12.5}, {'cutoffs': True}])
+def test_streaming_dnf_statistics_match_dataframe(elevation_profile, athlete_path, cutoff_course_path, stop_rules):
+    options = dict(RUN, **stop_rules)
+    results_df = run_monte_carlo_simulations(elevation_profile, athlete_path, cutoff_course_path, **options)
+    analysis = analyze_results(results_df)
+    streamed = run_monte_carlo_streaming(elevation_profile, athlete_path, cutoff_course_path, **options)
+    assert 0 < analysis['dnf_statistics']['dnf_rate'] < 1
+    assert analysis['dnf_statistics']['dnf_rate'] == pytest.approx(results_df['DNF'].mean())
+    assert streamed['dnf_statistics'] == analysis['dnf_statistics']
+    assert streamed['time_statistics']['mean'] == pytest.approx(analysis['time_statistics']['mean'])
+
+
+def test_checkpoint_arrivals_and_splits(elevation_profile, athlete_path, cutoff_course_path):
+    results_df = run_monte_carlo_simulations(elevation_profile, athlete_path, cutoff_course_path, splits=True, **RUN)
+    arrivals = results_df[['CP1 Arrival (hours)', 'CP2 Arrival (hours)', 'End Arrival (hours)']].to_numpy()
+    assert (np.diff(arrivals, axis=1) > 0).all()
+    assert (results_df['Opening Split (hours)'] < arrivals[:, 0]).all()
+
+    analysis = analyze_results(results_df)
+    checkpoints = analysis['checkpoint_statistics']
+    assert all(entry['reached_rate'] == 1.0 for entry in checkpoints.values())
+    assert checkpoints['CP2']['mean'] == pytest.approx(arrivals[:, 1].mean())
+    assert checkpoints['CP2']['p_miss_cutoff'] == pytest.approx((arrivals[:, 1] > 8.5).mean())
+    assert set(analysis['split_statistics']) == {'Opening', 'Middle'}
+
+    streamed = run_monte_carlo_streaming(elevation_profile, athlete_path, cutoff_course_path, splits=True, **RUN)
+    for name, entry in checkpoints.items():
+        assert streamed['checkpoint_statistics'][name]['mean'] == pytest.approx(entry['mean'])
+        assert streamed['checkpoint_statistics'][name]['p_miss_cutoff'] == pytest.approx(entry.get('p_miss_cutoff'))
+
+
+@pytest.mark.parametrize('stop_rule', [{'time_cap_hours': 12.5}, {'cutoffs': True}])
+def test_runs_stopped_at_a_checkpoint_do_not_reach_it(elevation_profile, athlete_path, cutoff_course_path, stop_rule):
+    results_df = run_monte_carlo_simulations(
+        elevation_profile, athlete_path, cutoff_course_path, splits=True, **stop_rule, **RUN
+    )
+    analysis = analyze_results(results_df)
+    checkpoints = analysis['checkpoint_statistics']
+    dnf = results_df['DNF']
+    assert dnf.any()
+    assert checkpoints['End']['reached_rate'] == pytest.approx(1 - dnf.mean())
+    for name, entry in checkpoints.items():
+        stopped_before = dnf & results_df[f'{name} Arrival (hours)'].isna()
+        stopped_there = dnf & (results_df['DNF Checkpoint'] == name)
+        assert entry['reached_rate'] == pytest.approx(1 - (stopped_before | stopped_there).mean())
+
+    streamed = run_monte_carlo_streaming(
+        elevation_profile, athlete_path, cutoff_course_path, splits=True, **stop_rule, **RUN
+    )
+    for name, entry in checkpoints.items():
+        assert streamed['checkpoint_statistics'][name]['reached_rate'] == pytest.approx(entry['reached_rate'])
+
+
+def test_time_statistics_are_nan_without_finishers(elevation_profile, athlete_path, course_path):
+    kwargs = {'time_cap_hours': 5.0, **RUN}
+    streamed = run_monte_carlo_streaming(elevation_profile, athlete_path, course_path, **kwargs)
+    assert streamed['dnf_statistics']['dnf_rate'] == 1.0
+    times = streamed['time_statistics']
+    assert all(np.isnan(times[name]) for name in ('mean', 'median', 'std', 'min', 'max', 'p10', 'p90'))
+
+    results_df = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **kwargs)
+    expected = analyze_results(results_df)['time_statistics']
+    assert set(expected) == set(times)
+    assert all(np.isnan(value) for value in expected.values())
@@ -0,0 +1,40 @@
+"""Paired pacing strategy comparison on common random numbers"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import compare_pacing_strategies
+
+STRATEGIES = ['even', 'conservative', 'aggressive', 'negative_split']
+RUN = {'num_scenarios': 400, 'strategies': STRATEGIES, 'chunk_size': 100, 'seed': 2, 'verbose': False}
+
+
+@pytest.fixture(scope='module')
+def comparison(elevation_profile, athlete_path, course_path):
+    return compare_pacing_strategies(elevation_profile, athlete_path, course_path, **RUN)
+
+
+def test_pairing_removes_the_shared_scenario_noise(comparison):
+    times = comparison['times']
+    for row in comparison['pairwise'].itertuples():
+        a, b = times[row.strategy_a], times[row.strategy_b]
+        unpaired_std = np.sqrt(a.var() + b.var()) * 60
+        assert row.std_diff_min < unpaired_std / 3
+        assert row.mean_diff_min == pytest.approx((a.mean() - b.mean()) * 60)
+        assert row.ci_low_min < row.mean_diff_min < row.ci_high_min
+
+
+def test_win_probabilities_are_complementary(comparison):
+    wins = comparison['win_probability']
+    ties = 1 - wins - wins.T
+    np.testing.assert_allclose(np.diag(wins), 0)
+    assert (ties.to_numpy() >= -1e-12).all()
+    strategies = comparison['strategies']
+    assert strategies['p_fastest'].sum() == pytest.approx(1.0)
+    assert strategies['mean_rank'].is_monotonic_increasing
+
+
+def test_comparison_does_not_depend_on_worker_count(elevation_profile, athlete_path, course_path, comparison):
+    parallel = compare_pacing_strategies(elevation_profile, athlete_path, course_path, n_workers=2, **RUN)
+    pd.testing.assert_frame_equal(parallel['times'], comparison['times'])
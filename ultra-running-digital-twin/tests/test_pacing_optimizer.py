@@ -0,0 +1,59 @@
+"""Pacing optimisation: the optimum beats even pacing and respects its caps"""
+
+import numpy as np
+import pytest
+
+from src import optimize_pacing
+
+RUN = {'num_scenarios': 50, 'blocks': 4, 'seed': 2, 'verbose': False}
+
+
+@pytest.fixture(scope='module')
+def unconstrained(elevation_profile, athlete_path, course_path):
+    return optimize_pacing(elevation_profile, athlete_path, course_path, **RUN)
+
+
+def test_optimum_beats_even_pacing(unconstrained):
+    assert unconstrained['success']
+    assert unconstrained['optimized']['mean_time_hours'] < unconstrained['baseline']['mean_time_hours']
+    effort = unconstrained['blocks']['Effort']
+    assert ((effort >= 0.85 - 1e-9) & (effort <= 1.15 + 1e-9)).all()
+
+
+def test_plan_covers_the_course(unconstrained):
+    blocks, plan = unconstrained['blocks'], unconstrained['plan']
+    assert blocks['Start (km)'].iloc[0] == 0
+    assert np.allclose(blocks['Start (km)'].iloc[1:].to_numpy(), blocks['End (km)'].iloc[:-1].to_numpy())
+    assert plan['End (km)'].iloc[-1] == pytest.approx(blocks['End (km)'].iloc[-1])
+    assert (np.diff(plan['Cumulative (hours)']) > 0).all()
+    assert set(plan['Effort']) <= set(blocks['Effort'])
+
+
+def test_incident_cap_is_respected(elevation_profile, athlete_path, course_path, unconstrained):
+    cap = unconstrained['baseline']['incidents']
+    result = optimize_pacing(
+        elevation_profile, athlete_path, course_path, max_expected_incidents=cap, **RUN
+    )
+    assert unconstrained['optimized']['incidents'] > cap
+    assert result['optimized']['incidents'] <= cap + 1e-9
+    assert result['optimized']['mean_time_hours'] < result['baseline']['mean_time_hours']
+    assert result['optimized']['mean_time_hours'] >= unconstrained['optimized']['mean_time_hours'] - 1e-9
+
+
+@pytest.mark.parametrize('kwargs', [{'effort_bounds': (1.1, 0.9)}, {'blocks': 'laps'}, {'blocks': 0}])
+def test_invalid_settings_raise(elevation_profile, athlete_path, course_path, kwargs):
+    with pytest.raises(ValueError):
+        optimize_pacing(elevation_profile, athlete_path, course_path, **{**RUN, **kwargs})
+
+
+def test_heart_rate_cap_is_respected(elevation_profile, athlete_path, course_path, unconstrained):
+    cap = unconstrained['baseline']['hr_percentile']
+    result = optimize_pacing(elevation_profile, athlete_path, course_path, max_hr=cap, **RUN)
+    assert unconstrained['optimized']['hr_percentile'] > cap
+    assert result['optimized']['hr_percentile'] <= cap + 1e-9
+    assert result['optimized']['mean_time_hours'] < result['baseline']['mean_time_hours']
+
+
+def test_max_hr_at_the_profile_max_raises(elevation_profile, athlete_path, course_path, simulator):
+    with pytest.raises(ValueError):
+        optimize_pacing(elevation_profile, athlete_path, course_path, max_hr=simulator.heart_rate['max_hr'], **RUN)
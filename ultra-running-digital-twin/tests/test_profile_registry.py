@@ -0,0 +1,102 @@
+"""Profile registry: lazy profiles behave like json.load and the disk cache is reused"""
+
+import copy
+import json
+import os
+import pickle
+import shutil
+import zlib
+
+from src import DigitalTwinV32, FieldSimulator, profile_registry
+from src.profile_registry import LazyProfile, ProfileRegistry, load_simulator
+
+
+def test_lazy_profile_matches_json(athlete_path, tmp_path):
+    profile = ProfileRegistry(cache_dir=str(tmp_path)).load(athlete_path)
+    assert profile.lazy_sections
+    with open(athlete_path, 'r') as f:
+        parsed = json.load(f)
+    assert profile == parsed
+    assert list(profile) == list(parsed)
+    assert json.dumps(profile) == json.dumps(parsed)
+
+
+def test_lazy_profile_copies_stay_lazy(athlete_path, tmp_path):
+    profile = ProfileRegistry(cache_dir=str(tmp_path)).load(athlete_path)
+    lazy_sections = profile.lazy_sections
+    clones = [pickle.loads(pickle.dumps(profile)), copy.deepcopy(profile)]
+    for clone in clones:
+        assert clone.lazy_sections == lazy_sections
+        assert clone == profile
+
+
+def test_registry_simulator_matches_file_simulator(athlete_path, course_path, tmp_path):
+    simulator = ProfileRegistry(cache_dir=str(tmp_path)).simulator(athlete_path, course_path)
+    assert simulator.profile_key == DigitalTwinV32(athlete_path, course_path).profile_key
+
+
+def test_disk_cache_is_reused_until_contents_change(athlete_path, tmp_path, monkeypatch):
+    path = str(tmp_path / 'athlete.json')
+    shutil.copy(athlete_path, path)
+    cache_dir = str(tmp_path / 'cache')
+    expected = ProfileRegistry(cache_dir=cache_dir).load(path)
+
+    def no_parse(path, profile, digest):
+        raise AssertionError("profile was re-parsed")
+
+    # A fresh registry, and a touched but unchanged file, use the cache entry
+    monkeypatch.setattr(profile_registry, '_encode_entry', no_parse)
+    assert ProfileRegistry(cache_dir=cache_dir).load(path) == expected
+    os.utime(path)
+    assert ProfileRegistry(cache_dir=cache_dir).load(path) == expected
+    monkeypatch.undo()
+
+    with open(path, 'r') as f:
+        edited = json.load(f)
+    edited['athlete_info']['name'] = 'Edited'
+    with open(path, 'w') as f:
+        json.dump(edited, f)
+    assert ProfileRegistry(cache_dir=cache_dir).load(path)['athlete_info']['name'] == 'Edited'
+
+
+def test_cache_entries_hold_no_pickles(athlete_path, tmp_path):
+    registry = ProfileRegistry(cache_dir=str(tmp_path))
+    registry.load(athlete_path)
+    with open(athlete_path, 'r') as f:
+        parsed = json.load(f)
+    with open(registry.cache_path(athlete_path), 'rb') as f:
+        header = json.loads(f.readline())
+        blobs = f.read()
+    assert header['lazy_sizes']
+    offset = 0
+    for key, size in header['lazy_sizes']:
+        section = json.loads(zlib.decompress(blobs[offset:offset + size]))
+        assert section == parsed[key]
+        offset += size
+    assert offset == len(blobs)
+
+
+def test_damaged_cache_entry_is_rebuilt(athlete_path, tmp_path):
+    path = str(tmp_path / 'athlete.json')
+    shutil.copy(athlete_path, path)
+    cache_dir = str(tmp_path / 'cache')
+    registry = ProfileRegistry(cache_dir=cache_dir)
+    expected = copy.deepcopy(registry.load(path))
+    cache_path = registry.cache_path(path)
+    with open(cache_path, 'rb') as f:
+        data = f.read()
+    for damaged in (data[:-10], data + b'trailing', b'not json\n' + data, pickle.dumps({'sections': {}})):
+        with open(cache_path, 'wb') as f:
+            f.write(damaged)
+        assert ProfileRegistry(cache_dir=cache_dir).load(path) == expected
+        with open(cache_path, 'rb') as f:
+            assert f.read() == data
+
+
+def test_runners_share_registry_profiles(athlete_path, course_path, profile_cache):
+    simulator = load_simulator(athlete_path, course_path)
+    assert isinstance(simulator.athlete_profile, LazyProfile)
+    assert simulator.athlete_profile is profile_cache.load(athlete_path)
+    assert simulator.course_profile is profile_cache.load(course_path)
+    field = FieldSimulator([athlete_path, athlete_path], course_path, names=['A', 'B'])
+    assert all(member.athlete_profile is simulator.athlete_profile for member in field.simulators)
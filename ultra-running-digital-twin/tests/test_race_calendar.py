@@ -0,0 +1,60 @@
+"""Race calendar: each row is the streaming Monte Carlo of that race"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src import CalendarRace, run_monte_carlo_streaming, run_race_calendar
+from src.ctl_fitness_tracker import CTLFitnessTracker
+from src.race_calendar import race_fitness
+
+from .conftest import ATHLETE_PROFILE, COURSE_PROFILE, ELEVATION_PROFILE
+
+RUN = {'num_simulations': 300, 'chunk_size': 100, 'seed': 9, 'verbose': False}
+
+RACES = [
+    CalendarRace(COURSE_PROFILE, ELEVATION_PROFILE, '2026-03-15', 'calendar', name='Chianti'),
+    CalendarRace(COURSE_PROFILE, ELEVATION_PROFILE, '2026-01-10', (1.0, 1.1), name='Chianti Recce'),
+]
+
+
+@pytest.fixture(scope='module')
+def calendar():
+    return run_race_calendar(ATHLETE_PROFILE, RACES, n_workers=1, **RUN)
+
+
+def test_rows_match_standalone_streaming_runs(elevation_profile, athlete_path, course_path, calendar):
+    assert calendar.index.tolist() == ['Chianti Recce', 'Chianti']
+    for name, fitness_range in [('Chianti Recce', (1.0, 1.1)), ('Chianti', (1.35, 1.35))]:
+        streaming = run_monte_carlo_streaming(
+            elevation_profile, athlete_path, course_path, fitness_range=fitness_range, **RUN
+        )
+        row = calendar.loc[name]
+        times = streaming['time_statistics']
+        assert row['Fitness'] == pytest.approx(np.mean(fitness_range))
+        assert row['Mean (hours)'] == pytest.approx(times['mean'], rel=1e-12)
+        assert row['P50 (hours)'] == times['median']
+        assert row['P90 (hours)'] == times['p90']
+        assert row['Mean Incidents'] == pytest.approx(streaming['respiratory_statistics']['mean_incidents'])
+    assert calendar.loc['Chianti', 'Fitness Source'] == 'calendar:chianti_74k'
+
+
+def test_worker_processes_give_the_same_table(calendar):
+    parallel = run_race_calendar(ATHLETE_PROFILE, RACES, n_workers=2, **RUN)
+    assert parallel.equals(calendar)
+
+
+def test_fitness_sources(athlete_path):
+    with open(athlete_path, 'r') as f:
+        athlete = json.load(f)
+    race = CalendarRace(COURSE_PROFILE, ELEVATION_PROFILE, '2026-02-09', 1.1)
+    assert race_fitness(athlete, race, 0.05) == (pytest.approx((1.05, 1.15)), 'fixed')
+    race.fitness = 'calendar'
+    assert race_fitness(athlete, race) == ((1.15, 1.15), 'calendar:arc_of_attrition')
+    race.fitness = {'ctl': 60}
+    fitness = CTLFitnessTracker().ctl_to_fitness(60)
+    assert race_fitness(athlete, race) == ((fitness, fitness), 'ctl:60')
+    race.fitness = 'training'
+    with pytest.raises(ValueError):
+        race_fitness(athlete, race)
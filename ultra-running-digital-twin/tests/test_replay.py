@@ -0,0 +1,65 @@
+"""Run replay: re-simulated runs match their summary rows exactly"""
+
+import pytest
+
+from src import RunReplayer, ScenarioSampler, run_monte_carlo_simulations, run_monte_carlo_to_store
+
+RUN = {'num_simulations': 600, 'chunk_size': 250, 'seed': 5, 'verbose': False}
+
+
+def assert_replays_match(results_df, replayer, run_ids=(1, 260, 600)):
+    for run_id in run_ids:
+        row = results_df.loc[results_df['Simulation'] == run_id].iloc[0]
+        replay = replayer.replay(run_id)
+        assert replay['summary']['total_time_hours'] == row['Time (hours)']
+        assert len(replay['respiratory_incidents']) == row['Respiratory Incidents']
+        assert replay['run']['simulation'] == run_id
+        assert replay['segments'][-1]['cumulative_time_hours'] == replay['summary']['moving_time_hours']
+
+
+# Chunks of 250 are not a power of two, so the Sobol design warns
+SOBOL = pytest.param({'sampling_scheme': 'sobol'}, marks=pytest.mark.filterwarnings('ignore:The balance properties'))
+
+
+@pytest.mark.parametrize('options', [{}, {'time_cap_hours': 12.5}, SOBOL])
+def test_replay_reproduces_summary_rows(elevation_profile, athlete_path, course_path, options):
+    results_df = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **RUN, **options)
+    replayer = RunReplayer.from_results(results_df, elevation_profile, athlete_path, course_path)
+    assert_replays_match(results_df, replayer)
+
+
+def test_replay_from_a_result_store(elevation_profile, athlete_path, course_path, tmp_path):
+    store = run_monte_carlo_to_store(elevation_profile, athlete_path, course_path, str(tmp_path / 'runs'), **RUN)
+    replayer = RunReplayer.from_results(store, elevation_profile, athlete_path, course_path)
+    assert_replays_match(store.to_dataframe(), replayer, (7, 599))
+
+
+def test_replay_rejects_unknown_runs_and_other_samplers(elevation_profile, athlete_path, course_path):
+    results_df = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **RUN)
+    replayer = RunReplayer.from_results(results_df, elevation_profile, athlete_path, course_path)
+    with pytest.raises(ValueError):
+        replayer.replay(601)
+    with pytest.raises(ValueError):
+        RunReplayer.from_results(
+            results_df, elevation_profile, athlete_path, course_path, sampler=ScenarioSampler(fitness_range=(0.8, 0.9))
+        )
+
+
+def test_replay_many_simulates_only_the_requested_runs(elevation_profile, athlete_path, course_path, monkeypatch):
+    results_df = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **RUN)
+    replayer = RunReplayer.from_results(results_df, elevation_profile, athlete_path, course_path)
+    simulate_batch = replayer.simulator.simulate_batch
+    batch_sizes = []
+
+    def recording(elevation_profile, scenarios, *args, **kwargs):
+        batch_sizes.append(len(scenarios))
+        return simulate_batch(elevation_profile, scenarios, *args, **kwargs)
+
+    monkeypatch.setattr(replayer.simulator, 'simulate_batch', recording)
+    replays = replayer.replay_many([5, 3, 260])
+    assert batch_sizes == [2, 1]
+    assert replays[3]['run'] == {'simulation': 3, 'chunk': 0, 'offset': 2}
+    for run_id, replay in replays.items():
+        row = results_df.loc[results_df['Simulation'] == run_id].iloc[0]
+        assert replay['summary']['total_time_hours'] == row['Time (hours)']
+        assert replay['conditions']['fitness_level'] == row['Fitness Level']
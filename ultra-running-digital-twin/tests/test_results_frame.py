@@ -0,0 +1,41 @@
+"""Compact result frames and their export"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import run_monte_carlo_simulations, to_arrow, with_finish_times, write_parquet
+from src.results_frame import CATEGORICAL_COLUMNS, finish_time_strings
+
+RUN = {'num_simulations': 300, 'chunk_size': 100, 'seed': 6, 'verbose': False}
+
+
+@pytest.fixture(scope='module')
+def results_df(elevation_profile, athlete_path, course_path):
+    return run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **RUN)
+
+
+def test_string_columns_are_categoricals_with_shared_categories(results_df):
+    for column in CATEGORICAL_COLUMNS:
+        assert isinstance(results_df[column].dtype, pd.CategoricalDtype)
+    assert 'Finish Time' not in results_df
+    assert results_df['Time (hours)'].dtype == np.float64
+    # Every chunk used the same category lists, so nothing fell back to object
+    assert (results_df.dtypes != object).all()
+
+
+def test_finish_time_strings_match_format_time(results_df, simulator):
+    hours = results_df['Time (hours)'].to_numpy()
+    assert finish_time_strings(hours).tolist() == [simulator.format_time(h) for h in hours]
+    formatted = with_finish_times(results_df)
+    assert formatted['Finish Time'].iloc[0] == simulator.format_time(hours[0])
+    assert 'Finish Time' not in results_df
+
+
+def test_arrow_export_round_trips(results_df, tmp_path):
+    pytest.importorskip('pyarrow')
+    table = to_arrow(results_df)
+    assert table.num_rows == len(results_df)
+    path = str(tmp_path / 'results.parquet')
+    write_parquet(results_df, path)
+    pd.testing.assert_frame_equal(pd.read_parquet(path), results_df, check_categorical=False)
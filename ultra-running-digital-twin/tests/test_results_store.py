@@ -0,0 +1,85 @@
+"""ResultStore scans against the in-memory results"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import ResultStore, analyze_results, run_monte_carlo_simulations, run_monte_carlo_to_store
+
+RUN = {'num_simulations': 500, 'chunk_size': 120, 'seed': 4, 'verbose': False}
+
+
+@pytest.fixture(scope='module')
+def results(elevation_profile, athlete_path, course_path, tmp_path_factory):
+    store_dir = str(tmp_path_factory.mktemp('store') / 'runs')
+    store = run_monte_carlo_to_store(elevation_profile, athlete_path, course_path, store_dir, **RUN)
+    results_df = run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, **RUN)
+    return store, results_df
+
+
+def test_store_holds_every_run(results):
+    store, results_df = results
+    assert len(store) == len(results_df)
+    assert sum(len(frame) for frame in store.scan()) == len(results_df)
+    assert sum(len(frame) for frame in store.scan(chunk_rows=50)) == len(results_df)
+
+
+@pytest.mark.parametrize('where, mask', [
+    ("fitness > 1.1 and temp < 8", lambda df: (df['Fitness Level'] > 1.1) & (df['Temperature (°C)'] < 8)),
+    ("`Pacing Strategy` == 'even'", lambda df: df['Pacing Strategy'] == 'even'),
+    ("pacing == 'even' and incidents >= 2", lambda df: (df['Pacing Strategy'] == 'even') & (df['Respiratory Incidents'] >= 2)),
+    ("Simulation <= 10 or Chunk == 3", lambda df: (df['Simulation'] <= 10) | (df['Chunk'] == 3)),
+])
+def test_scan_row_counts_match_dataframe_filter(results, where, mask):
+    store, results_df = results
+    expected = results_df[mask(results_df).to_numpy(dtype=bool)]
+    assert sum(len(frame) for frame in store.scan(where)) == len(expected)
+    scanned = store.to_dataframe(where)
+    np.testing.assert_array_equal(scanned['Simulation'].to_numpy(), expected['Simulation'].to_numpy())
+
+
+def test_store_reopens_and_analyses_like_dataframe(results):
+    store, results_df = results
+    reopened = ResultStore(store.directory)
+    assert len(reopened) == len(results_df)
+    pd.testing.assert_series_equal(
+        reopened.to_dataframe()['Time (hours)'], results_df['Time (hours)'], check_names=False
+    )
+    stored = reopened.analyze()['time_statistics']
+    expected = analyze_results(results_df)['time_statistics']
+    assert stored['mean'] == pytest.approx(expected['mean'])
+    assert (stored['min'], stored['max']) == (expected['min'], expected['max'])
+
+
+def test_column_reads_every_shard(results):
+    store, results_df = results
+    np.testing.assert_array_equal(store.column('time'), results_df['Time (hours)'].to_numpy())
+    pacing = store.column('pacing')
+    assert isinstance(pacing, pd.Categorical)
+    assert list(pacing) == list(results_df['Pacing Strategy'])
+
+
+def test_callable_filter_and_column_selection(results):
+    store, results_df = results
+    scanned = store.to_dataframe(lambda df: df['Fitness Level'] < 1.0, columns=['simulation', 'time'])
+    expected = results_df[results_df['Fitness Level'] < 1.0]
+    assert list(scanned.columns) == ['Simulation', 'Time (hours)']
+    np.testing.assert_array_equal(scanned['Time (hours)'].to_numpy(), expected['Time (hours)'].to_numpy())
+
+
+def test_bare_column_names_filter_stopped_runs(elevation_profile, athlete_path, course_path, tmp_path):
+    store = run_monte_carlo_to_store(
+        elevation_profile, athlete_path, course_path, str(tmp_path / 'runs'), time_cap_hours=12.5, **RUN
+    )
+    stopped = store.to_dataframe("DNF", columns=['simulation', 'dnf'])
+    dnf = store.column('dnf')
+    assert 0 < len(stopped) < len(store)
+    assert stopped['DNF'].all()
+    assert len(stopped) == dnf.sum()
+
+
+def test_empty_store_gives_an_empty_frame(tmp_path):
+    store = ResultStore.create(str(tmp_path / 'empty'))
+    assert len(store) == 0
+    assert store.to_dataframe().empty
+    assert list(store.to_dataframe(columns=['simulation', 'time']).columns) == ['Simulation', 'Time (hours)']
@@ -0,0 +1,96 @@
+"""Vectorized scenario sampling"""
+
+import numpy as np
+import pytest
+
+from src import RaceDraws, ScenarioSampler
+from src.scenario_sampler import SAMPLE_DIMENSIONS
+
+WEATHER = [
+    {'name': 'Cold', 'temp_c': 4.0, 'precipitation': 'wet'},
+    {'name': 'Hot', 'temp_c': 27.0},
+]
+
+
+def test_samples_stay_in_their_ranges(simulator):
+    sampler = ScenarioSampler.for_course(simulator.course_profile, fitness_range=(0.9, 1.2))
+    scenarios = sampler.sample(2000, np.random.default_rng(0))
+    assert len(scenarios) == 2000
+    assert scenarios.fitness_level.min() >= 0.9 and scenarios.fitness_level.max() <= 1.2
+    low, high = simulator.course_profile['environment_profile']['altitude_band_m']
+    assert scenarios.altitude_m.min() >= low and scenarios.altitude_m.max() <= high
+    assert set(scenarios.pacing_strategy) <= set(simulator.PACING_MULTIPLIERS)
+    assert set(scenarios.pollen_level) == {'low', 'medium'}
+
+
+def test_explicit_weather_scenarios_are_used_as_given():
+    scenarios = ScenarioSampler(weather_scenarios=WEATHER).sample(500, np.random.default_rng(1))
+    cold = scenarios.weather_scenario == 'Cold'
+    assert 0 < cold.sum() < 500
+    assert (scenarios.temperature_c[cold] == 4.0).all() and (scenarios.precipitation[cold] == 'wet').all()
+    assert (scenarios.temperature_c[~cold] == 27.0).all() and (scenarios.precipitation[~cold] == 'dry').all()
+
+
+def test_sampling_is_reproducible():
+    sampler = ScenarioSampler()
+    first = sampler.sample(100, np.random.default_rng(2))
+    second = sampler.sample(100, np.random.default_rng(2))
+    for name, values in vars(first).items():
+        np.testing.assert_array_equal(values, getattr(second, name))
+
+
+def test_scenario_rows_simulate_like_the_batch(simulator, elevation_profile):
+    rng = np.random.default_rng(3)
+    scenarios = ScenarioSampler.for_course(simulator.course_profile).sample(30, rng)
+    draws = RaceDraws.sample(rng, 30, len(elevation_profile) - 1)
+    batch = simulator.simulate_batch(elevation_profile, scenarios, scenarios.pacing_strategy, draws=draws)
+    for i in (0, 17, 29):
+        single = simulator.simulate_race(
+            elevation_profile, scenarios.scenario(i), scenarios.pacing_strategy[i], draws=draws[i], detail='summary'
+        )
+        assert single['summary']['total_time_hours'] == pytest.approx(batch['summary']['total_time_hours'][i], rel=1e-12)
+
+
+def one_point_per_bin(u):
+    """Every column puts exactly one of its n points in each of n equal bins"""
+    n = len(u)
+    return all((np.sort(np.floor(column * n)) == np.arange(n)).all() for column in u.T)
+
+
+@pytest.mark.parametrize('scheme', ['lhs', 'sobol'])
+def test_space_filling_designs_are_balanced(scheme):
+    design = ScenarioSampler(scheme=scheme).design(256, np.random.default_rng(4))
+    assert design.shape == (256, len(SAMPLE_DIMENSIONS))
+    assert one_point_per_bin(design)
+
+
+
+def test_sobol_chunks_are_prefixes_and_warn_off_powers_of_two():
+    sampler = ScenarioSampler(scheme='sobol')
+    full = sampler.design(256, np.random.default_rng(4))
+    with pytest.warns(UserWarning, match='power of 2'):
+        short = sampler.design(250, np.random.default_rng(4))
+    np.testing.assert_array_equal(short, full[:250])
+    assert not one_point_per_bin(short)
+
+def test_antithetic_scheme_mirrors_scenarios_and_race_draws():
+    sampler = ScenarioSampler(scheme='antithetic')
+    rng = np.random.default_rng(5)
+    design = sampler.design(100, rng)
+    np.testing.assert_allclose(design[:50] + design[50:], 1.0)
+    draws = sampler.sample_race_draws(100, 30, rng)
+    np.testing.assert_allclose(draws.incident_uniform[:50] + draws.incident_uniform[50:], 1.0)
+    np.testing.assert_allclose(draws.aid_count_uniform[:50] + draws.aid_count_uniform[50:], 1.0)
+    np.testing.assert_allclose(draws.aid_stop_uniform[:50] + draws.aid_stop_uniform[50:], 1.0)
+
+
+def test_stratified_scheme_allocates_weather_by_weight():
+    sampler = ScenarioSampler(scheme='stratified')
+    scenarios = sampler.sample(1000, np.random.default_rng(6))
+    for component in sampler.weather_mixture:
+        assert (scenarios.weather_scenario == component['name']).sum() == round(1000 * component['weight'])
+
+
+def test_unknown_scheme_is_rejected():
+    with pytest.raises(ValueError):
+        ScenarioSampler(scheme='halton')
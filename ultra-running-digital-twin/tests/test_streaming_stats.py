@@ -0,0 +1,51 @@
+"""Streaming accumulators: exact moments and KLL quantile accuracy"""
+
+import numpy as np
+import pytest
+
+from src.streaming_stats import KLLSketch, RunningMoments
+
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def test_merged_moments_match_numpy():
+    values = np.random.default_rng(0).gamma(4.0, 3.0, 10001)
+    parts = [RunningMoments() for _ in range(3)]
+    for part, chunk in zip(parts, np.array_split(values, 3)):
+        part.update(chunk)
+    total = parts[0]
+    total.merge(parts[1])
+    total.merge(parts[2])
+    assert total.count == len(values)
+    assert total.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert total.std == pytest.approx(values.std(ddof=1), rel=1e-10)
+    assert (total.min, total.max) == (values.min(), values.max())
+
+
+def test_small_sketch_is_exact():
+    values = np.random.default_rng(1).normal(size=300)
+    sketch = KLLSketch(seed=0)
+    sketch.update(values)
+    assert sketch.is_exact
+    for q in QUANTILES:
+        assert sketch.quantile(q) == np.quantile(values, q)
+
+
+@pytest.mark.parametrize('num_parts', [1, 8])
+def test_sketch_rank_error_is_small(num_parts):
+    values = np.random.default_rng(2).lognormal(2.5, 0.2, 200000)
+    sketches = [KLLSketch(seed=seed) for seed in range(num_parts)]
+    for sketch, chunk in zip(sketches, np.array_split(values, num_parts)):
+        for batch in np.array_split(chunk, 20):
+            sketch.update(batch)
+    sketch = sketches[0]
+    for other in sketches[1:]:
+        sketch.merge(other)
+
+    assert not sketch.is_exact
+    assert sum(len(items) for items in sketch.levels) < 5000
+    ordered = np.sort(values)
+    for q in QUANTILES:
+        rank = np.searchsorted(ordered, sketch.quantile(q), side='right') / len(values)
+        assert rank == pytest.approx(q, abs=0.01)
+        assert sketch.cdf(np.quantile(values, q)) == pytest.approx(q, abs=0.01)
@@ -0,0 +1,53 @@
+"""Parameter sweeps: grid cells match single simulate_race calls"""
+
+import numpy as np
+import pytest
+
+from src import EnvironmentalConditions, NutritionStrategy, RaceDraws, sweep
+
+AXES = {
+    'fitness': [1.0, 1.1],
+    'temperature': [8.0, 24.0],
+    'pacing': ['even', 'negative_split'],
+    'start_hour': [6, 8],
+}
+
+
+def test_sweep_cells_match_simulate_race(elevation_profile, athlete_path, course_path, simulator):
+    result = sweep(elevation_profile, athlete_path, course_path, AXES, seed=1)
+    assert result.shape == (2, 2, 2, 2)
+
+    plan = simulator.compile_plan(elevation_profile)
+    draws = RaceDraws.sample(np.random.default_rng(1), 1, plan.n_segments)
+    for cell in ({'fitness': 1.0, 'temperature': 8.0, 'pacing': 'even', 'start_hour': 6},
+                 {'fitness': 1.1, 'temperature': 24.0, 'pacing': 'negative_split', 'start_hour': 8}):
+        scenario = {
+            'environment': EnvironmentalConditions(temperature_celsius=cell['temperature']),
+            'nutrition': NutritionStrategy(),
+            'fitness_level': cell['fitness'],
+            'pollen_level': 'low',
+        }
+        race = simulator.simulate_race(
+            elevation_profile, scenario, cell['pacing'], start_time_hour=cell['start_hour'],
+            draws=draws, plan=plan
+        )
+        assert result.sel(**cell) == pytest.approx(race['summary']['total_time_hours'], rel=1e-12)
+
+
+def test_sweep_results_are_labelled(elevation_profile, athlete_path, course_path):
+    results = sweep(
+        elevation_profile, athlete_path, course_path, {'fitness': [1.0, 1.2]}, replicates=3,
+        metrics=['total_time_hours', 'respiratory_incidents'], seed=2, chunk_size=4
+    )
+    times = results['total_time_hours']
+    assert times.dims == ('fitness', 'replicate') and times.shape == (2, 3)
+    # Common race draws: fitness alone separates the rows of each replicate
+    assert (times.sel(fitness=1.2).values < times.sel(fitness=1.0).values).all()
+    assert times.mean('replicate').argmin() == {'fitness': 1.2}
+    series = times.to_series()
+    assert series.loc[(1.0, 2)] == times.values[0, 2]
+
+
+def test_sweep_rejects_unknown_axes(elevation_profile, athlete_path, course_path):
+    with pytest.raises(ValueError):
+        sweep(elevation_profile, athlete_path, course_path, {'altitude_m': [0, 500]})
@@ -0,0 +1,38 @@
+"""Variance-reduction factors of the sampling schemes"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import run_monte_carlo_simulations, variance_reduction_factors
+
+RUN = {'num_simulations': 4000, 'chunk_size': 200, 'seed': 8, 'verbose': False}
+
+
+@pytest.fixture(scope='module')
+def scheme_runs(elevation_profile, athlete_path, course_path):
+    return {
+        scheme: run_monte_carlo_simulations(elevation_profile, athlete_path, course_path, sampling_scheme=scheme, **RUN)
+        for scheme in ('mc', 'lhs')
+    }
+
+
+def test_lhs_reduces_the_variance_of_the_mean(scheme_runs):
+    factors = variance_reduction_factors(scheme_runs['lhs'], ('mean',), seed=0)
+    assert factors['mean']['factor'] > 3
+
+
+def test_plain_monte_carlo_has_no_variance_reduction(scheme_runs):
+    factors = variance_reduction_factors(scheme_runs['mc'], ('mean',), seed=0)
+    assert factors['mean']['factor'] == pytest.approx(1.0, abs=0.6)
+
+
+def test_schemes_estimate_the_same_mean(scheme_runs):
+    means = {scheme: df['Time (hours)'].mean() for scheme, df in scheme_runs.items()}
+    standard_error = scheme_runs['mc']['Time (hours)'].std() / np.sqrt(RUN['num_simulations'])
+    assert abs(means['lhs'] - means['mc']) < 4 * standard_error
+
+
+def test_factors_need_two_full_chunks():
+    with pytest.raises(ValueError):
+        variance_reduction_factors(pd.DataFrame({'Time (hours)': np.ones(300)}), chunk_size=200)